@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+#
+# Script to benchmark the kernels from all of the demonstration folders, and
+# to compare benchmark results against a stored baseline.
+#
+# Usage:
+#    bench.py list
+#    bench.py run [-k KERNEL ...] [-g GROUP ...] [--quick] [--warmup N]
+#                 [--repeat N] [--json FILE] [--csv FILE]
+#    bench.py compare CURRENT.json BASELINE.json [--threshold T]
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+# imports
+import argparse
+import sys
+from bench_timing import time_kernel
+from bench_kernels import bench_kernels
+from bench_io import bench_metadata, write_json, write_csv, read_json, compare
+
+
+##################
+# utility routines
+
+def size_str(size):
+    """
+    Usage: s = size_str(size)
+
+    Converts a problem-size tuple to a string, e.g. (400,800,600) -> "400x800x600"
+    """
+    return "x".join(str(s) for s in size)
+
+
+def name_width(names):
+    """
+    Usage: w = name_width(names)
+
+    Returns the width of the kernel name column of the printed tables: that
+    of the longest of the given names (and at least 16 characters).
+    """
+    return max([16] + [len(name) for name in names])
+
+
+def run(args):
+    """
+    Usage: results = run(args)
+
+    Runs the selected benchmarks, printing a summary table to the screen, and
+    returns the list of benchmark records.
+    """
+
+    # select kernels
+    kernels = bench_kernels()
+    if (args.kernel):
+        kernels = [k for k in kernels if k["name"] in args.kernel]
+    if (args.group):
+        kernels = [k for k in kernels if k["group"] in args.group]
+
+    # run benchmarks (the name column fits every registered kernel, so that
+    # the tables of different runs line up)
+    w = name_width([k["name"] for k in bench_kernels()])
+    print("%-*s %-14s %12s %10s %9s %9s" % (w, "kernel", "size", "median (s)", "IQR (%)", "GFLOP/s", "GB/s"))
+    results = []
+    for k in kernels:
+        sizes = k["sizes"][:1] if args.quick else k["sizes"]
+        for size in sizes:
+            kargs = k["setup"](size)
+            stats = time_kernel(k["call"], kargs, k["reset"], args.warmup, args.repeat)
+            record = {"kernel": k["name"], "group": k["group"], "size": size_str(size)}
+            record.update(stats)
+            record["gflops"] = None if (k["flops"] is None) else k["flops"](size)/stats["median_ns"]
+            record["gbps"] = k["bytes"](size)/stats["median_ns"]
+            results.append(record)
+            gflops = "-" if (record["gflops"] is None) else "%.3f" % record["gflops"]
+            print("%-*s %-14s %12.4e %10.1f %9s %9.3f" %
+                  (w, record["kernel"], record["size"], 1e-9*stats["median_ns"],
+                   100.0*stats["iqr_ns"]/stats["median_ns"], gflops, record["gbps"]))
+            sys.stdout.flush()
+
+    # save results
+    if (args.json):
+        write_json(args.json, results, bench_metadata())
+    if (args.csv):
+        write_csv(args.csv, results)
+
+    return results
+
+
+def compare_runs(args):
+    """
+    Usage: nslow = compare_runs(args)
+
+    Compares two stored benchmark runs, printing the results to the screen,
+    and returns the number of flagged slowdowns.
+    """
+
+    current, cmeta = read_json(args.current)
+    baseline, bmeta = read_json(args.baseline)
+    if (cmeta.get("host") != bmeta.get("host")):
+        print("warning: comparing runs from different hosts (", cmeta.get("host"), "vs", bmeta.get("host"), ")")
+    slowdowns, rows = compare(current, baseline, args.threshold)
+    w = name_width([r["kernel"] for r in rows])
+    print("%-*s %-14s %12s %12s %8s" % (w, "kernel", "size", "baseline (s)", "current (s)", "ratio"))
+    for r in rows:
+        print("%-*s %-14s %12.4e %12.4e %8.3f %s" %
+              (w, r["kernel"], r["size"], 1e-9*r["baseline_ns"], 1e-9*r["current_ns"],
+               r["ratio"], "SLOWDOWN" if r["slowdown"] else ""))
+    print("\n", len(slowdowns), " slowdown(s) beyond ", 100*args.threshold, "%")
+    return len(slowdowns)
+
+
+
+##################
+# script
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark the numerical linear algebra kernels.")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("list", help="list the available kernels")
+    prun = sub.add_parser("run", help="run benchmarks")
+    prun.add_argument("-k", "--kernel", nargs="+", help="kernel(s) to run (default: all)")
+    prun.add_argument("-g", "--group", nargs="+", help="folder(s) to run (default: all)")
+    prun.add_argument("--quick", action="store_true", help="run only the smallest size of each kernel")
+    prun.add_argument("--warmup", type=int, default=1, help="number of warm-up runs")
+    prun.add_argument("--repeat", type=int, default=5, help="number of timed runs")
+    prun.add_argument("--json", help="file to store results (JSON)")
+    prun.add_argument("--csv", help="file to store results (CSV)")
+    pcmp = sub.add_parser("compare", help="compare results against a baseline")
+    pcmp.add_argument("current", help="JSON file with the current results")
+    pcmp.add_argument("baseline", help="JSON file with the baseline results")
+    pcmp.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    if (args.command == "list"):
+        kernels = bench_kernels()
+        w = name_width([k["name"] for k in kernels])
+        for k in kernels:
+            print("%-*s %-12s sizes = %s" % (w, k["name"], k["group"],
+                                             ", ".join(size_str(s) for s in k["sizes"])))
+    elif (args.command == "run"):
+        run(args)
+    elif (args.command == "compare"):
+        sys.exit(1 if compare_runs(args) > 0 else 0)
+    else:
+        parser.print_help()
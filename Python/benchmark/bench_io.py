@@ -0,0 +1,134 @@
+# bench_io.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def bench_metadata():
+    """
+    Usage: meta = bench_metadata()
+
+    Function to collect a description of the host and software versions,
+    stored alongside the benchmark results so that runs on different
+    machines can be told apart.
+    """
+
+    # imports
+    import datetime
+    import os
+    import platform
+    import numpy as np
+
+    return {"host": platform.node(), "machine": platform.machine(),
+            "processor": platform.processor(), "cpus": os.cpu_count(),
+            "python": platform.python_version(), "numpy": np.__version__,
+            "date": datetime.datetime.now().isoformat(timespec="seconds")}
+
+
+def result_key(record):
+    """
+    Usage: key = result_key(record)
+
+    Function to return the (kernel, size) key identifying a benchmark record.
+    """
+    return (record["kernel"], record["size"])
+
+
+
+#----------------------------------------
+# primary routines
+
+def write_json(fname, results, meta=None):
+    """
+    Usage: write_json(fname, results, meta)
+
+    Function to store a list of benchmark records (and host metadata) in a
+    JSON file.
+    """
+
+    # imports
+    import json
+
+    if (meta is None):
+        meta = bench_metadata()
+    with open(fname, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+
+
+def write_csv(fname, results):
+    """
+    Usage: write_csv(fname, results)
+
+    Function to store a list of benchmark records in a CSV file (one row per
+    kernel and problem size).
+    """
+
+    # imports
+    import csv
+
+    fields = ["kernel", "group", "size", "median_ns", "iqr_ns", "min_ns",
+              "nrepeat", "gflops", "gbps"]
+    with open(fname, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for record in results:
+            writer.writerow(record)
+
+
+def read_json(fname):
+    """
+    Usage: results, meta = read_json(fname)
+
+    Function to load the benchmark records and metadata stored by write_json.
+    """
+
+    # imports
+    import json
+
+    with open(fname) as f:
+        data = json.load(f)
+    return [data["results"], data.get("meta", {})]
+
+
+def compare(current, baseline, threshold=0.10):
+    """
+    Usage: slowdowns, rows = compare(current, baseline, threshold)
+
+    Function to compare benchmark records against a stored baseline.  A
+    kernel/size pair is flagged as a slowdown when its median runtime has
+    grown by more than the relative threshold, *and* the growth exceeds the
+    larger of the two interquartile ranges (so that timing noise alone is not
+    reported as a regression).
+
+    Inputs:  current is the list of new benchmark records
+             baseline is the list of baseline benchmark records
+             threshold is the allowed relative slowdown (0.10 = 10%)
+    Outputs: slowdowns is the list of flagged rows
+             rows is the list of all compared rows, each a dictionary with
+               kernel, size, baseline_ns, current_ns, ratio and slowdown
+    """
+
+    base = {result_key(r): r for r in baseline}
+    rows = []
+    slowdowns = []
+    for r in current:
+        key = result_key(r)
+        if (key not in base):
+            continue
+        b = base[key]
+        ratio = r["median_ns"]/b["median_ns"]
+        noise = max(r["iqr_ns"], b["iqr_ns"])
+        slow = (ratio > 1.0+threshold) and (r["median_ns"]-b["median_ns"] > noise)
+        row = {"kernel": r["kernel"], "size": r["size"],
+               "baseline_ns": b["median_ns"], "current_ns": r["median_ns"],
+               "ratio": ratio, "slowdown": slow}
+        rows.append(row)
+        if (slow):
+            slowdowns.append(row)
+
+    return [slowdowns, rows]
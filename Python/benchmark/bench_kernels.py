@@ -0,0 +1,409 @@
+# bench_kernels.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+#
+# Registry of the kernels covered by the benchmark suite.  Each entry is a
+# dictionary with the fields
+#     name   - kernel name
+#     group  - demonstration folder that the kernel belongs to
+#     sizes  - list of problem-size tuples to benchmark
+#     setup  - function setup(size) returning the tuple of kernel arguments
+#     reset  - function reset(args) returning fresh arguments before each
+#              run (or None, if the kernel does not modify its inputs)
+#     call   - the kernel itself, called as call(*args)
+#     flops  - function flops(size) giving the floating-point operation count
+#              (or None, for kernels that perform no floating-point work)
+#     bytes  - function bytes(size) giving the (compulsory) memory traffic
+# The flop and byte counts are the standard leading-order models for each
+# algorithm, and are used to report GFLOP/s and GB/s.
+
+
+#----------------------------------------
+# utility routines
+
+def add_demo_paths():
+    """
+    Usage: add_demo_paths()
+
+    Function to add the demonstration folders to the module search path, so
+    that their kernels may be imported by the benchmark suite.
+    """
+
+    # imports
+    import os
+    import sys
+
+    top = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for folder in ["common", "matvec", "matmat", "cholesky", "eigenvalues", "sp_lu",
+                   "sp_chol"]:
+        path = os.path.join(top, folder)
+        if (path not in sys.path):
+            sys.path.append(path)
+
+
+def copy_first(args):
+    """
+    Usage: args = copy_first(args)
+
+    Reset function that replaces the first kernel argument by a fresh copy of
+    itself (for kernels that overwrite their first argument).  The pristine
+    input is kept as the last entry of args.
+    """
+    return (args[-1].copy(),) + tuple(args[1:])
+
+
+def copy_second(args):
+    """
+    Usage: args = copy_second(args)
+
+    Reset function that replaces the second kernel argument by a fresh copy
+    of itself (for kernels that overwrite their second argument).  The
+    pristine input is kept as the last entry of args.
+    """
+    return (args[0], args[-1].copy()) + tuple(args[2:])
+
+
+
+#----------------------------------------
+# primary routine
+
+def bench_kernels():
+    """
+    Usage: kernels = bench_kernels()
+
+    Function to return the list of kernels covered by the benchmark suite.
+    """
+
+    # imports
+    import numpy as np
+    add_demo_paths()
+    from test_matrices import toeplitz_linear, banded_decay, ramp_vector
+    from matvec_row import matvec_row
+    from matvec_col import matvec_col
+    from matmat_ijk import matmat_ijk
+    from matmat_ikj import matmat_ikj
+    from matmat_jik import matmat_jik
+    from matmat_jki import matmat_jki
+    from matmat_kij import matmat_kij
+    from matmat_kji import matmat_kji
+    from matmat_blocked import matmat_blocked
+    from matmat_parallel import matmat_parallel
+    from matmat_batched import matmat_batched
+    from matmat_strassen import matmat_strassen
+    from cholesky_ip import cholesky_ip
+    from cholesky_op import cholesky_op
+    from cholesky_blocked import cholesky_blocked
+    from cholesky_packed import cholesky_packed, pack_upper
+    from cholesky_banded import cholesky_banded
+    from fwdsub_row import fwdsub_row
+    from bwdsub_row import bwdsub_row
+    from fwdsub_blocked import fwdsub_blocked
+    from bwdsub_blocked import bwdsub_blocked
+    from upper_hess import upper_hess
+    from upper_hess_compact import upper_hess_compact
+    from upper_hess_blocked import upper_hess_blocked
+    from francis1 import francis1
+    from francis2 import francis2
+    from francis_ms import francis_ms
+    from francis_split import francis_split
+    from sym_tridiag import sym_tridiag
+    from tridiag_ql import tridiag_ql
+    from sturm_bisect import bisect_eigs
+    from upper_hess_batched import upper_hess_batched
+    from francis_batched import francis_batched
+    from diff_3D import diff_3D
+    from diff_ops import diff_3D_op
+    from diff_2D import diff_2D
+    from sp_symbolic import sp_symbolic, sp_factor
+    from nested_dissection import nested_dissection
+    from sp_chol import sp_chol
+
+    kernels = []
+
+    # matrix-vector products
+    def matvec_setup(size):
+        m, n = size
+        return (toeplitz_linear(m, n), ramp_vector(n))
+    for name, kernel in [("matvec_row", matvec_row), ("matvec_col", matvec_col),
+                         ("matvec_numpy", np.matmul)]:
+        kernels.append({"name": name, "group": "matvec",
+                        "sizes": [(1000, 2000), (2000, 4000)],
+                        "setup": matvec_setup, "reset": None, "call": kernel,
+                        "flops": lambda s: 2.0*s[0]*s[1],
+                        "bytes": lambda s: 8.0*(s[0]*s[1] + s[0] + s[1])})
+
+    # matrix-matrix products
+    def matmat_setup(size):
+        m, n, p = size
+        return (toeplitz_linear(m, n), toeplitz_linear(n, p, -1.0))
+    matmat_flops = lambda s: 2.0*s[0]*s[1]*s[2]
+    matmat_bytes = lambda s: 8.0*(s[0]*s[1] + s[1]*s[2] + s[0]*s[2])
+    for name, kernel in [("matmat_ijk", matmat_ijk), ("matmat_ikj", matmat_ikj),
+                         ("matmat_jik", matmat_jik), ("matmat_jki", matmat_jki),
+                         ("matmat_kij", matmat_kij), ("matmat_kji", matmat_kji)]:
+        kernels.append({"name": name, "group": "matmat",
+                        "sizes": [(50, 100, 75), (100, 200, 150)],
+                        "setup": matmat_setup, "reset": None, "call": kernel,
+                        "flops": matmat_flops, "bytes": matmat_bytes})
+    for name, kernel in [("matmat_blocked", matmat_blocked),
+                         ("matmat_parallel", matmat_parallel),
+                         ("matmat_strassen", matmat_strassen),
+                         ("matmat_numpy", np.matmul)]:
+        kernels.append({"name": name, "group": "matmat",
+                        "sizes": [(100, 200, 150), (400, 800, 600)],
+                        "setup": matmat_setup, "reset": None, "call": kernel,
+                        "flops": matmat_flops, "bytes": matmat_bytes})
+
+    # batched matrix-matrix products
+    def batched_setup(size):
+        N, n = size
+        return (np.random.rand(N,n,n), np.random.rand(N,n,n), "ikj",
+                np.zeros([N,n,n]), np.zeros([N,n]))
+    kernels.append({"name": "matmat_batched", "group": "matmat",
+                    "sizes": [(10000, 8), (10000, 32)],
+                    "setup": batched_setup, "reset": None, "call": matmat_batched,
+                    "flops": lambda s: 2.0*s[0]*s[1]**3,
+                    "bytes": lambda s: 8.0*3*s[0]*s[1]**2})
+
+    # Cholesky factorizations (overwrite their input)
+    def cholesky_setup(size):
+        A = banded_decay(size[0])
+        return (A.copy(), A)
+    for name, kernel in [("cholesky_ip", cholesky_ip), ("cholesky_op", cholesky_op),
+                         ("cholesky_blocked", cholesky_blocked)]:
+        kernels.append({"name": name, "group": "cholesky",
+                        "sizes": [(200,), (500,)],
+                        "setup": cholesky_setup, "reset": copy_first,
+                        "call": lambda A, A0, kernel=kernel: kernel(A),
+                        "flops": lambda s: s[0]**3/3.0,
+                        "bytes": lambda s: 8.0*s[0]**2})
+
+    # Cholesky factorizations in packed and banded storage (overwrite their input)
+    def packed_setup(size):
+        AP = pack_upper(banded_decay(size[0]))
+        return (AP.copy(), size[0], AP)
+    kernels.append({"name": "cholesky_packed", "group": "cholesky",
+                    "sizes": [(200,), (500,)],
+                    "setup": packed_setup, "reset": copy_first,
+                    "call": lambda AP, n, AP0: cholesky_packed(AP, n),
+                    "flops": lambda s: s[0]**3/3.0,
+                    "bytes": lambda s: 8.0*s[0]**2/2})
+    def banded_setup(size):
+        n, bw = size
+        AB = np.zeros([n,bw+1], dtype=float)
+        AB[:,:] = 1.0/(1.0 + 5.0*np.arange(bw+1))
+        for d in range(1,bw+1):
+            AB[n-d:,d] = 0.0
+        return (AB.copy(), AB)
+    kernels.append({"name": "cholesky_banded", "group": "cholesky",
+                    "sizes": [(10000, 10), (100000, 10)],
+                    "setup": banded_setup, "reset": copy_first,
+                    "call": lambda AB, AB0: cholesky_banded(AB),
+                    "flops": lambda s: s[0]*s[1]**2,
+                    "bytes": lambda s: 8.0*s[0]*(s[1]+1)})
+
+    # triangular solves (overwrite their right-hand side)
+    def trisolve_setup(size, lower):
+        n = size[0]
+        R = banded_decay(n)
+        cholesky_op(R)
+        R = np.triu(R)
+        b = ramp_vector(n, 1.0, -1.0)
+        return ((R.T.copy() if lower else R), b.copy(), b)
+    for name, kernel, lower in [("fwdsub_row", fwdsub_row, True),
+                                ("bwdsub_row", bwdsub_row, False)]:
+        kernels.append({"name": name, "group": "cholesky",
+                        "sizes": [(500,), (1000,)],
+                        "setup": lambda size, lower=lower: trisolve_setup(size, lower),
+                        "reset": copy_second,
+                        "call": lambda T, b, b0, kernel=kernel: kernel(T, b),
+                        "flops": lambda s: 1.0*s[0]**2,
+                        "bytes": lambda s: 8.0*(s[0]**2/2 + 2*s[0])})
+
+    # blocked triangular solves with k right-hand sides (overwrite them)
+    def multisolve_setup(size, lower):
+        n, k = size
+        R = banded_decay(n)
+        cholesky_blocked(R)
+        R = np.triu(R)
+        B = np.outer(ramp_vector(n, 1.0, -1.0), np.ones(k))
+        return ((R.T.copy() if lower else R), B.copy(), B)
+    for name, kernel, lower in [("fwdsub_blocked", fwdsub_blocked, True),
+                                ("bwdsub_blocked", bwdsub_blocked, False)]:
+        kernels.append({"name": name, "group": "cholesky",
+                        "sizes": [(1000, 1), (1000, 100)],
+                        "setup": lambda size, lower=lower: multisolve_setup(size, lower),
+                        "reset": copy_second,
+                        "call": lambda T, B, B0, kernel=kernel: kernel(T, B, 64, False),
+                        "flops": lambda s: 1.0*s[0]**2*s[1],
+                        "bytes": lambda s: 8.0*(s[0]**2/2 + 2*s[0]*s[1])})
+
+    # eigenvalue computations (francis1 is timed for a fixed budget of
+    # 10*n iterations, so its flop rate is nominal)
+    def hess_setup(size):
+        rng = np.random.default_rng(0)
+        A = rng.random((size[0], size[0]))
+        return (A + A.T,)
+    kernels.append({"name": "upper_hess", "group": "eigenvalues",
+                    "sizes": [(100,), (200,)],
+                    "setup": hess_setup, "reset": None, "call": upper_hess,
+                    "flops": lambda s: 14.0/3.0*s[0]**3,
+                    "bytes": lambda s: 8.0*3*s[0]**2})
+    kernels.append({"name": "upper_hess_compact", "group": "eigenvalues",
+                    "sizes": [(100,), (200,)],
+                    "setup": hess_setup, "reset": None, "call": upper_hess_compact,
+                    "flops": lambda s: 10.0/3.0*s[0]**3,
+                    "bytes": lambda s: 8.0*2*s[0]**2})
+    kernels.append({"name": "upper_hess_blocked", "group": "eigenvalues",
+                    "sizes": [(200,), (800,)],
+                    "setup": hess_setup, "reset": None, "call": upper_hess_blocked,
+                    "flops": lambda s: 14.0/3.0*s[0]**3,
+                    "bytes": lambda s: 8.0*3*s[0]**2})
+    kernels.append({"name": "sym_tridiag", "group": "eigenvalues",
+                    "sizes": [(200,), (800,)],
+                    "setup": hess_setup, "reset": None,
+                    "call": lambda A: sym_tridiag(A, want_vectors=False),
+                    "flops": lambda s: 4.0/3.0*s[0]**3,
+                    "bytes": lambda s: 8.0*s[0]**2})
+    def tridiag_setup(size):
+        rng = np.random.default_rng(0)
+        return (rng.random(size[0]), rng.random(size[0]-1))
+    kernels.append({"name": "tridiag_ql", "group": "eigenvalues",
+                    "sizes": [(500,), (2000,)],
+                    "setup": tridiag_setup, "reset": None, "call": tridiag_ql,
+                    "flops": lambda s: 30.0*s[0]**2,
+                    "bytes": lambda s: 8.0*2*s[0]})
+    def bisect_setup(size):
+        return tridiag_setup(size) + (None, 10)
+    kernels.append({"name": "bisect_eigs", "group": "eigenvalues",
+                    "sizes": [(500,), (2000,)],
+                    "setup": bisect_setup, "reset": None, "call": bisect_eigs,
+                    "flops": lambda s: 10.0*55*5*s[0],
+                    "bytes": lambda s: 8.0*2*s[0]})
+    def francis_setup(size):
+        H, Q = upper_hess(hess_setup(size)[0])
+        return (H, 10*size[0], 1e-10, 1, 0)
+    kernels.append({"name": "francis1", "group": "eigenvalues",
+                    "sizes": [(50,), (100,)],
+                    "setup": francis_setup, "reset": None, "call": francis1,
+                    "flops": lambda s: 10.0*s[0]**3,
+                    "bytes": lambda s: 8.0*2*s[0]**2})
+    kernels.append({"name": "francis1_values", "group": "eigenvalues",
+                    "sizes": [(50,), (100,)],
+                    "setup": francis_setup, "reset": None,
+                    "call": lambda H, maxit, tol, stype, diags: francis1(H, maxit, tol, stype, diags, want_vectors=False),
+                    "flops": lambda s: 60.0*s[0]**2,
+                    "bytes": lambda s: 8.0*s[0]**2})
+    def francis2_setup(size):
+        rng = np.random.default_rng(0)
+        H, Q = upper_hess(rng.random((size[0], size[0])))
+        return (H, 10*size[0], 1e-10, 0)
+    kernels.append({"name": "francis2", "group": "eigenvalues",
+                    "sizes": [(50,), (100,)],
+                    "setup": francis2_setup, "reset": None, "call": francis2,
+                    "flops": lambda s: 25.0*s[0]**3,
+                    "bytes": lambda s: 8.0*2*s[0]**2})
+    kernels.append({"name": "francis_ms", "group": "eigenvalues",
+                    "sizes": [(200,), (400,)],
+                    "setup": francis2_setup, "reset": None, "call": francis_ms,
+                    "flops": lambda s: 25.0*s[0]**3,
+                    "bytes": lambda s: 8.0*2*s[0]**2})
+    def split_setup(size):
+        H, maxit, tol, diags = francis2_setup(size)
+        for k in range(size[0]//4, size[0], size[0]//4):
+            H[k,k-1] = 0.0
+        return (H, maxit, tol, diags)
+    kernels.append({"name": "francis_split", "group": "eigenvalues",
+                    "sizes": [(200,), (400,)],
+                    "setup": split_setup, "reset": None, "call": francis_split,
+                    "flops": lambda s: 25.0*s[0]**3/4,
+                    "bytes": lambda s: 8.0*2*s[0]**2})
+    def hess_batched_setup(size):
+        rng = np.random.default_rng(0)
+        return (rng.standard_normal(size[0:1] + (size[1], size[1])),)
+    kernels.append({"name": "upper_hess_batched", "group": "eigenvalues",
+                    "sizes": [(10000, 8), (10000, 32)],
+                    "setup": hess_batched_setup, "reset": None, "call": upper_hess_batched,
+                    "flops": lambda s: 14.0/3.0*s[0]*s[1]**3,
+                    "bytes": lambda s: 8.0*3*s[0]*s[1]**2})
+    def francis_batched_setup(size):
+        H, Q = upper_hess_batched(hess_batched_setup(size)[0], want_vectors=False)
+        return (H, 30*size[1], 1e-10, False)
+    kernels.append({"name": "francis_batched", "group": "eigenvalues",
+                    "sizes": [(10000, 8), (2000, 32)],
+                    "setup": francis_batched_setup, "reset": None, "call": francis_batched,
+                    "flops": lambda s: 10.0*s[0]*s[1]**3,
+                    "bytes": lambda s: 8.0*s[0]*s[1]**2})
+
+    # sparse matrix assembly
+    kernels.append({"name": "diff_3D", "group": "sp_lu",
+                    "sizes": [(50, 50, 50), (100, 100, 100)],
+                    "setup": lambda s: s, "reset": None, "call": diff_3D,
+                    "flops": lambda s: 10.0*s[0]*s[1]*s[2],
+                    "bytes": lambda s: 12.0*7*s[0]*s[1]*s[2]})
+    def stencil_setup(size):
+        n = size[0]*size[1]*size[2]
+        return (diff_3D(*size), np.random.rand(n))
+    kernels.append({"name": "diff_3D_matvec", "group": "sp_lu",
+                    "sizes": [(50, 50, 50), (100, 100, 100)],
+                    "setup": stencil_setup, "reset": None,
+                    "call": lambda D, v: D @ v,
+                    "flops": lambda s: 2.0*7*s[0]*s[1]*s[2],
+                    "bytes": lambda s: (12.0*7 + 8.0*2)*s[0]*s[1]*s[2]})
+    def stencil_op_setup(size):
+        n = size[0]*size[1]*size[2]
+        return (diff_3D_op(*size), np.random.rand(n), np.empty(n))
+    kernels.append({"name": "diff_3D_op", "group": "sp_lu",
+                    "sizes": [(50, 50, 50), (100, 100, 100)],
+                    "setup": stencil_op_setup, "reset": None,
+                    "call": lambda Dop, v, out: Dop.apply(v, out),
+                    "flops": lambda s: 2.0*7*s[0]*s[1]*s[2],
+                    "bytes": lambda s: 8.0*2*s[0]*s[1]*s[2]})
+
+    # sparse factorizations: symbolic analysis (uncached), and numeric
+    # refactorization reusing a cached symbolic analysis and factor storage
+    kernels.append({"name": "sp_symbolic", "group": "sp_lu",
+                    "sizes": [(50, 50), (100, 100)],
+                    "setup": lambda s: (diff_2D(*s), "mmd", None), "reset": None,
+                    "call": sp_symbolic,
+                    "flops": None,
+                    "bytes": lambda s: 12.0*5*s[0]*s[1]})
+    kernels.append({"name": "nested_dissection", "group": "sp_lu",
+                    "sizes": [(1000, 1000), (100, 100, 100)],
+                    "setup": lambda s: (s,), "reset": None,
+                    "call": nested_dissection,
+                    "flops": None,
+                    "bytes": lambda s: 8.0*6*np.prod(s)})
+    def refactor_setup(size):
+        D = diff_2D(*size)
+        return (D, "cholesky", "mmd", None, sp_factor(D, "cholesky", "mmd", None))
+    kernels.append({"name": "sp_factor", "group": "sp_lu",
+                    "sizes": [(50, 50), (100, 100)],
+                    "setup": refactor_setup, "reset": None, "call": sp_factor,
+                    "flops": lambda s: 10.0*(s[0]*s[1])**1.5,
+                    "bytes": lambda s: 8.0*20*s[0]*s[1]*np.log2(s[0]*s[1])})
+
+    # supernodal sparse Cholesky: numeric refactorization and solve of a 3D
+    # diffusion matrix (nested-dissection-like fill: O(n^2) flops)
+    def supernodal_setup(size):
+        D = diff_3D(*size)
+        return (D, "mmd", True, None, sp_chol(D, "mmd", True, None))
+    kernels.append({"name": "sp_chol", "group": "sp_chol",
+                    "sizes": [(15, 15, 15), (20, 20, 20)],
+                    "setup": supernodal_setup, "reset": None, "call": sp_chol,
+                    "flops": lambda s: (s[0]*s[1]*s[2])**2/3.0,
+                    "bytes": lambda s: 8.0*3*(s[0]*s[1]*s[2])**(5.0/3.0)})
+    def supernodal_solve_setup(size):
+        D = diff_3D(*size)
+        return (sp_chol(D, "mmd", True, None), np.ones(D.shape[0]))
+    kernels.append({"name": "sp_chol_solve", "group": "sp_chol",
+                    "sizes": [(15, 15, 15), (20, 20, 20)],
+                    "setup": supernodal_solve_setup, "reset": None,
+                    "call": lambda F, b: F.solve(b),
+                    "flops": lambda s: 4.0*(s[0]*s[1]*s[2])**(5.0/3.0),
+                    "bytes": lambda s: 8.0*2*(s[0]*s[1]*s[2])**(5.0/3.0)})
+
+    return kernels
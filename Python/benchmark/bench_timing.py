@@ -0,0 +1,56 @@
+# bench_timing.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def time_kernel(call, args, reset=None, nwarmup=1, nrepeat=5):
+    """
+    Usage: stats = time_kernel(call, args, reset, nwarmup, nrepeat)
+
+    Function to time a kernel robustly: the kernel is first run nwarmup
+    times (untimed), and is then timed nrepeat times with
+    time.perf_counter_ns, reporting the median and interquartile range of
+    the samples.  For kernels that overwrite their inputs, reset(args) is
+    called (untimed) before every run to supply fresh inputs.
+
+    Inputs: call is the kernel, called as call(*args)
+            args is the tuple of kernel arguments
+            reset is an optional function returning fresh arguments
+            nwarmup is the number of untimed warm-up runs
+            nrepeat is the number of timed runs
+    Outputs: stats is a dictionary with the entries
+               median_ns - median runtime (nanoseconds)
+               iqr_ns    - interquartile range of the runtimes (nanoseconds)
+               min_ns    - minimum runtime (nanoseconds)
+               nrepeat   - number of timed runs
+    """
+
+    # imports
+    import time
+    import numpy as np
+
+    # check inputs
+    if (nrepeat < 1):
+        raise ValueError("time_kernel error: nrepeat must be positive")
+
+    # warm-up runs
+    for r in range(nwarmup):
+        if (reset is not None):
+            args = reset(args)
+        call(*args)
+
+    # timed runs
+    samples = np.zeros(nrepeat, dtype=np.int64)
+    for r in range(nrepeat):
+        if (reset is not None):
+            args = reset(args)
+        stime = time.perf_counter_ns()
+        call(*args)
+        samples[r] = time.perf_counter_ns()-stime
+
+    # compute statistics
+    q1, q2, q3 = np.percentile(samples, [25, 50, 75])
+    return {"median_ns": float(q2), "iqr_ns": float(q3-q1),
+            "min_ns": float(np.min(samples)), "nrepeat": nrepeat}
@@ -0,0 +1,65 @@
+# bwdsub_blocked.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def bwdsub_blocked(U, Y, nb=64, check=True):
+    """
+    Usage: X = bwdsub_blocked(U, Y, nb, check)
+
+    Function to perform blocked backwards substitution for many right-hand
+    sides at once, U*X = Y.  The rows are processed in blocks of nb, from
+    the bottom up: each block of X is first updated with a single
+    matrix-matrix product using all previously-solved rows,
+        X[i0:i1,:] -= U[i0:i1,i1:] @ X[i1:,:],
+    and the small triangular system on the diagonal block is then solved
+    row by row, with every operation acting on all k right-hand sides.
+
+    The check that U is nonsingular requires a pass over its diagonal; when
+    solving repeatedly with the same U, it may be performed once (e.g., on
+    the first call) and skipped on later calls with check=False.
+
+    Inputs:
+       U is an upper-triangular matrix (n x n numpy matrix)
+       Y holds the right-hand sides (n x k numpy matrix, or n numpy array)
+       nb is the block size
+       check is a flag to check U for singularity
+
+    Outputs:
+       X holds the solutions (same shape as Y; Y is overwritten)
+    """
+
+    # imports
+    import numpy as np
+
+    # get problem dimensions
+    m, n = np.shape(U)
+
+    # check that U and Y are compatible
+    if (m != n):
+        raise ValueError("bwdsub_blocked error: U is not square")
+    if (n != np.shape(Y)[0]):
+        raise ValueError("bwdsub_blocked error: U and Y are incompatible")
+    if (nb < 1):
+        raise ValueError("bwdsub_blocked error: nb must be positive")
+
+    # check that U is nonsingular
+    if (check and np.any(np.diag(U) == 0.0)):
+        raise ValueError("bwdsub_blocked error: U is singular")
+
+    # copy Y into solution (viewed as a matrix)
+    X = Y
+    X2 = X[:,None] if (np.ndim(X) == 1) else X
+
+    # loop over row blocks (bottom to top), performing solve
+    for i1 in range(n, 0, -nb):
+        i0 = max(i1-nb, 0)
+        if (i1 < n):                      # update block with solved rows
+            X2[i0:i1,:] -= U[i0:i1,i1:] @ X2[i1:,:]
+        for i in range(i1-1, i0-1, -1):   # solve diagonal block
+            X2[i,:] -= U[i,i+1:i1] @ X2[i+1:i1,:]
+            X2[i,:] /= U[i,i]
+
+    return X
@@ -0,0 +1,196 @@
+# cholesky_banded.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+#
+# Cholesky factorization and triangular solves for symmetric matrices stored
+# in banded format: for a symmetric n x n matrix A with bandwidth bw (i.e.,
+# A[i,j] = 0 for |i-j| > bw), the upper band is stored row by row in an
+# n x (bw+1) array AB, with
+#        AB[i,d] = A[i,i+d],   d = 0, ..., bw
+# (entries with i+d >= n are zero).  This requires n*(bw+1) storage instead
+# of n^2, and since the Cholesky factor R has the same bandwidth, the
+# factorization requires O(n*bw^2) work instead of O(n^3).
+
+
+#----------------------------------------
+# utility routines
+
+def pack_band(A, bw):
+    """
+    Usage: AB = pack_band(A, bw)
+
+    Function to store the upper band of a symmetric matrix in banded format
+    (entries outside of the band are ignored).
+
+    Inputs:  A is a symmetric matrix (n x n numpy matrix)
+             bw is the bandwidth
+    Outputs: AB is the banded storage (n x (bw+1) numpy array)
+    """
+
+    # imports
+    import numpy as np
+
+    m, n = np.shape(A)
+    if (m != n):
+        raise ValueError("pack_band error: A is not square")
+    AB = np.zeros([n,bw+1], dtype=float)
+    for d in range(min(bw+1,n)):
+        AB[:n-d,d] = np.diagonal(A, d)
+    return AB
+
+
+def unpack_band(AB):
+    """
+    Usage: R = unpack_band(AB)
+
+    Function to expand the banded storage of an upper-triangular matrix
+    into a full n x n matrix.
+    """
+
+    # imports
+    import numpy as np
+
+    n, bw1 = np.shape(AB)
+    R = np.zeros([n,n], dtype=float)
+    for d in range(min(bw1,n)):
+        R[np.arange(n-d), np.arange(d,n)] = AB[:n-d,d]
+    return R
+
+
+
+#----------------------------------------
+# primary routines
+
+def cholesky_banded(AB):
+    """
+    Usage: iret = cholesky_banded(AB)
+
+    Function to perform an outer-product-oriented Cholesky factorization of
+    a symmetric banded matrix in banded storage.  At each step, the rank-1
+    update of the bw x bw triangle below the current row is applied as a
+    single vectorized operation, using precomputed (row offset, band column)
+    index arrays for the triangle.
+
+    Inputs:
+       AB is the banded storage of a symmetric matrix (n x (bw+1) numpy array)
+
+    Outputs:
+       AB is updated in-place to store the banded Cholesky factor R, A = R'*R
+       iret is a success/failure flag (0=success, 1=failure)
+    """
+
+    # imports
+    import numpy as np
+
+    # get problem dimensions
+    n, bw1 = np.shape(AB)
+    bw = bw1-1
+
+    # index arrays for the update triangle: entry AB[i+D,C] of row i+D is
+    # updated with AB[i,D]*AB[i,D+C], for 1 <= D <= bw and 0 <= C <= bw-D
+    D = np.zeros(0, dtype=int)
+    C = np.zeros(0, dtype=int)
+    for d in range(1,bw+1):
+        D = np.append(D, np.full(bw+1-d, d))
+        C = np.append(C, np.arange(bw+1-d))
+    count = np.searchsorted(D, np.arange(bw+1), side="right")   # entries with D <= d
+
+    # perform factorization in-place
+    for i in range(n):                     # loop over rows of result
+        Ri = AB[i]
+        if (Ri[0] <= 0):                   # check positive definite
+            print("cholesky_banded error: A is not positive definite")
+            return 1
+        Ri[0] = np.sqrt(Ri[0])             # set diagonal entry for row
+        Ri[1:] /= Ri[0]                    # update row
+        l = count[min(bw, n-1-i)]          # update remainder of band
+        AB[i+D[:l],C[:l]] -= Ri[D[:l]]*Ri[D[:l]+C[:l]]
+
+    return 0
+
+
+def fwdsub_banded(AB, b):
+    """
+    Usage: y = fwdsub_banded(AB, b)
+
+    Function to solve R'*y = b, where R is an upper-triangular banded matrix
+    in banded storage (e.g., from cholesky_banded), using column-oriented
+    forwards substitution (the rows of R are the columns of R').
+
+    Inputs:
+       AB is the banded storage of R (n x (bw+1) numpy array)
+       b is a vector (n numpy array)
+
+    Outputs:
+       y is the solution (n numpy array; b is overwritten)
+    """
+
+    # imports
+    import numpy as np
+
+    # get problem dimensions
+    n, bw1 = np.shape(AB)
+
+    # check that AB and b are compatible
+    if (n != b.size):
+        raise ValueError("fwdsub_banded error: AB and b are incompatible")
+
+    # check that R is nonsingular
+    if (np.any(AB[:,0] == 0.0)):
+        raise ValueError("fwdsub_banded error: R is singular")
+
+    # copy b into solution vector
+    y = b
+
+    # loop over rows of R, performing solve
+    for i in range(n):
+        l = min(bw1, n-i)
+        y[i] /= AB[i,0]                    # solve row
+        y[i+1:i+l] -= AB[i,1:l]*y[i]       # update remaining rhs
+
+    return y
+
+
+def bwdsub_banded(AB, y):
+    """
+    Usage: x = bwdsub_banded(AB, y)
+
+    Function to solve R*x = y, where R is an upper-triangular banded matrix
+    in banded storage (e.g., from cholesky_banded), using row-oriented
+    backwards substitution.
+
+    Inputs:
+       AB is the banded storage of R (n x (bw+1) numpy array)
+       y is a vector (n numpy array)
+
+    Outputs:
+       x is the solution (n numpy array; y is overwritten)
+    """
+
+    # imports
+    import numpy as np
+
+    # get problem dimensions
+    n, bw1 = np.shape(AB)
+
+    # check that AB and y are compatible
+    if (n != y.size):
+        raise ValueError("bwdsub_banded error: AB and y are incompatible")
+
+    # check that R is nonsingular
+    if (np.any(AB[:,0] == 0.0)):
+        raise ValueError("bwdsub_banded error: R is singular")
+
+    # copy y into solution vector
+    x = y
+
+    # loop over rows of R (bottom to top), performing solve
+    for i in range(n-1,-1,-1):
+        l = min(bw1, n-i)
+        x[i] -= AB[i,1:l] @ x[i+1:i+l]     # update this rhs
+        x[i] /= AB[i,0]                    # solve row
+
+    return x
@@ -0,0 +1,72 @@
+# cholesky_blocked.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def cholesky_blocked(A, nb=64):
+    """
+    Usage: iret = cholesky_blocked(A, nb)
+
+    Function to perform a blocked (right-looking) Cholesky factorization.
+    For each block row of nb rows,
+       1. the diagonal block is factored, A11 = R11'*R11 (outer-product
+          form, with vectorized rank-1 updates),
+       2. the off-diagonal block row is found from the triangular solve
+          R11'*R12 = A12,
+       3. the trailing matrix receives the symmetric rank-nb update
+          A22 = A22 - R12'*R12, computed with matrix-matrix products on
+          the blocks of its upper triangle.
+    Only the upper-triangular portion of A is referenced.
+
+    Inputs:
+       A is a symmetric matrix (n x n numpy matrix)
+       nb is the block size
+
+    Outputs:
+       A is updated in-place to store the Cholesky-factored matrix, A = R'*R,
+         with R stored in the upper-triangular portion of A
+       iret is a success/failure flag (0=success, 1=failure)
+    """
+
+    # imports
+    import numpy as np
+
+    # get problem dimensions
+    m, n = np.shape(A)
+
+    # check that A is square
+    if (m != n):
+        print("cholesky_blocked error: A is not square")
+        return 1
+    if (nb < 1):
+        print("cholesky_blocked error: nb must be positive")
+        return 1
+
+    # perform factorization in-place, one block row at a time
+    for k0 in range(0, n, nb):
+        k1 = min(k0+nb, n)
+        A11 = A[k0:k1,k0:k1]
+        A12 = A[k0:k1,k1:]
+
+        # factor diagonal block
+        for i in range(k1-k0):
+            if (A11[i,i] <= 0):         # check positive definite
+                print("cholesky_blocked error: A is not positive definite")
+                return 1
+            A11[i,i] = np.sqrt(A11[i,i])
+            A11[i,i+1:] /= A11[i,i]
+            A11[i+1:,i+1:] -= np.outer(A11[i,i+1:], A11[i,i+1:])
+
+        # triangular solve for off-diagonal block row
+        for i in range(k1-k0):
+            A12[i,:] -= A11[:i,i] @ A12[:i,:]
+            A12[i,:] /= A11[i,i]
+
+        # symmetric rank-nb update of upper triangle of trailing matrix
+        for j0 in range(k1, n, nb):
+            j1 = min(j0+nb, n)
+            A[k1:j1,j0:j1] -= A12[:,:j1-k1].T @ A12[:,j0-k1:j1-k1]
+
+    return 0
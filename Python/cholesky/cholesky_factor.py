@@ -0,0 +1,247 @@
+# cholesky_factor.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# factorization object
+
+class CholeskyFactor:
+    """
+    Usage: F = CholeskyFactor(R, A)
+
+    Class to hold a Cholesky factorization, A = R'*R, so that it may be
+    reused for any number of solves, and modified by rank-1 updates and
+    downdates instead of being recomputed.
+
+    Attributes:
+       R is the upper-triangular Cholesky factor (n x n numpy matrix)
+       n is the matrix dimension
+       source() returns the matrix A that was factored (or None, if it is
+          unknown or has been deleted)
+
+    Methods:
+       x = F.solve(b)  solves A*x = b (b may be an n vector or an n x k matrix)
+       G = F.copy()    returns an independent copy of the factorization
+       F.update(x)     updates the factor to that of A + x*x'
+       F.downdate(x)   updates the factor to that of A - x*x'
+    """
+
+    def __init__(self, R, A=None):
+        import weakref
+        import numpy as np
+        self.R = np.triu(R)
+        self.n = np.shape(R)[0]
+        self.shared = False
+        try:
+            self.source = weakref.ref(A)
+        except TypeError:
+            self.source = lambda: None
+
+    def solve(self, b):
+        """
+        Usage: x = F.solve(b)
+
+        Solves A*x = b using the stored factor (b is not modified).  Since the
+        factor has a positive diagonal, the singularity checks are skipped.
+        """
+        import numpy as np
+        from fwdsub_blocked import fwdsub_blocked
+        from bwdsub_blocked import bwdsub_blocked
+        x = fwdsub_blocked(self.R.T, np.array(b, dtype=float), check=False)
+        return bwdsub_blocked(self.R, x, check=False)
+
+    def copy(self):
+        """
+        Usage: G = F.copy()
+
+        Returns a copy of the factorization.  The factor R is shared by both
+        objects until one of them is updated or downdated (copy-on-write), so
+        copying is O(1).
+        """
+        import copy
+        G = copy.copy(self)
+        self.shared = True
+        G.shared = True
+        return G
+
+    def update(self, x):
+        """
+        Usage: F.update(x)
+
+        Updates the factor in-place to that of A + x*x', using a sequence of
+        rotations (O(n^2) work).  x is not modified.
+        """
+        import numpy as np
+        x = np.array(x, dtype=float)
+        if (x.size != self.n):
+            raise ValueError("CholeskyFactor error: x has incorrect size")
+        if (self.shared):
+            self.R = self.R.copy()
+            self.shared = False
+        R = self.R
+        for k in range(self.n):
+            r = np.hypot(R[k,k], x[k])
+            c = r/R[k,k]
+            s = x[k]/R[k,k]
+            R[k,k] = r
+            R[k,k+1:] = (R[k,k+1:] + s*x[k+1:])/c
+            x[k+1:] = c*x[k+1:] - s*R[k,k+1:]
+
+    def downdate(self, x):
+        """
+        Usage: F.downdate(x)
+
+        Updates the factor in-place to that of A - x*x', using a sequence of
+        hyperbolic rotations (O(n^2) work).  If A - x*x' is not positive
+        definite, a ValueError is raised and the factor is left unchanged.
+        x is not modified.
+        """
+        import numpy as np
+        R = self.R.copy()
+        x = np.array(x, dtype=float)
+        if (x.size != self.n):
+            raise ValueError("CholeskyFactor error: x has incorrect size")
+        for k in range(self.n):
+            r2 = (R[k,k] - x[k])*(R[k,k] + x[k])
+            if (r2 <= 0):
+                raise ValueError("CholeskyFactor error: downdated matrix is not positive definite")
+            r = np.sqrt(r2)
+            c = r/R[k,k]
+            s = x[k]/R[k,k]
+            R[k,k] = r
+            R[k,k+1:] = (R[k,k+1:] - s*x[k+1:])/c
+            x[k+1:] = c*x[k+1:] - s*R[k,k+1:]
+        self.R = R
+        self.shared = False
+
+
+
+#----------------------------------------
+# factorization cache
+
+class CholeskyCache:
+    """
+    Usage: cache = CholeskyCache(maxsize)
+
+    Class implementing a least-recently-used cache of CholeskyFactor objects,
+    holding at most maxsize factors.  The stored factors are never modified:
+    cholesky_factor hands out copies of them.
+    """
+
+    def __init__(self, maxsize=8):
+        from collections import OrderedDict
+        self.maxsize = maxsize
+        self.factors = OrderedDict()
+
+    def get(self, key):
+        """Returns the factor stored under key (or None), marking it as used."""
+        if (key not in self.factors):
+            return None
+        self.factors.move_to_end(key)
+        return self.factors[key]
+
+    def put(self, key, F):
+        """Stores F under key, evicting the least-recently-used factors."""
+        self.factors[key] = F
+        self.factors.move_to_end(key)
+        while (len(self.factors) > self.maxsize):
+            self.factors.popitem(last=False)
+
+    def remove(self, key):
+        """Removes the factor stored under key (if any)."""
+        self.factors.pop(key, None)
+
+    def clear(self):
+        """Removes all stored factors."""
+        self.factors.clear()
+
+    def __len__(self):
+        return len(self.factors)
+
+
+# default cache used by cholesky_factor
+factor_cache = CholeskyCache()
+
+
+
+#----------------------------------------
+# utility routines
+
+def matrix_key(A, keytype="hash"):
+    """
+    Usage: key = matrix_key(A, keytype)
+
+    Function to compute the cache key for a matrix, either from its contents
+    (keytype = "hash": a digest of its shape and entries), or from its
+    identity (keytype = "id": cheaper, but does not detect in-place changes
+    to the entries of A).
+    """
+
+    # imports
+    import hashlib
+    import numpy as np
+
+    if (keytype == "id"):
+        return ("id", id(A))
+    elif (keytype == "hash"):
+        h = hashlib.blake2b(str(np.shape(A)).encode())
+        h.update(np.ascontiguousarray(A, dtype=float).data)
+        return ("hash", h.hexdigest())
+    else:
+        raise ValueError("matrix_key error: unknown keytype " + str(keytype))
+
+
+
+#----------------------------------------
+# primary routine
+
+def cholesky_factor(A, nb=64, cache=factor_cache, keytype="hash"):
+    """
+    Usage: F = cholesky_factor(A, nb, cache, keytype)
+
+    Function to compute (or retrieve from the cache) the Cholesky
+    factorization A = R'*R, returned as a CholeskyFactor object.  A is not
+    modified.  The factorization itself is performed by cholesky_blocked.
+
+    Inputs:
+       A is a symmetric positive-definite matrix (n x n numpy matrix)
+       nb is the block size for cholesky_blocked
+       cache is the CholeskyCache to use (None disables caching)
+       keytype is the cache key type ("hash" or "id"; see matrix_key)
+
+    Outputs:
+       F is the CholeskyFactor object
+    """
+
+    # imports
+    import numpy as np
+    from cholesky_blocked import cholesky_blocked
+
+    # check the cache
+    key = None
+    if (cache is not None):
+        key = matrix_key(A, keytype)
+        F = cache.get(key)
+        if (F is not None):
+            if (keytype != "id" or F.source() is A):
+                return F.copy()
+            cache.remove(key)
+
+    # perform factorization
+    R = np.array(A, dtype=float)
+    if (cholesky_blocked(R, nb) != 0):
+        raise ValueError("cholesky_factor error: factorization failed")
+    F = CholeskyFactor(R, A)
+
+    # store in cache (the factor remembers the matrix itself, so that a
+    # reused id of a deleted matrix is not mistaken for it for identity keys);
+    # the caller receives a copy, so that updating it leaves the cache intact
+    if (cache is not None):
+        cache.put(key, F)
+        return F.copy()
+
+    return F
@@ -0,0 +1,191 @@
+# cholesky_packed.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+#
+# Cholesky factorization and triangular solves for symmetric matrices stored
+# in packed upper-triangular format: the upper triangle of the n x n matrix
+# A is stored row by row in a 1D array AP of length n*(n+1)/2, so that row i
+# (entries A[i,i:]) occupies AP[off(i):off(i)+n-i], where
+#        off(i) = i*n - i*(i-1)/2.
+# This requires roughly half of the storage of the full matrix.
+
+
+#----------------------------------------
+# utility routines
+
+def packed_offset(i, n):
+    """
+    Usage: k = packed_offset(i, n)
+
+    Returns the offset of row i within a packed upper-triangular n x n matrix.
+    """
+    return i*n - (i*(i-1))//2
+
+
+def pack_upper(A):
+    """
+    Usage: AP = pack_upper(A)
+
+    Function to store the upper triangle of a square matrix in packed format.
+
+    Inputs:  A is a square matrix (n x n numpy matrix)
+    Outputs: AP is the packed upper triangle (n*(n+1)/2 numpy array)
+    """
+
+    # imports
+    import numpy as np
+
+    m, n = np.shape(A)
+    if (m != n):
+        raise ValueError("pack_upper error: A is not square")
+    AP = np.zeros(n*(n+1)//2, dtype=float)
+    for i in range(n):
+        k = packed_offset(i, n)
+        AP[k:k+n-i] = A[i,i:]
+    return AP
+
+
+def unpack_upper(AP, n):
+    """
+    Usage: R = unpack_upper(AP, n)
+
+    Function to expand a packed upper-triangular matrix into a full
+    (upper-triangular) n x n matrix.
+    """
+
+    # imports
+    import numpy as np
+
+    R = np.zeros([n,n], dtype=float)
+    for i in range(n):
+        k = packed_offset(i, n)
+        R[i,i:] = AP[k:k+n-i]
+    return R
+
+
+
+#----------------------------------------
+# primary routines
+
+def cholesky_packed(AP, n):
+    """
+    Usage: iret = cholesky_packed(AP, n)
+
+    Function to perform an outer-product-oriented Cholesky factorization of
+    a symmetric matrix in packed upper-triangular storage.
+
+    Inputs:
+       AP is the packed upper triangle of a symmetric matrix (n*(n+1)/2 numpy array)
+       n is the matrix dimension
+
+    Outputs:
+       AP is updated in-place to store the packed Cholesky factor R, A = R'*R
+       iret is a success/failure flag (0=success, 1=failure)
+    """
+
+    # imports
+    import numpy as np
+
+    # check that AP has the correct size
+    if (np.size(AP) != n*(n+1)//2):
+        print("cholesky_packed error: AP has incorrect size")
+        return 1
+
+    # perform factorization in-place
+    for i in range(n):                   # loop over rows of result
+        Ri = AP[packed_offset(i,n):packed_offset(i+1,n)]
+        if (Ri[0] <= 0):                 # check positive definite
+            print("cholesky_packed error: A is not positive definite")
+            return 1
+        Ri[0] = np.sqrt(Ri[0])           # set diagonal entry for row
+        Ri[1:] /= Ri[0]                  # update row
+        for k in range(i+1,n):           # update remainder of matrix
+            ok = packed_offset(k,n)
+            AP[ok:ok+n-k] -= Ri[k-i]*Ri[k-i:]
+
+    return 0
+
+
+def fwdsub_packed(AP, n, b):
+    """
+    Usage: y = fwdsub_packed(AP, n, b)
+
+    Function to solve R'*y = b, where R is an upper-triangular matrix in
+    packed storage (e.g., from cholesky_packed), using column-oriented
+    forwards substitution (the rows of R are the columns of R').
+
+    Inputs:
+       AP is the packed upper-triangular matrix R (n*(n+1)/2 numpy array)
+       n is the matrix dimension
+       b is a vector (n numpy array) or matrix (n x k numpy array)
+
+    Outputs:
+       y is the solution (same shape as b; b is overwritten)
+    """
+
+    # imports
+    import numpy as np
+
+    # check that AP and b are compatible
+    if (np.size(AP) != n*(n+1)//2 or np.shape(b)[0] != n):
+        raise ValueError("fwdsub_packed error: AP and b are incompatible")
+
+    # check that R is nonsingular
+    if (np.any(AP[[packed_offset(i,n) for i in range(n)]] == 0.0)):
+        raise ValueError("fwdsub_packed error: R is singular")
+
+    # copy b into solution (viewed as a matrix)
+    y = b
+    y2 = y[:,None] if (np.ndim(y) == 1) else y
+
+    # loop over rows of R, performing solve
+    for i in range(n):
+        Ri = AP[packed_offset(i,n):packed_offset(i+1,n)]
+        y2[i] /= Ri[0]                           # solve row
+        y2[i+1:] -= Ri[1:,None]*y2[i]            # update remaining rhs
+
+    return y
+
+
+def bwdsub_packed(AP, n, y):
+    """
+    Usage: x = bwdsub_packed(AP, n, y)
+
+    Function to solve R*x = y, where R is an upper-triangular matrix in
+    packed storage (e.g., from cholesky_packed), using row-oriented
+    backwards substitution.
+
+    Inputs:
+       AP is the packed upper-triangular matrix R (n*(n+1)/2 numpy array)
+       n is the matrix dimension
+       y is a vector (n numpy array) or matrix (n x k numpy array)
+
+    Outputs:
+       x is the solution (same shape as y; y is overwritten)
+    """
+
+    # imports
+    import numpy as np
+
+    # check that AP and y are compatible
+    if (np.size(AP) != n*(n+1)//2 or np.shape(y)[0] != n):
+        raise ValueError("bwdsub_packed error: AP and y are incompatible")
+
+    # check that R is nonsingular
+    if (np.any(AP[[packed_offset(i,n) for i in range(n)]] == 0.0)):
+        raise ValueError("bwdsub_packed error: R is singular")
+
+    # copy y into solution (viewed as a matrix)
+    x = y
+    x2 = x[:,None] if (np.ndim(x) == 1) else x
+
+    # loop over rows of R (bottom to top), performing solve
+    for i in range(n-1,-1,-1):
+        Ri = AP[packed_offset(i,n):packed_offset(i+1,n)]
+        x2[i] -= Ri[1:] @ x2[i+1:]               # update this rhs
+        x2[i] /= Ri[0]                           # solve row
+
+    return x
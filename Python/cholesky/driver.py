@@ -8,35 +8,35 @@
 # Spring 2019
 
 # imports
+import os
+import sys
 import time
 import numpy as np
 from numpy.linalg import norm
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from test_matrices import *
 from cholesky_ip import *
 from cholesky_op import *
+from cholesky_blocked import *
 from fwdsub_row import *
 from bwdsub_row import *
+from fwdsub_blocked import *
+from bwdsub_blocked import *
+from cholesky_factor import *
+from cholesky_packed import *
+from cholesky_banded import *
 
 # set testing values
 nvals = [500, 700, 900, 1100]
+k = 100
+bw = 10
 
 # run tests
 for n in nvals:
 
-    # allocate the matrices & vectors of this size
-    A = np.zeros([n,n], dtype=float)
-    R = np.zeros([n,n], dtype=float)
-    Rt = np.zeros([n,n], dtype=float)
-    xtrue = np.zeros(n, dtype=float)
-    x = np.zeros(n, dtype=float)
-    y = np.zeros(n, dtype=float)
-    b = np.zeros(n, dtype=float)
-
-    # fill A and xtrue with values
-    for i in range(n):
-        for j in range(n):
-            A[i,j] = 1.0/(1.0 + 5.0*abs(i - j))
-    for i in range(n):
-        xtrue[i] = 1.0*(1 - i)/n
+    # create the matrix & vectors of this size, A[i,j] = 1/(1+5|i-j|), xtrue[i] = (1-i)/n
+    A = banded_decay(n)
+    xtrue = ramp_vector(n, 1.0, -1.0)
 
     # compute b from A and xtrue
     b = A@xtrue
@@ -55,9 +55,9 @@ for n in nvals:
     # fill Rt as the transpose of R
     Rt = np.transpose(R)
 
-    # solve linear system
+    # solve linear system (on a copy of b, since the solvers overwrite it)
     stime = time.time()
-    y = fwdsub_row(Rt, b)
+    y = fwdsub_row(Rt, b.copy())
     x = bwdsub_row(R, y)
     runtime = time.time()-stime
     print("   solve time = ", runtime)
@@ -67,15 +67,6 @@ for n in nvals:
     print("   solution error = ", err_norm)
 
 
-    # reset A, xtrue and b to original values (since Python is sometimes
-    # 'call-by-value' and other times 'call-by-reference')
-    for i in range(n):
-        for j in range(n):
-            A[i,j] = 1.0/(1.0 + 5.0*abs(i - j))
-    for i in range(n):
-        xtrue[i] = 1.0*(1 - i)/n
-    b = A@xtrue
-
     # start second test
     print("\nTesting Cholesky (OP) factorizations: n = ",n)
 
@@ -90,9 +81,9 @@ for n in nvals:
     # fill Rt as the transpose of R
     Rt = np.transpose(R)
 
-    # solve linear system
+    # solve linear system (on a copy of b, since the solvers overwrite it)
     stime = time.time()
-    y = fwdsub_row(Rt, b)
+    y = fwdsub_row(Rt, b.copy())
     x = bwdsub_row(R, y)
     runtime = time.time()-stime
     print("   solve time = ", runtime)
@@ -101,3 +92,154 @@ for n in nvals:
     err_norm = norm(x-xtrue)
     print("   solution error = ", err_norm)
 
+
+    # start third test
+    print("\nTesting Cholesky (blocked) factorizations: n = ",n)
+
+    # compute Cholesky decomposition, storing result in R
+    R = A.copy()
+    stime = time.time()
+    if (cholesky_blocked(R, 64) != 0):
+        print("cholesky_blocked failed")
+    runtime = time.time()-stime
+    print("   cholesky time = ", runtime)
+
+    # fill Rt as the transpose of R
+    Rt = np.transpose(R)
+
+    # solve linear system (on a copy of b, since the solvers overwrite it)
+    stime = time.time()
+    y = fwdsub_row(Rt, b.copy())
+    x = bwdsub_row(R, y)
+    runtime = time.time()-stime
+    print("   solve time = ", runtime)
+
+    # check error
+    err_norm = norm(x-xtrue)
+    print("   solution error = ", err_norm)
+
+
+    # start fourth test (reusing the blocked factorization in R)
+    print("\nTesting solves with multiple right-hand sides: n = ",n,", k = ",k)
+
+    # create the k right-hand sides
+    Xtrue = np.outer(xtrue, np.arange(1,k+1)/k)
+    B = A@Xtrue
+
+    # solve one right-hand side at a time with row-oriented routines (first 10 only)
+    X = np.zeros([n,k], dtype=float)
+    stime = time.time()
+    for l in range(10):
+        y = fwdsub_row(Rt, B[:,l].copy())
+        X[:,l] = bwdsub_row(R, y)
+    runtime = (time.time()-stime)*k/10
+    print("   row-oriented solve time (estimated) = ", runtime)
+
+    # solve all right-hand sides at once with blocked routines, checking
+    # the factor for singularity only once
+    stime = time.time()
+    if (np.any(np.diag(R) == 0.0)):
+        print("   R is singular")
+    X = fwdsub_blocked(Rt, B.copy(), 64, check=False)
+    X = bwdsub_blocked(R, X, 64, check=False)
+    runtime = time.time()-stime
+    print("   blocked solve time = ", runtime)
+
+    # check error
+    err_norm = norm(X-Xtrue)
+    print("   solution error = ", err_norm)
+
+
+    # start fifth test
+    print("\nTesting reusable Cholesky factor objects: n = ",n)
+
+    # compute factorization, and retrieve it again from the cache
+    stime = time.time()
+    F = cholesky_factor(A)
+    runtime = time.time()-stime
+    print("   cholesky time = ", runtime)
+    stime = time.time()
+    F = cholesky_factor(A)
+    runtime = time.time()-stime
+    print("   cached cholesky time = ", runtime)
+
+    # solve linear system
+    stime = time.time()
+    x = F.solve(b)
+    runtime = time.time()-stime
+    print("   solve time = ", runtime)
+    err_norm = norm(x-xtrue)
+    print("   solution error = ", err_norm)
+
+    # update factor for A + u*u', and compare against refactorization
+    u = xtrue/norm(xtrue)
+    stime = time.time()
+    F.update(u)
+    runtime = time.time()-stime
+    print("   rank-1 update time = ", runtime)
+    stime = time.time()
+    G = cholesky_factor(A + np.outer(u,u), cache=None)
+    runtime = time.time()-stime
+    print("   refactorization time = ", runtime)
+    x = F.solve(b + u*(u@xtrue))
+    err_norm = norm(x-xtrue)
+    print("   updated solution error = ", err_norm)
+
+
+    # start sixth test
+    print("\nTesting Cholesky (packed storage) factorizations: n = ",n)
+
+    # compute Cholesky decomposition in packed storage
+    AP = pack_upper(A)
+    print("   storage (packed vs full) = ", AP.nbytes, " vs ", A.nbytes, " bytes")
+    stime = time.time()
+    if (cholesky_packed(AP, n) != 0):
+        print("cholesky_packed failed")
+    runtime = time.time()-stime
+    print("   cholesky time = ", runtime)
+
+    # solve linear system (on a copy of b, since the solvers overwrite it)
+    stime = time.time()
+    y = fwdsub_packed(AP, n, b.copy())
+    x = bwdsub_packed(AP, n, y)
+    runtime = time.time()-stime
+    print("   solve time = ", runtime)
+
+    # check error
+    err_norm = norm(x-xtrue)
+    print("   solution error = ", err_norm)
+
+
+    # start seventh test (A truncated to bandwidth bw)
+    print("\nTesting Cholesky (banded storage) factorizations: n = ",n,", bw = ",bw)
+
+    # create banded matrix and right-hand side
+    Ab = banded_decay(n, bw=bw)
+    bb = Ab@xtrue
+
+    # compute Cholesky decomposition in banded storage
+    AB = pack_band(Ab, bw)
+    print("   storage (banded vs full) = ", AB.nbytes, " vs ", Ab.nbytes, " bytes")
+    stime = time.time()
+    if (cholesky_banded(AB) != 0):
+        print("cholesky_banded failed")
+    runtime = time.time()-stime
+    print("   cholesky time = ", runtime)
+
+    # compare against full-storage blocked factorization of the same matrix
+    R = Ab.copy()
+    stime = time.time()
+    cholesky_blocked(R, 64)
+    runtime = time.time()-stime
+    print("   cholesky time (full storage) = ", runtime)
+
+    # solve linear system (on a copy of bb, since the solvers overwrite it)
+    stime = time.time()
+    y = fwdsub_banded(AB, bb.copy())
+    x = bwdsub_banded(AB, y)
+    runtime = time.time()-stime
+    print("   solve time = ", runtime)
+
+    # check error
+    err_norm = norm(x-xtrue)
+    print("   solution error = ", err_norm)
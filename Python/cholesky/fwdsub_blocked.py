@@ -0,0 +1,65 @@
+# fwdsub_blocked.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def fwdsub_blocked(L, B, nb=64, check=True):
+    """
+    Usage: Y = fwdsub_blocked(L, B, nb, check)
+
+    Function to perform blocked forwards substitution for many right-hand
+    sides at once, L*Y = B.  The rows are processed in blocks of nb: each
+    block of Y is first updated with a single matrix-matrix product using
+    all previously-solved rows,
+        Y[i0:i1,:] -= L[i0:i1,:i0] @ Y[:i0,:],
+    and the small triangular system on the diagonal block is then solved
+    row by row, with every operation acting on all k right-hand sides.
+
+    The check that L is nonsingular requires a pass over its diagonal; when
+    solving repeatedly with the same L, it may be performed once (e.g., on
+    the first call) and skipped on later calls with check=False.
+
+    Inputs:
+       L is a lower-triangular matrix (n x n numpy matrix)
+       B holds the right-hand sides (n x k numpy matrix, or n numpy array)
+       nb is the block size
+       check is a flag to check L for singularity
+
+    Outputs:
+       Y holds the solutions (same shape as B; B is overwritten)
+    """
+
+    # imports
+    import numpy as np
+
+    # get problem dimensions
+    m, n = np.shape(L)
+
+    # check that L and B are compatible
+    if (m != n):
+        raise ValueError("fwdsub_blocked error: L is not square")
+    if (n != np.shape(B)[0]):
+        raise ValueError("fwdsub_blocked error: L and B are incompatible")
+    if (nb < 1):
+        raise ValueError("fwdsub_blocked error: nb must be positive")
+
+    # check that L is nonsingular
+    if (check and np.any(np.diag(L) == 0.0)):
+        raise ValueError("fwdsub_blocked error: L is singular")
+
+    # copy B into solution (viewed as a matrix)
+    Y = B
+    Y2 = Y[:,None] if (np.ndim(Y) == 1) else Y
+
+    # loop over row blocks, performing solve
+    for i0 in range(0, n, nb):
+        i1 = min(i0+nb, n)
+        if (i0 > 0):                 # update block with solved rows
+            Y2[i0:i1,:] -= L[i0:i1,:i0] @ Y2[:i0,:]
+        for i in range(i0, i1):      # solve diagonal block
+            Y2[i,:] -= L[i,i0:i] @ Y2[i0:i,:]
+            Y2[i,:] /= L[i,i]
+
+    return Y
@@ -0,0 +1,165 @@
+# test_matrices.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+#
+# Vectorized generators for the test matrices and vectors used by the
+# demonstration drivers.  Every generator fills its result with broadcast
+# (outer) operations directly in the output array, accepts an optional
+# preallocated output array (out), and can optionally cache its result in a
+# directory as a .npy file that is memory-mapped on later calls (cache).
+
+
+#----------------------------------------
+# utility routines
+
+def cached_matrix(name, shape, fill, out=None, cache=None):
+    """
+    Usage: A = cached_matrix(name, shape, fill, out, cache)
+
+    Function to create (or reuse) a test array.  If cache is a directory
+    name, the array is stored there as name.npy, and is memory-mapped
+    (copy-on-write, so the file is never modified) instead of being
+    recomputed on later calls.  If out is supplied, the result is placed in
+    out.
+
+    Inputs: name is a file name (without extension) identifying the array
+            shape is the array shape
+            fill is a function fill(A) that fills the array A in-place
+            out is an optional output array of the given shape
+            cache is an optional directory name for cached arrays
+    Output: A is the resulting array
+    """
+
+    # imports
+    import os
+    import numpy as np
+
+    # check output array
+    if (out is not None and np.shape(out) != tuple(shape)):
+        raise ValueError("cached_matrix error: out has incorrect shape")
+
+    # no caching: fill output directly
+    if (cache is None):
+        if (out is None):
+            out = np.empty(shape, dtype=float)
+        fill(out)
+        return out
+
+    # create cache file if needed
+    fname = os.path.join(cache, name + ".npy")
+    if (not os.path.exists(fname)):
+        os.makedirs(cache, exist_ok=True)
+        tmpname = fname + ".tmp.npy"
+        A = np.lib.format.open_memmap(tmpname, mode="w+", dtype=float, shape=tuple(shape))
+        fill(A)
+        A.flush()
+        del A
+        os.replace(tmpname, fname)
+
+    # memory-map cached array
+    A = np.load(fname, mmap_mode="c")
+    if (A.shape != tuple(shape)):
+        raise ValueError("cached_matrix error: cached file " + fname + " has incorrect shape")
+    if (out is None):
+        return A
+    out[...] = A
+    return out
+
+
+
+#----------------------------------------
+# generators
+
+def toeplitz_linear(m, n, sign=1.0, out=None, cache=None):
+    """
+    Usage: A = toeplitz_linear(m, n, sign, out, cache)
+
+    Function to build the m x n Toeplitz test matrix
+           A[i,j] = (1 + sign*(i-j))/(m+n),
+    used by the matvec (sign = 1) and matmat (sign = 1 for A, sign = -1 for
+    X) drivers.
+
+    Inputs: m, n are the matrix dimensions
+            sign is the sign multiplying (i-j)
+            out is an optional output array (m x n numpy array)
+            cache is an optional directory name for cached arrays
+    Output: A is the matrix (m x n numpy array)
+    """
+
+    # imports
+    import numpy as np
+
+    def fill(A):
+        np.subtract.outer(np.arange(m, dtype=float), np.arange(n, dtype=float), out=A)
+        A *= sign
+        A += 1.0
+        A /= (m+n)
+
+    name = "toeplitz_linear_%d_%d_%g" % (m, n, sign)
+    return cached_matrix(name, (m,n), fill, out, cache)
+
+
+def banded_decay(n, alpha=5.0, bw=None, out=None, cache=None):
+    """
+    Usage: A = banded_decay(n, alpha, bw, out, cache)
+
+    Function to build the n x n symmetric positive-definite test matrix
+           A[i,j] = 1/(1 + alpha*|i-j|),
+    used by the Cholesky driver.  If a bandwidth bw is given, the entries
+    with |i-j| > bw are set to zero.
+
+    Inputs: n is the matrix dimension
+            alpha is the decay rate away from the diagonal
+            bw is an optional bandwidth
+            out is an optional output array (n x n numpy array)
+            cache is an optional directory name for cached arrays
+    Output: A is the matrix (n x n numpy array)
+    """
+
+    # imports
+    import numpy as np
+
+    def fill(A):
+        np.subtract.outer(np.arange(n, dtype=float), np.arange(n, dtype=float), out=A)
+        np.abs(A, out=A)
+        A *= alpha
+        A += 1.0
+        if (bw is not None):
+            outside = (A > 1.0 + alpha*bw)
+        np.reciprocal(A, out=A)
+        if (bw is not None):
+            A[outside] = 0.0
+
+    name = "banded_decay_%d_%g_%s" % (n, alpha, str(bw))
+    return cached_matrix(name, (n,n), fill, out, cache)
+
+
+def ramp_vector(n, a=0.0, b=1.0, out=None):
+    """
+    Usage: x = ramp_vector(n, a, b, out)
+
+    Function to build the length-n test vector
+           x[i] = (a + b*i)/n,
+    used by the matvec (a = 0, b = 1) and Cholesky (a = 1, b = -1) drivers.
+
+    Inputs: n is the vector length
+            a, b are the offset and slope
+            out is an optional output array (n numpy array)
+    Output: x is the vector (n numpy array)
+    """
+
+    # imports
+    import numpy as np
+
+    if (out is None):
+        out = np.empty(n, dtype=float)
+    elif (np.shape(out) != (n,)):
+        raise ValueError("ramp_vector error: out has incorrect shape")
+    out[:] = np.arange(n)
+    out *= b
+    out += a
+    out /= n
+    return out
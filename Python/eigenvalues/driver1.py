@@ -11,6 +11,9 @@
 import numpy as np
 from numpy.linalg import norm
 from upper_hess import upper_hess
+from upper_hess_compact import upper_hess_compact, hess_apply_q
+from upper_hess_blocked import upper_hess_blocked
+from sym_tridiag import sym_tridiag
 
 # adjust output precision
 np.set_printoptions(precision=3)
@@ -51,3 +54,46 @@ print("  norm of lower portion of H = ", norm(H - np.triu(H,-1)))
 print("  ||Q^T Q - I|| = ", norm(Q.T @ Q - np.eye(n)))
 print("  ||Q Q^T - I|| = ", norm(Q @ Q.T - np.eye(n)))
 print("  ||Q^T A Q - H|| = ", norm(Q.T @ A @ Q - H), "\n")
+
+# since H is symmetric tridiagonal, the symmetric reduction only needs to
+# store its diagonal and off-diagonal
+d, e, Q = sym_tridiag(A)
+T = np.diag(d) + np.diag(e,1) + np.diag(e,-1)
+print("symmetric tridiagonal T = Q^T A Q, stored as diagonal d and off-diagonal e:")
+print("  d = ", d)
+print("  e = ", e)
+print("checks:")
+print("  ||Q^T Q - I|| = ", norm(Q.T @ Q - np.eye(n)))
+print("  ||Q^T A Q - T|| = ", norm(Q.T @ A @ Q - T), "\n")
+
+
+# non-symmetric matrix, with Q kept in compact (Householder vector) form
+n = 10
+A = np.random.rand(n,n)
+print("third matrix (non-symmetric):")
+print(A)
+input("Press Enter to continue...")
+
+# convert to upper-Hessenberg form, storing the reflectors in H
+Hc, gam = upper_hess_compact(A)
+H = np.triu(Hc,-1)
+print("upper-Hessenberg H = Q^T A Q, with Householder vectors stored below the subdiagonal:")
+print(Hc)
+print("checks (applying Q as an operator, without forming it):")
+print("  ||Q^T Q - I|| = ", norm(hess_apply_q(Hc, gam, hess_apply_q(Hc, gam, np.eye(n)), trans=True) - np.eye(n)))
+print("  ||Q^T A Q - H|| = ", norm(hess_apply_q(Hc, gam, hess_apply_q(Hc, gam, A.copy(), side="right"), trans=True) - H), "\n")
+
+
+# larger non-symmetric matrix, using the blocked (panel) reduction
+n = 300
+A = np.random.rand(n,n)
+print("fourth matrix (non-symmetric, n =", n, "), blocked reduction:")
+input("Press Enter to continue...")
+
+# convert to upper-Hessenberg form
+H, Q = upper_hess_blocked(A, nb=32)
+print("checks:")
+print("  norm of lower portion of H = ", norm(H - np.triu(H,-1)))
+print("  ||Q^T Q - I|| = ", norm(Q.T @ Q - np.eye(n)))
+print("  ||Q Q^T - I|| = ", norm(Q @ Q.T - np.eye(n)))
+print("  ||Q^T A Q - H|| = ", norm(Q.T @ A @ Q - H), "\n")
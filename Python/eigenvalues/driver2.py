@@ -13,6 +13,7 @@ from numpy.linalg import norm
 from upper_hess import upper_hess
 from francis1 import francis1
 from francis_step import francis_step
+from eigensolve import eigensolve
 
 # adjust output precision
 np.set_printoptions(precision=3)
@@ -89,6 +90,15 @@ print("  norm of subdiagonal of H = ", norm(np.diag(Hnew,-1)),"\n")
 input("Press Enter to continue...")
 
 print("Note that convergence is most rapid at bottom, and the last row is essentially triangular.")
+input("Press Enter to continue...")
+
+# symmetric matrices are detected by eigensolve, and solved in tridiagonal form
+lam, V = eigensolve(A)
+print("eigensolve (symmetric tridiagonal QL) eigenvalues:")
+print(lam)
+print("checks:")
+print("  ||V^T V - I|| = ", norm(V.T @ V - np.eye(n)))
+print("  ||A V - V diag(lam)|| = ", norm(A @ V - V @ np.diag(lam)), "\n")
 print("Let's proceed to a non-symmetric matrix.")
 input("Press Enter to continue...")
 
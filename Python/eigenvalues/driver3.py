@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+#
+# Script to compare variants of Francis's algorithm (non-interactive).
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+# imports
+import time
+import numpy as np
+from numpy.linalg import norm
+from upper_hess_blocked import upper_hess_blocked
+from francis1 import francis1
+from francis_telemetry import FrancisTelemetry
+from francis2 import francis2, schur_eigvals
+from francis_ms import francis_ms
+from francis_split import francis_split
+from sym_tridiag import sym_tridiag
+from tridiag_ql import tridiag_ql
+from sturm_bisect import bisect_eigs
+from upper_hess import upper_hess
+from upper_hess_batched import upper_hess_batched
+from francis_batched import francis_batched, schur_eigvals_batched
+
+# set problem parameters
+nvals = [50, 100, 200]
+tol = 1e-10
+
+# eigenvalues with and without accumulating Q, on symmetric matrices
+# (U = Q*Q1 combines the Hessenberg reduction and the Francis iterations)
+print("francis1 (Wilkinson shift), with and without eigenvectors:")
+for n in nvals:
+    A = np.random.rand(n,n)
+    A = A + A.T
+    H, Q = upper_hess_blocked(A)
+    lam = np.sort(np.linalg.eigvalsh(A))
+
+    ts = time.perf_counter()
+    T1, Q1, its1 = francis1(H, 20*n, tol, 1, 0)
+    t1 = time.perf_counter() - ts
+    ts = time.perf_counter()
+    T2, Q2, its2 = francis1(H, 20*n, tol, 1, 0, want_vectors=False)
+    t2 = time.perf_counter() - ts
+
+    print("  n =", n)
+    print("    want_vectors=True:   iters =", its1, ", time =", t1,
+          ", ||U^T A U - T|| =", norm((Q @ Q1).T @ A @ (Q @ Q1) - T1))
+    print("    want_vectors=False:  iters =", its2, ", time =", t2,
+          ", speedup =", t1/t2)
+    print("    ||diag(T1) - diag(T2)|| =", norm(np.diag(T1) - np.diag(T2)),
+          ", eigenvalue error =", np.max(np.abs(np.sort(np.real(np.diag(T2))) - lam)))
+
+
+# real double-shift iteration on non-symmetric matrices (complex-conjugate
+# eigenvalues are held in 2x2 blocks of the real Schur form T)
+print("francis2 (real double shift) on non-symmetric matrices:")
+for n in nvals:
+    A = np.random.rand(n,n)
+    H, Q = upper_hess_blocked(A)
+    lam = np.sort_complex(np.linalg.eigvals(A))
+
+    ts = time.perf_counter()
+    T, Q2, its = francis2(H, 20*n, tol, 0)
+    t2 = time.perf_counter() - ts
+    U = Q @ Q2
+    nblocks = np.count_nonzero(np.diag(T,-1))
+
+    print("  n =", n)
+    print("    iters =", its, ", time =", t2, ", dtype =", T.dtype,
+          ", 2x2 blocks =", nblocks)
+    print("    ||U^T A U - T|| =", norm(U.T @ A @ U - T),
+          ", eigenvalue error =", np.max(np.abs(np.sort_complex(schur_eigvals(T)) - lam)))
+
+
+# multishift small-bulge iteration with aggressive early deflation, compared
+# against the single double-shift iteration, on larger non-symmetric matrices
+print("francis_ms (multishift + AED) vs francis2 on non-symmetric matrices:")
+for n in [200, 400]:
+    A = np.random.rand(n,n)
+    H, Q = upper_hess_blocked(A)
+    lam = np.sort_complex(np.linalg.eigvals(A))
+
+    ts = time.perf_counter()
+    T2, Q2, its2 = francis2(H, 20*n, tol, 0)
+    t2 = time.perf_counter() - ts
+    ts = time.perf_counter()
+    T3, Q3, its3 = francis_ms(H, 20*n, tol, 0)
+    t3 = time.perf_counter() - ts
+    U = Q @ Q3
+
+    print("  n =", n)
+    print("    francis2:    iters =", its2, ", time =", t2)
+    print("    francis_ms:  iters =", its3, ", time =", t3, ", speedup =", t2/t3)
+    print("    ||U^T A U - T|| =", norm(U.T @ A @ U - T3),
+          ", eigenvalue error =", np.max(np.abs(np.sort_complex(schur_eigvals(T3)) - lam)))
+
+
+# matrices that split into independent blocks (four unreduced diagonal blocks,
+# coupled only through the upper triangle): francis2 solves the blocks one
+# after another, while francis_split solves them concurrently
+print("francis_split vs francis2 on a matrix with decoupled blocks:")
+n = 400
+A = np.random.rand(n,n)
+H, Q = upper_hess_blocked(A)
+for k in range(n//4, n, n//4):
+    H[k,k-1] = 0.0
+lam = np.sort_complex(np.linalg.eigvals(H))
+ts = time.perf_counter()
+T2, Q2, its2 = francis2(H, 20*n, tol, 0)
+t2 = time.perf_counter() - ts
+print("  francis2:       iters =", its2, ", time =", t2)
+for processes in [False, True]:
+    ts = time.perf_counter()
+    T3, Q3, its3 = francis_split(H, 20*n, tol, 0, processes=processes)
+    t3 = time.perf_counter() - ts
+    print("  francis_split:  processes =", processes, ", iters =", its3, ", time =", t3,
+          ", speedup =", t2/t3)
+    print("    ||Q^T H Q - T|| =", norm(Q3.T @ H @ Q3 - T3),
+          ", eigenvalue error =", np.max(np.abs(np.sort_complex(schur_eigvals(T3)) - lam)))
+
+
+# symmetric matrices: all eigenvalues of the tridiagonal form with the QL
+# algorithm, vs selected eigenvalues (and eigenvectors) with bisection
+print("symmetric tridiagonal QL vs Sturm-sequence bisection:")
+n = 1000
+A = np.random.rand(n,n)
+A = A + A.T
+lam = np.linalg.eigvalsh(A)
+d, e, Q = sym_tridiag(A)
+ts = time.perf_counter()
+lam1, Z1, its = tridiag_ql(d, e)
+t1 = time.perf_counter() - ts
+print("  tridiag_ql, all eigenvalues:  time =", t1,
+      ", eigenvalue error =", np.max(np.abs(lam1 - lam)))
+for interval, k in [(None, 10), ([0.0, 1.0], None)]:
+    ts = time.perf_counter()
+    lam2, Z2 = bisect_eigs(d, e, interval, k, want_vectors=True)
+    t2 = time.perf_counter() - ts
+    V = Q @ Z2
+    ref = lam[:k] if (k is not None) else lam[(lam >= interval[0]) & (lam < interval[1])]
+    print("  bisect_eigs, interval =", interval, ", k =", k, ":  found", np.size(lam2),
+          ", time =", t2)
+    print("    eigenvalue error =", np.max(np.abs(lam2 - ref)),
+          ", ||A V - V diag(lam)|| =", norm(A @ V - V @ np.diag(lam2)),
+          ", ||V^T V - I|| =", norm(V.T @ V - np.eye(np.size(lam2))))
+
+
+# stacks of small matrices: one upper_hess and francis2 call per matrix, vs
+# the batched versions that vectorize across the stack
+print("batched reduction and Francis iteration on stacks of small matrices:")
+N = 500
+for n in [6, 16, 32]:
+    A = np.random.rand(N,n,n)
+    ts = time.perf_counter()
+    for l in range(N):
+        H, Q = upper_hess(A[l])
+        T, Q1, its = francis2(H, 30*n, tol, 0)
+    t1 = time.perf_counter() - ts
+    ts = time.perf_counter()
+    H, Q = upper_hess_batched(A)
+    T, Q1, its = francis_batched(H, 30*n, tol)
+    t2 = time.perf_counter() - ts
+    U = Q @ Q1
+    lam = schur_eigvals_batched(T)
+    err = max([np.max(np.abs(np.sort_complex(lam[l]) - np.sort_complex(np.linalg.eigvals(A[l]))))
+               for l in range(N)])
+    print("  N =", N, ", n =", n, ":  loop time =", t1, ", batched time =", t2,
+          ", max its =", np.max(its))
+    print("    max ||U^T A U - T|| =", np.max(norm(np.transpose(U,(0,2,1)) @ A @ U - T, axis=(1,2))),
+          ", max eigenvalue error =", err)
+
+
+# structured convergence history of francis1, instead of diags output
+print("francis1 convergence telemetry:")
+n = 100
+A = np.random.rand(n,n)
+H, Q = upper_hess_blocked(A + A.T)
+tel = FrancisTelemetry()
+T, Q1, its = francis1(H, 10*n, tol, 1, 0, telemetry=tel)
+print("  summary:", tel.summary())
+for r in tel.records[:3] + tel.records[-3:]:
+    print("   iter", r["iter"], ": window", r["lo"], ":", r["hi"], ", |A(hi,hi-1)| =",
+          r["subdiag_last"], ", step/update time =", r["t_step"], "/", r["t_update"])
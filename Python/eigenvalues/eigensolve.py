@@ -0,0 +1,77 @@
+# eigensolve.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def eigensolve(A, want_vectors=True, tol=None, maxit=None, interval=None, k=None):
+    """
+    Usage: lam,Q = eigensolve(A, want_vectors, tol, maxit, interval, k)
+
+    Function to compute the eigenvalues of a real square matrix A, selecting
+    the algorithm based on its structure:
+       - symmetric matrices are reduced to tridiagonal form (stored as
+         two 1D arrays) with sym_tridiag, and then solved with the
+         implicitly-shifted QL algorithm, tridiag_ql; the columns of Q are
+         then orthonormal eigenvectors, A*Q = Q*diag(lam).  If only the
+         eigenvalues in an interval (or the k smallest) are desired, the
+         QL algorithm is replaced by Sturm-sequence bisection, bisect_eigs,
+         and only the matching eigenvectors are computed;
+       - other matrices are reduced to upper-Hessenberg form with
+         upper_hess_blocked (which forms Q only if want_vectors is True),
+         and then to real Schur form T = Q'*A*Q with the
+         multishift double-shift iteration francis_ms; the columns of Q are
+         then the Schur vectors of A.
+
+    Input:    A - real square matrix
+   want_vectors - flag to compute Q (True), or skip it (False)
+            tol - relative eigenvalue tolerance (default: machine epsilon)
+          maxit - maximum allowed number of iterations (default: 30*n)
+       interval - [lower, upper] interval of desired eigenvalues (symmetric A)
+              k - number of smallest eigenvalues desired (symmetric A)
+    Outputs: lam - eigenvalues (ascending for symmetric A)
+              Q - eigenvectors or Schur vectors (None if want_vectors is False)
+    """
+
+    # imports
+    import numpy as np
+    from numpy.linalg import norm
+    from sym_tridiag import sym_tridiag
+    from tridiag_ql import tridiag_ql
+    from sturm_bisect import bisect_eigs
+    from upper_hess_blocked import upper_hess_blocked
+    from francis2 import schur_eigvals
+    from francis_ms import francis_ms
+
+    # ensure that A is real and square
+    if (np.iscomplexobj(A)):
+        raise ValueError("eigensolve error: matrix must be real")
+    m,n = np.shape(A)
+    if (m != n):
+        raise ValueError("eigensolve error: matrix must be square")
+
+    # set defaults
+    if (tol is None):
+        tol = np.finfo(float).eps
+    if (maxit is None):
+        maxit = 30*n
+
+    # symmetric matrices
+    if (norm(A - A.T, np.inf) <= 100*np.finfo(float).eps*norm(A, np.inf)):
+        d, e, Q = sym_tridiag(A, want_vectors)
+        if (interval is not None or k is not None):
+            lam, Z = bisect_eigs(d, e, interval, k, want_vectors)
+            return [lam, Q @ Z if want_vectors else None]
+        lam, Q, its = tridiag_ql(d, e, Q, tol, maxit)
+        return [lam, Q]
+
+    # spectrum slicing is only available for symmetric matrices
+    if (interval is not None or k is not None):
+        raise ValueError("eigensolve error: interval and k require a symmetric matrix")
+
+    # non-symmetric matrices
+    H, Q = upper_hess_blocked(A, want_q=want_vectors)
+    T, Q2, its = francis_ms(H, maxit, tol, 0, want_vectors)
+    lam = schur_eigvals(T)
+    return [lam, Q @ Q2 if want_vectors else None]
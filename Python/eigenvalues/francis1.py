@@ -5,9 +5,9 @@
 # Math 5316
 # Spring 2019
 
-def francis1(Ain,maxit,tol,stype,diags):
+def francis1(Ain,maxit,tol,stype,diags,want_vectors=True,telemetry=None):
     """
-    Usage: A,Q,its = francis1(Ain,maxit,tol,stype,diags)
+    Usage: A,Q,its = francis1(Ain,maxit,tol,stype,diags,want_vectors,telemetry)
 
     Function to perform Francis' algorithm of degree one to compute the
     eigen-decomposition of a given matrix A, through iteratively computing the
@@ -18,10 +18,23 @@ def francis1(Ain,maxit,tol,stype,diags):
     convergence, Anew should be [essentially] upper-triangular.  Specifically,
     it will satisfy
           |Anew(j,j-1)| <= tol*(|Anew(j,j)|+|Anew(j-1,j-1)|),  j=2:n
+
+    Each iteration is performed on the bottom-most unreduced block
+    A[lo:m+1,lo:m+1], where m is the last row with a non-negligible
+    subdiagonal entry, and lo is the first row of the unreduced block that
+    contains it; when want_vectors is True, the blocks of A to the right of
+    and above that block are updated as well, so that A = Q'*Ain*Q.
    
-    Note: since this routine returns the full transformation matrix Q (as
-    opposed to just the triangular matrix result, it is less efficient than it
-    *could* be if only the eigenvalues were desired.
+    Note: when want_vectors is True, this routine accumulates the full
+    transformation matrix Q, which requires O(n^3) work per iteration.  If
+    only the eigenvalues are desired, set want_vectors to False: Q is then
+    never formed (and is returned as None), and each iteration requires only
+    O(n^2) work.
+
+    Note: for structured convergence data, pass a FrancisTelemetry object
+    (see francis_telemetry.py) as telemetry; it records the active window,
+    shift, subdiagonal norms, timings and deflations of every iteration.
+    When telemetry is None, no timing or recording is performed at all.
    
     Input:    A - upper-Hessenberg square matrix (Aold)
           maxit - maximum allowed number of iterations
@@ -32,7 +45,9 @@ def francis1(Ain,maxit,tol,stype,diags):
           diags - flag to turn on/off diagnostic messages:
                         0 => off
                      else => on
-    Outputs:  Q - unitary matrix
+   want_vectors - flag to accumulate Q (True), or skip it (False)
+      telemetry - object to record the convergence history (or None)
+    Outputs:  Q - unitary matrix (None if want_vectors is False)
               A - upper-triangular matrix (Anew)
             its - number of iterations taken
     """
@@ -40,6 +55,7 @@ def francis1(Ain,maxit,tol,stype,diags):
     # imports
     import numpy as np
     from numpy.linalg import norm
+    from time import perf_counter
     from francis_step import francis_step
 
     # copy input matrix into new working matrix
@@ -56,8 +72,11 @@ def francis1(Ain,maxit,tol,stype,diags):
         raise ValueError("francis1: matrix must be upper-Hessenberg")
 
     # initialize results, counter toward completion
-    Q = np.eye(n)
+    Q = np.eye(n) if want_vectors else None
     m = n-1
+    if (telemetry is not None):
+        telemetry.start(n)
+        mprev = n-1
 
     # perform iteration
     for its in range(1,maxit+1):
@@ -70,7 +89,20 @@ def francis1(Ain,maxit,tol,stype,diags):
             
         # check for completion
         if ((m == 1) and (np.abs(A[1,0]) <= tol*(np.abs(A[1,1])+np.abs(A[0,0])))):
+            m = -1
+        if (telemetry is not None):
+            for j in range(mprev,m,-1):
+                telemetry.deflation(its, j, A[j,j])
+            mprev = m
+        if (m == -1):
             break
+
+        # determine first row of unreduced block containing row m
+        lo = m-1
+        while (lo > 0):
+            if (np.abs(A[lo,lo-1]) <= tol*(np.abs(A[lo,lo])+np.abs(A[lo-1,lo-1]))):
+                break
+            lo -= 1
    
         # set shift
         if (stype == 0):       # Rayleigh quotient shift
@@ -100,16 +132,34 @@ def francis1(Ain,maxit,tol,stype,diags):
 
         # output some diagnostic information to the screen
         if (diags):
-            print("   iter ",its,":  submatrix 0 :",m,",  shift = ",rho)
+            print("   iter ",its,":  submatrix ",lo,":",m,",  shift = ",rho)
    
+        # record state of active window
+        if (telemetry is not None):
+            subnorm = norm(np.diag(A[lo:m+1,lo:m+1],-1))
+            sublast = np.abs(A[m,m-1])
+            ts = perf_counter()
+
         # perform one iteration of algorithm on remaining submatrix
-        Asub, Qt = francis_step(A[:m+1,:m+1],rho)
-        if isinstance(Asub[0,0], complex):
+        Asub, Qt = francis_step(A[lo:m+1,lo:m+1],rho,want_vectors)
+        if (telemetry is not None):
+            t_step = perf_counter() - ts
+            ts = perf_counter()
+        if (np.iscomplexobj(Asub) and not np.iscomplexobj(A)):
             A = A.astype(complex)
-            Q = Q.astype(complex)
-        A[:m+1,:m+1] = Asub
+            if (want_vectors):
+                Q = Q.astype(complex)
+        A[lo:m+1,lo:m+1] = Asub
         
-        # update transformation matrix
-        Q[:,:m+1] = Q[:,:m+1] @ Qt
+        # update remainder of A, and transformation matrix
+        if (want_vectors):
+            A[lo:m+1,m+1:] = Qt.T @ A[lo:m+1,m+1:]
+            A[:lo,lo:m+1] = A[:lo,lo:m+1] @ Qt
+            Q[:,lo:m+1] = Q[:,lo:m+1] @ Qt
+        if (telemetry is not None):
+            telemetry.iteration(its, lo, m, "rayleigh" if (stype == 0) else "wilkinson",
+                                rho, subnorm, sublast, t_step, perf_counter() - ts)
 
+    if (telemetry is not None):
+        telemetry.finish(its)
     return [A, Q, its]
@@ -0,0 +1,220 @@
+# francis2.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def split_2x2(T,k,Q=None,full=True):
+    """
+    Usage: split = split_2x2(T,k,Q,full)
+
+    Function to examine the 2x2 diagonal block T[k:k+2,k:k+2] of a real
+    quasi-triangular matrix.  If its eigenvalues are real, it is
+    triangularized with a rotator (applied to T in-place, and accumulated
+    into Q if supplied), and True is returned; if they are a
+    complex-conjugate pair, T is left unchanged and False is returned.  The
+    'full' flag has the same meaning as in francis2_step.
+    """
+
+    # imports
+    import numpy as np
+    from francis_step import rot, apply_rot_left, apply_rot_right
+
+    # block entries, and discriminant of characteristic polynomial
+    a = T[k,k]
+    b = T[k,k+1]
+    c = T[k+1,k]
+    d = T[k+1,k+1]
+    p = 0.5*(a-d)
+    disc = p*p + b*c
+    if (c == 0.0):
+        return True
+    if (disc < 0.0):
+        return False
+
+    # rotator whose first column is an eigenvector, [lam-d, c], where the
+    # eigenvalue lam = d + p + sign(p)*sqrt(disc) avoids cancellation
+    cr, sr = rot(p + np.copysign(np.sqrt(disc), p), c)
+
+    # apply similarity transformation
+    n = np.size(T,0)
+    c1 = n if full else k+2
+    r0 = 0 if full else k
+    v1, v2 = apply_rot_left(T[k,k:c1],T[k+1,k:c1],cr,sr)
+    T[k,k:c1] = v1
+    T[k+1,k:c1] = v2
+    v1, v2 = apply_rot_right(T[r0:k+2,k],T[r0:k+2,k+1],cr,sr)
+    T[r0:k+2,k] = v1
+    T[r0:k+2,k+1] = v2
+    T[k+1,k] = 0.0
+    if (Q is not None):
+        v1, v2 = apply_rot_right(Q[:,k],Q[:,k+1],cr,sr)
+        Q[:,k] = v1
+        Q[:,k+1] = v2
+    return True
+
+
+def schur_eigvals(T):
+    """
+    Usage: lam = schur_eigvals(T)
+
+    Function to extract the eigenvalues of a real quasi-triangular (real
+    Schur form) matrix, as produced by francis2.  Each 1x1 diagonal block
+    contributes a real eigenvalue, and each 2x2 diagonal block (with nonzero
+    subdiagonal) a complex-conjugate pair.  The result is real if all blocks
+    are 1x1, and complex otherwise.
+    """
+
+    # imports
+    import numpy as np
+
+    n = np.size(T,0)
+    lam = np.zeros(n, dtype=complex)
+    k = 0
+    while (k < n):
+        if (k < n-1 and T[k+1,k] != 0.0):
+            m = 0.5*(T[k,k] + T[k+1,k+1])
+            p = 0.5*(T[k,k] - T[k+1,k+1])
+            sq = np.sqrt(complex(p*p + T[k,k+1]*T[k+1,k]))
+            lam[k] = m + sq
+            lam[k+1] = m - sq
+            k += 2
+        else:
+            lam[k] = T[k,k]
+            k += 1
+    if (np.all(lam.imag == 0.0)):
+        lam = lam.real
+    return lam
+
+
+
+#----------------------------------------
+# primary routine
+
+def francis2(Ain,maxit,tol,diags,want_vectors=True,minsplit=None):
+    """
+    Usage: T,Q,its = francis2(Ain,maxit,tol,diags,want_vectors,minsplit)
+
+    Function to perform Francis' algorithm of degree two (the implicit
+    double-shift QR algorithm) to compute the real Schur decomposition of a
+    given real upper-Hessenberg matrix A,
+           T = Q'*A*Q,
+    where Q is real orthogonal and T is real quasi-triangular: upper
+    triangular, except for 2x2 diagonal blocks that hold the
+    complex-conjugate pairs of eigenvalues.  Since the shifts (the
+    eigenvalues of the trailing 2x2 block of the active window) enter only
+    through their sum and product, all computations are performed in real
+    arithmetic, in-place in a single copy of A.
+
+    At each iteration, the active window A[l:hi+1,l:hi+1] is the trailing
+    unreduced block, where the subdiagonal entries are negligible when
+          |A(j,j-1)| <= tol*(|A(j,j)|+|A(j-1,j-1)|).
+    The window deflates from the bottom by 1x1 blocks, or by 2x2 blocks
+    (which are triangularized if their eigenvalues are real).  If a window
+    has not deflated after 10 iterations, an exceptional shift is used.
+
+    If minsplit is given, the routine instead returns as soon as a
+    negligible subdiagonal entry splits the unfinished part of the matrix
+    into two unreduced blocks of at least minsplit rows each (so that a
+    caller, e.g. francis_split, may solve those blocks independently).
+
+    Input:    A - real upper-Hessenberg square matrix
+          maxit - maximum allowed number of iterations
+            tol - relative eigenvalue tolerance
+          diags - flag to turn on/off diagnostic messages:
+                        0 => off
+                     else => on
+   want_vectors - flag to accumulate Q (True), or skip it (False; T is then
+                  only correct within its diagonal blocks, which suffices
+                  for the eigenvalues)
+       minsplit - minimum block size for an early return (None disables)
+    Outputs:  T - real quasi-triangular matrix
+              Q - orthogonal matrix (None if want_vectors is False)
+            its - number of iterations taken
+    """
+
+    # imports
+    import numpy as np
+    from numpy.linalg import norm
+    from francis2_step import francis2_step
+
+    # ensure that A is real
+    if (np.iscomplexobj(Ain)):
+        raise ValueError("francis2 error: matrix must be real")
+
+    # copy input matrix into new working matrix
+    T = np.array(Ain, dtype=float)
+
+    # ensure that A is square
+    m,n = np.shape(T)
+    if (m != n):
+        raise ValueError("francis2 error: matrix must be square")
+
+    # ensure that A is essentially upper-Hessenberg
+    tmp = T - np.triu(T,-1)  # portion of A that should be zero
+    if (norm(tmp,np.inf) > 100*np.finfo(float).eps*norm(T,np.inf)):
+        raise ValueError("francis2: matrix must be upper-Hessenberg")
+    T = np.triu(T,-1)
+
+    # initialize results, counters
+    Q = np.eye(n) if want_vectors else None
+    hi = n-1
+    its = 0
+    wits = 0
+
+    # perform iteration
+    while (hi > 0):
+
+        # determine first row of trailing unreduced block
+        l = hi
+        while (l > 0):
+            if (np.abs(T[l,l-1]) <= tol*(np.abs(T[l,l])+np.abs(T[l-1,l-1]))):
+                T[l,l-1] = 0.0
+                break
+            l -= 1
+
+        # return early if the matrix has split into two sizable blocks
+        if (minsplit is not None and l >= minsplit and hi-l+1 >= minsplit):
+            break
+
+        # deflate a converged 1x1 or 2x2 block
+        if (l == hi):
+            hi -= 1
+            wits = 0
+            continue
+        if (l == hi-1):
+            split_2x2(T, hi-1, Q, want_vectors)
+            hi -= 2
+            wits = 0
+            continue
+
+        # check for iteration limit
+        if (its >= maxit):
+            break
+        its += 1
+        wits += 1
+
+        # set shifts (sum s and product t) from trailing 2x2 block, or
+        # use an exceptional shift to break a possible cycle
+        if (wits % 10 == 0):
+            w = np.abs(T[hi,hi-1]) + np.abs(T[hi-1,hi-2])
+            h = 0.75*w + T[hi,hi]
+            s = 2.0*h
+            t = h*h + 0.4375*w*w
+        else:
+            s = T[hi-1,hi-1] + T[hi,hi]
+            t = T[hi-1,hi-1]*T[hi,hi] - T[hi-1,hi]*T[hi,hi-1]
+
+        # output some diagnostic information to the screen
+        if (diags):
+            print("   iter ",its,":  submatrix ",l,":",hi,",  shift sum = ",s,",  product = ",t)
+
+        # perform one double-shift iteration on the active window
+        francis2_step(T, s, t, l, hi, Q, want_vectors)
+
+    return [T, Q, its]
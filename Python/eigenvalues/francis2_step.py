@@ -0,0 +1,136 @@
+# francis2_step.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def house3(x,y,z):
+    """
+    Usage: v1,v2,tau = house3(x,y,z)
+
+    Function to compute a 3x3 Householder reflector P = I - tau*v*v', with
+    v = [1, v1, v2], such that P*[x, y, z]' = [beta, 0, 0]'.  If y and z are
+    both zero, then no reflector is needed and tau = 0 is returned.
+
+    Input:   x, y, z - vector to reflect
+    Outputs: v1, v2 - trailing entries of Householder vector
+                tau - reflector coefficient
+    """
+
+    # imports
+    import numpy as np
+
+    if (y == 0.0 and z == 0.0):
+        return [0.0, 0.0, 0.0]
+    beta = -np.copysign(np.sqrt(x*x + y*y + z*z), x)
+    tau = (beta - x)/beta
+    return [y/(x-beta), z/(x-beta), tau]
+
+
+
+#----------------------------------------
+# primary routine
+
+def francis2_step(A,s,t,lo,hi,Q=None,full=True):
+    """
+    Usage: A, Q = francis2_step(A,s,t,lo,hi,Q,full)
+
+    Function to perform one iteration of Francis' algorithm of degree two
+    (the implicit double-shift QR step), in real arithmetic, on the active
+    window A[lo:hi+1,lo:hi+1] of a real upper-Hessenberg matrix.  The two
+    shifts rho1, rho2 (either both real, or a complex-conjugate pair) are
+    specified through their sum s = rho1+rho2 and product t = rho1*rho2, so
+    that the first column of (A-rho1*I)*(A-rho2*I) is real.  A 3x3 bulge is
+    introduced with a Householder reflector computed from that column, and
+    is chased out of the window with a sequence of 3x3 reflectors (and one
+    final rotator).  The similarity transformation
+           Anew = U'*Aold*U
+    is applied in-place to A, and accumulated into Q (Q = Q*U), if supplied.
+
+    Input:    A - real upper-Hessenberg square matrix (Aold)
+              s - sum of shifts
+              t - product of shifts
+             lo - first row/column of active window
+             hi - last row/column of active window (hi-lo >= 2)
+              Q - unitary matrix to update (or None)
+           full - flag to update the entire rows/columns of A (True), so that
+                  A remains similar to the original matrix outside of the
+                  window, or only the window itself (False; this suffices if
+                  only the eigenvalues are desired)
+    Outputs:  A - upper-Hessenberg matrix result (Anew, updated in-place)
+              Q - updated unitary matrix (updated in-place, if supplied)
+    """
+
+    # imports
+    import numpy as np
+    from francis_step import rot, apply_rot_left, apply_rot_right
+
+    # set ranges of rows (for right multiplies) and columns (for left
+    # multiplies) to update
+    n = np.size(A,0)
+    r0 = 0 if full else lo
+    c1 = n if full else hi+1
+
+    # first column of (A-rho1*I)*(A-rho2*I)
+    x = A[lo,lo]*A[lo,lo] + A[lo,lo+1]*A[lo+1,lo] - s*A[lo,lo] + t
+    y = A[lo+1,lo]*(A[lo,lo] + A[lo+1,lo+1] - s)
+    z = A[lo+1,lo]*A[lo+2,lo+1]
+
+    # introduce and chase the bulge
+    for k in range(lo,hi-1):
+
+        # construct reflector acting on rows/columns k:k+3
+        v1, v2, tau = house3(x,y,z)
+        if (tau != 0.0):
+
+            # apply reflector to A on left: A = P*A
+            R = A[k:k+3,max(lo,k-1):c1]
+            w = tau*(R[0] + v1*R[1] + v2*R[2])
+            R[0] -= w
+            R[1] -= v1*w
+            R[2] -= v2*w
+            if (k > lo):
+                A[k+1,k-1] = 0.0
+                A[k+2,k-1] = 0.0
+
+            # apply reflector to A on right: A = A*P
+            C = A[r0:min(k+4,hi+1),k:k+3]
+            w = tau*(C[:,0] + v1*C[:,1] + v2*C[:,2])
+            C[:,0] -= w
+            C[:,1] -= v1*w
+            C[:,2] -= v2*w
+
+            # update Q
+            if (Q is not None):
+                C = Q[:,k:k+3]
+                w = tau*(C[:,0] + v1*C[:,1] + v2*C[:,2])
+                C[:,0] -= w
+                C[:,1] -= v1*w
+                C[:,2] -= v2*w
+
+        # next column of bulge
+        x = A[k+1,k]
+        y = A[k+2,k]
+        if (k < hi-2):
+            z = A[k+3,k]
+
+    # final rotator to zero the last bulge entry
+    cr, sr = rot(x, y)
+    v1, v2 = apply_rot_left(A[hi-1,hi-2:c1],A[hi,hi-2:c1],cr,sr)
+    A[hi-1,hi-2:c1] = v1
+    A[hi,hi-2:c1] = v2
+    A[hi,hi-2] = 0.0
+    v1, v2 = apply_rot_right(A[r0:hi+1,hi-1],A[r0:hi+1,hi],cr,sr)
+    A[r0:hi+1,hi-1] = v1
+    A[r0:hi+1,hi] = v2
+    if (Q is not None):
+        v1, v2 = apply_rot_right(Q[:,hi-1],Q[:,hi],cr,sr)
+        Q[:,hi-1] = v1
+        Q[:,hi] = v2
+
+    return [A, Q]
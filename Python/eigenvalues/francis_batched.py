@@ -0,0 +1,319 @@
+# francis_batched.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def split_2x2_batched(T, l, k, Q=None):
+    """
+    Usage: split_2x2_batched(T, l, k, Q)
+
+    Function to apply split_2x2 to the 2x2 diagonal blocks
+    T[l[i],k[i]:k[i]+2,k[i]:k[i]+2] of a stack of real quasi-triangular
+    matrices, all at once: each block with real eigenvalues is triangularized
+    with a rotator (applied to all of T[l] in-place, and accumulated into
+    Q[l] if supplied), while blocks with complex-conjugate eigenvalues are
+    left unchanged.
+
+    Input:   T - stack of real upper-Hessenberg matrices (N x n x n numpy array)
+             l - indices of the matrices to examine (integer numpy array)
+             k - first row/column of each block (integer numpy array)
+             Q - stack of orthogonal matrices to update (or None)
+    """
+
+    # imports
+    import numpy as np
+
+    # block entries, and discriminants of characteristic polynomials
+    a = T[l,k,k]
+    b = T[l,k,k+1]
+    c = T[l,k+1,k]
+    d = T[l,k+1,k+1]
+    p = 0.5*(a-d)
+    disc = p*p + b*c
+    real = (c != 0.0) & (disc >= 0.0)
+    if (not np.any(real)):
+        return
+    l = l[real]
+    k = k[real]
+    p = p[real]
+    c = c[real]
+
+    # rotators whose first columns are eigenvectors, [lam-d, c]
+    x = p + np.copysign(np.sqrt(disc[real]), p)
+    r = np.hypot(x, c)
+    cr = (x/r)[:,None]
+    sr = (c/r)[:,None]
+
+    # apply similarity transformations
+    Ti = T[l,k,:]
+    Tj = T[l,k+1,:]
+    T[l,k,:] = cr*Ti + sr*Tj
+    T[l,k+1,:] = cr*Tj - sr*Ti
+    Ti = T[l,:,k]
+    Tj = T[l,:,k+1]
+    T[l,:,k] = cr*Ti + sr*Tj
+    T[l,:,k+1] = cr*Tj - sr*Ti
+    T[l,k+1,k] = 0.0
+    if (Q is not None):
+        Qi = Q[l,:,k]
+        Qj = Q[l,:,k+1]
+        Q[l,:,k] = cr*Qi + sr*Qj
+        Q[l,:,k+1] = cr*Qj - sr*Qi
+
+
+def francis2_step_batched(A, s, t, lo, hi, Q=None):
+    """
+    Usage: francis2_step_batched(A, s, t, lo, hi, Q)
+
+    Function to perform one iteration of Francis' algorithm of degree two
+    (as in francis2_step) on the active windows A[l,lo[l]:hi[l]+1,lo[l]:hi[l]+1]
+    of a stack of real upper-Hessenberg matrices, all at once.  The bulges
+    are chased with 3x3 Householder reflectors as in francis2_step (the final
+    rotator is replaced by a 2x2 reflector, so that every step has the same
+    form), and step k of the chase acts on rows/columns k:k+3 of every matrix
+    in the batch; matrices whose windows do not cover step k receive the
+    identity (tau = 0).  The similarity transformations are applied to the
+    entire matrices in-place, and accumulated into Q, if supplied.
+
+    Input:   A - stack of real upper-Hessenberg matrices (N x n x n numpy array)
+             s - sums of shifts (N numpy array)
+             t - products of shifts (N numpy array)
+            lo - first row/column of active windows (N integer numpy array)
+            hi - last row/column of active windows (N integer numpy array,
+                 hi-lo >= 2)
+             Q - stack of orthogonal matrices to update (or None)
+    """
+
+    # imports
+    import numpy as np
+
+    n = np.size(A,1)
+    for k in range(np.min(lo), np.max(hi)):
+
+        # matrices introducing their bulge at step k, and those chasing it
+        first = (lo == k)
+        chase = (lo < k) & (k < hi)
+        k2 = min(k+3,n)
+
+        # vectors to reflect: first column of (A-rho1*I)*(A-rho2*I), or the
+        # next column of the bulge
+        x = np.zeros(np.size(A,0))
+        y = np.zeros(np.size(A,0))
+        z = np.zeros(np.size(A,0))
+        if (np.any(first)):
+            f = np.nonzero(first)[0]
+            a00 = A[f,k,k]
+            a10 = A[f,k+1,k]
+            x[f] = a00*a00 + A[f,k,k+1]*a10 - s[f]*a00 + t[f]
+            y[f] = a10*(a00 + A[f,k+1,k+1] - s[f])
+            z[f] = a10*A[f,k+2,k+1]
+        if (k > 0 and np.any(chase)):
+            x = np.where(chase, A[:,k,k-1], x)
+            y = np.where(chase, A[:,k+1,k-1], y)
+            if (k+2 < n):
+                z = np.where(chase, A[:,k+2,k-1], z)
+
+        # construct reflectors acting on rows/columns k:k+3
+        act = (first | chase) & ((y != 0.0) | (z != 0.0))
+        if (not np.any(act)):
+            continue
+        beta = -np.copysign(np.sqrt(x*x + y*y + z*z), x)
+        den = np.where(act, x-beta, 1.0)
+        beta[~act] = 1.0
+        tau = np.where(act, (beta-x)/beta, 0.0)[:,None]
+        v1 = (y/den)[:,None]
+        v2 = (z/den)[:,None]
+
+        # apply reflectors to A on left: A = P*A
+        R = A[:,k:k2,max(k-1,0):]
+        w = R[:,0] + v1*R[:,1]
+        if (k2 == k+3):
+            w += v2*R[:,2]
+            w *= tau
+            R[:,2] -= v2*w
+        else:
+            w *= tau
+        R[:,0] -= w
+        R[:,1] -= v1*w
+        if (k > 0):
+            A[chase,k+1,k-1] = 0.0
+            if (k2 == k+3):
+                A[chase,k+2,k-1] = 0.0
+
+        # apply reflectors to A on right: A = A*P, and update Q
+        for C in ([A[:,:min(k+4,n),k:k2]] + ([Q[:,:,k:k2]] if (Q is not None) else [])):
+            w = C[:,:,0] + v1*C[:,:,1]
+            if (k2 == k+3):
+                w += v2*C[:,:,2]
+                w *= tau
+                C[:,:,2] -= v2*w
+            else:
+                w *= tau
+            C[:,:,0] -= w
+            C[:,:,1] -= v1*w
+
+
+def schur_eigvals_batched(T):
+    """
+    Usage: lam = schur_eigvals_batched(T)
+
+    Function to extract the eigenvalues of a stack of real quasi-triangular
+    matrices (as in schur_eigvals), all at once.  The result is an N x n
+    complex array, where 2x2 diagonal blocks (with nonzero subdiagonal)
+    contribute complex-conjugate pairs.
+    """
+
+    # imports
+    import numpy as np
+
+    lam = np.diagonal(T, axis1=1, axis2=2).astype(complex)
+    l, k = np.nonzero(np.diagonal(T, offset=-1, axis1=1, axis2=2))
+    m = 0.5*(T[l,k,k] + T[l,k+1,k+1])
+    p = 0.5*(T[l,k,k] - T[l,k+1,k+1])
+    sq = np.sqrt((p*p + T[l,k,k+1]*T[l,k+1,k]).astype(complex))
+    lam[l,k] = m + sq
+    lam[l,k+1] = m - sq
+    return lam
+
+
+
+#----------------------------------------
+# primary routine
+
+def francis_batched(Ain, maxit, tol, want_vectors=True):
+    """
+    Usage: T,Q,its = francis_batched(Ain, maxit, tol, want_vectors)
+
+    Function to compute the real Schur decompositions of a stack of real
+    upper-Hessenberg matrices (e.g., from upper_hess_batched),
+           T[l] = Q[l]'*A[l]*Q[l],  l = 0, ..., N-1,
+    with Francis' algorithm of degree two, as in francis2.  Each iteration
+    performs one double-shift step on every unfinished matrix at once
+    (francis2_step_batched), with each matrix using its own active window
+    and its own shifts, so that the Python loops run over the matrix
+    dimension only, never over the batch.
+
+    The progress of each matrix is tracked with per-matrix arrays: the last
+    row hi of its active window (which deflates from the bottom by 1x1
+    blocks, or by 2x2 blocks that are triangularized with split_2x2_batched
+    if their eigenvalues are real), the first row lo of its window (the
+    last negligible subdiagonal entry above hi), and its iteration counts.
+    Matrices that have finished (hi = 0), or that have reached maxit
+    iterations, are masked out and copied back into the results, and the
+    working arrays are compressed to the remaining matrices, so that
+    finished matrices stop costing work.  As in francis2, a matrix whose
+    window has not deflated after 10 iterations uses an exceptional shift.
+
+    Input:    A - stack of real upper-Hessenberg matrices (N x n x n numpy array)
+          maxit - maximum allowed number of iterations per matrix
+            tol - relative eigenvalue tolerance
+   want_vectors - flag to accumulate Q (True), or skip it (False)
+    Outputs:  T - stack of real quasi-triangular matrices (N x n x n numpy array)
+              Q - stack of orthogonal matrices (N x n x n numpy array; None
+                  if want_vectors is False)
+            its - number of iterations taken by each matrix (N integer
+                  numpy array)
+    """
+
+    # imports
+    import numpy as np
+    from numpy.linalg import norm
+
+    # check inputs
+    if (np.ndim(Ain) != 3):
+        raise ValueError("francis_batched error: A must be 3-dimensional")
+    if (np.iscomplexobj(Ain)):
+        raise ValueError("francis_batched error: matrices must be real")
+    N, m, n = np.shape(Ain)
+    if (m != n):
+        raise ValueError("francis_batched error: matrices must be square")
+
+    # ensure that the matrices are essentially upper-Hessenberg
+    T = np.array(Ain, dtype=float)
+    tmp = T - np.triu(T,-1)  # portion of A that should be zero
+    if (norm(tmp.ravel(),np.inf) > 100*np.finfo(float).eps*norm(T.ravel(),np.inf)):
+        raise ValueError("francis_batched: matrices must be upper-Hessenberg")
+    T = np.triu(T,-1)
+
+    # initialize results, counters, and working arrays for the unfinished
+    # matrices (index idx into the batch)
+    Q = np.tile(np.eye(n), (N,1,1)) if want_vectors else None
+    its = np.zeros(N, dtype=int)
+    idx = np.arange(N)
+    A = T.copy()
+    Z = Q.copy() if want_vectors else None
+    hi = np.full(N, n-1)
+    wits = np.zeros(N, dtype=int)
+    rows = np.arange(n)
+
+    # perform iteration
+    while (np.size(idx) > 0):
+
+        # zero out negligible subdiagonal entries (neg[:,0] marks the top)
+        l = np.arange(np.size(idx))
+        dg = np.abs(np.diagonal(A, axis1=1, axis2=2))
+        sub = np.diagonal(A, offset=-1, axis1=1, axis2=2)
+        neg = np.ones([np.size(idx),n], dtype=bool)
+        neg[:,1:] = (np.abs(sub) <= tol*(dg[:,1:]+dg[:,:-1]))
+        A[:,rows[1:],rows[:-1]] = np.where(neg[:,1:], 0.0, sub)
+
+        # deflate converged 1x1 and 2x2 blocks from the bottom of each window
+        while (True):
+            live = (hi > 0)
+            one = live & neg[l,hi]
+            two = live & ~one & neg[l,np.maximum(hi-1,0)]
+            if (not np.any(one | two)):
+                break
+            if (np.any(two)):
+                t2 = np.nonzero(two)[0]
+                split_2x2_batched(A, t2, hi[t2]-1, Z)
+            hi[one] -= 1
+            hi[two] -= 2
+            wits[one | two] = 0
+
+        # copy finished matrices back into the results, and compress the
+        # working arrays to the remaining ones
+        done = (hi <= 0) | (its[idx] >= maxit)
+        if (np.any(done)):
+            T[idx[done]] = A[done]
+            if (want_vectors):
+                Q[idx[done]] = Z[done]
+            keep = ~done
+            idx = idx[keep]
+            A = A[keep]
+            Z = Z[keep] if want_vectors else None
+            hi = hi[keep]
+            wits = wits[keep]
+            neg = neg[keep]
+            l = np.arange(np.size(idx))
+            if (np.size(idx) == 0):
+                break
+        its[idx] += 1
+        wits += 1
+
+        # first row of each window: last negligible subdiagonal entry above hi
+        lo = np.max(np.where(neg & (rows[None,:] <= hi[:,None]), rows[None,:], 0), axis=1)
+
+        # set shifts (sum s and product t) from trailing 2x2 blocks, or use
+        # exceptional shifts to break possible cycles
+        a11 = A[l,hi-1,hi-1]
+        a22 = A[l,hi,hi]
+        s = a11 + a22
+        t = a11*a22 - A[l,hi-1,hi]*A[l,hi,hi-1]
+        exc = (wits % 10 == 0)
+        if (np.any(exc)):
+            w = np.abs(A[l,hi,hi-1]) + np.abs(A[l,hi-1,np.maximum(hi-2,0)])
+            h = 0.75*w + a22
+            s = np.where(exc, 2.0*h, s)
+            t = np.where(exc, h*h + 0.4375*w*w, t)
+
+        # perform one double-shift iteration on every active window
+        francis2_step_batched(A, s, t, lo, hi, Z)
+
+    return [T, Q, its]
@@ -0,0 +1,409 @@
+# francis_ms.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def chase_rot(A,i,c,s,cl,ch,rl,rh,U,u0):
+    """
+    Usage: chase_rot(A,i,c,s,cl,ch,rl,rh,U,u0)
+
+    Applies the rotator with block [c -s; s c] acting on rows/columns i and
+    i+1 as a similarity transformation to A, restricted to the columns
+    cl:ch (on the left) and rows rl:rh (on the right), and accumulates it
+    into columns i-u0 and i+1-u0 of U.  All arrays are updated in-place.
+    """
+
+    # imports
+    from francis_step import apply_rot_left, apply_rot_right
+
+    v1, v2 = apply_rot_left(A[i,cl:ch],A[i+1,cl:ch],c,s)
+    A[i,cl:ch] = v1
+    A[i+1,cl:ch] = v2
+    v1, v2 = apply_rot_right(A[rl:rh,i],A[rl:rh,i+1],c,s)
+    A[rl:rh,i] = v1
+    A[rl:rh,i+1] = v2
+    v1, v2 = apply_rot_right(U[:,i-u0],U[:,i+1-u0],c,s)
+    U[:,i-u0] = v1
+    U[:,i+1-u0] = v2
+
+
+def bulge_step(A,k,shift,lo,hi,w0,w1,U):
+    """
+    Usage: bulge_step(A,k,shift,lo,hi,w0,w1,U)
+
+    Advances one double-shift bulge by one position within the window
+    A[w0:w1+1,w0:w1+1] (rotations are accumulated into U, whose first row
+    and column correspond to w0).  For k == lo, the bulge is introduced
+    from the first column of (A-rho1*I)*(A-rho2*I), where shift = [s, t]
+    holds the sum and product of the shifts.  Otherwise, the bulge entries
+    A[k+1:k+3,k-1] are zeroed.  Each 3x3 reflector of francis2_step is
+    replaced by two rotators, acting on rows k+1:k+3 and then k:k+2; at
+    k == hi-1, a single rotator pushes the bulge out of the window.
+    """
+
+    # imports
+    from francis_step import rot
+
+    # bulge column
+    if (k == lo):
+        s, t = shift
+        x = A[lo,lo]*A[lo,lo] + A[lo,lo+1]*A[lo+1,lo] - s*A[lo,lo] + t
+        y = A[lo+1,lo]*(A[lo,lo] + A[lo+1,lo+1] - s)
+        z = A[lo+1,lo]*A[lo+2,lo+1]
+        cl = lo
+    else:
+        x = A[k,k-1]
+        y = A[k+1,k-1]
+        z = A[k+2,k-1] if (k+2 <= hi) else 0.0
+        cl = k-1
+    rh = min(k+4,hi+1)
+
+    # apply rotators
+    if (k < hi-1):
+        c, s = rot(y, z)
+        chase_rot(A, k+1, c, s, cl, w1+1, w0, rh, U, w0)
+        y = c*y + s*z
+    c, s = rot(x, y)
+    chase_rot(A, k, c, s, cl, w1+1, w0, rh, U, w0)
+    if (k > lo):
+        A[k+1,k-1] = 0.0
+        if (k < hi-1):
+            A[k+2,k-1] = 0.0
+
+
+def ms_sweep(A,shifts,lo,hi,Q=None,full=True,nround=None):
+    """
+    Usage: ms_sweep(A,shifts,lo,hi,Q,full,nround)
+
+    Function to perform one multishift sweep on the active window
+    A[lo:hi+1,lo:hi+1] of a real upper-Hessenberg matrix, chasing a chain
+    of tightly packed double-shift bulges (one per [s, t] pair in shifts)
+    from the top of the window to the bottom.  Bulge b trails bulge b-1 by
+    four rows, which keeps the bulges from interacting, so that in each
+    round every bulge is advanced by one position.
+
+    The rounds are grouped into blocks of nround rounds.  During a block,
+    the rotations only touch a small diagonal window A[w0:w1+1,w0:w1+1]
+    surrounding the chain, and are accumulated into a small orthogonal
+    matrix U; the rest of A (and Q, if supplied) is then updated with the
+    matrix-matrix products A[w0:w1+1,w1+1:] = U'*A[w0:w1+1,w1+1:],
+    A[:w0,w0:w1+1] = A[:w0,w0:w1+1]*U and Q[:,w0:w1+1] = Q[:,w0:w1+1]*U.
+    The 'full' flag has the same meaning as in francis2_step.
+    """
+
+    # imports
+    import numpy as np
+
+    # set ranges of rows (for right multiplies) and columns (for left
+    # multiplies) to update
+    n = np.size(A,0)
+    r0 = 0 if full else lo
+    c1 = n if full else hi+1
+
+    # bulge b is at position k = lo+r-4*b in round r, for 0 <= k-lo < nsteps
+    nb = len(shifts)
+    nsteps = hi-lo
+    nrounds = 4*(nb-1) + nsteps
+    if (nround is None):
+        nround = max(16, 4*nb)
+
+    # iterate over blocks of rounds
+    for rb in range(0, nrounds, nround):
+        re = min(rb+nround, nrounds)
+
+        # bulges that move during this block, and the window they occupy
+        bfirst = max(0, -(-(rb-nsteps+1)//4))
+        blast = min(nb-1, (re-1)//4)
+        w0 = max(lo, lo+rb-4*blast-1)
+        w1 = min(hi, lo+(re-1)-4*bfirst+3)
+        U = np.eye(w1-w0+1)
+
+        # chase bulges within the window
+        for r in range(rb, re):
+            for b in range(bfirst, blast+1):
+                j = r-4*b
+                if (j >= 0 and j < nsteps):
+                    bulge_step(A, lo+j, shifts[b], lo, hi, w0, w1, U)
+
+        # apply accumulated rotations outside of the window
+        if (w1+1 < c1):
+            A[w0:w1+1,w1+1:c1] = U.T @ A[w0:w1+1,w1+1:c1]
+        if (r0 < w0):
+            A[r0:w0,w0:w1+1] = A[r0:w0,w0:w1+1] @ U
+        if (Q is not None):
+            Q[:,w0:w1+1] = Q[:,w0:w1+1] @ U
+
+
+def ms_aed(A,lo,hi,nw,tol,Q=None,full=True):
+    """
+    Usage: nd, lam = ms_aed(A,lo,hi,nw,tol,Q,full)
+
+    Function to perform aggressive early deflation on the trailing nw x nw
+    window A[kw:hi+1,kw:hi+1] (kw = hi-nw+1 > lo) of the active block.  The
+    window is reduced to real Schur form T = V'*W*V with francis2, which
+    turns the single subdiagonal entry A[kw,kw-1] into the 'spike'
+    A[kw,kw-1]*V[0,:].  Trailing eigenvalue blocks of T whose spike entries
+    are negligible have converged, and are deflated (even though no
+    subdiagonal entry of A need be small).  The remaining part of the
+    window is returned to Hessenberg form (a Householder reflector maps its
+    spike onto the first entry, and upper_hess reduces the rest), and the
+    transformation is applied to the rest of A and to Q with matrix-matrix
+    products.  The 'full' flag has the same meaning as in francis2_step.
+
+    Outputs: nd - number of deflated eigenvalues
+            lam - undeflated eigenvalues of the window, for use as shifts
+                  (None if francis2 did not converge on the window)
+    """
+
+    # imports
+    import numpy as np
+    from upper_hess import upper_hess
+    from francis2 import francis2, schur_eigvals
+
+    # set ranges of rows (for right multiplies) and columns (for left
+    # multiplies) to update
+    n = np.size(A,0)
+    r0 = 0 if full else lo
+    c1 = n if full else hi+1
+
+    # real Schur form of window
+    kw = hi-nw+1
+    maxit = 30*nw
+    T, V, its = francis2(A[kw:hi+1,kw:hi+1], maxit, tol, 0)
+    if (its >= maxit):
+        return [0, None]
+    spike = A[kw,kw-1]*V[0,:]
+
+    # check for converged trailing blocks
+    nu = nw
+    tiny = np.finfo(float).tiny
+    while (nu > 0):
+        if (nu > 1 and T[nu-1,nu-2] != 0.0):     # 2x2 block
+            scale = np.abs(T[nu-1,nu-1]) + np.sqrt(np.abs(T[nu-2,nu-1]))*np.sqrt(np.abs(T[nu-1,nu-2]))
+            if (max(np.abs(spike[nu-2]), np.abs(spike[nu-1])) > max(tol*scale, tiny)):
+                break
+            nu -= 2
+        else:                                    # 1x1 block
+            if (np.abs(spike[nu-1]) > max(tol*np.abs(T[nu-1,nu-1]), tiny)):
+                break
+            nu -= 1
+    lam = schur_eigvals(T[:nu,:nu])
+    if (nu == nw):
+        return [0, lam]
+    spike[nu:] = 0.0
+
+    # return undeflated part of window to Hessenberg form
+    if (nu > 1 and np.linalg.norm(spike[1:nu]) > 0.0):
+        x = spike[:nu]
+        beta = -np.copysign(np.linalg.norm(x), x[0])
+        v = x/(x[0]-beta)
+        v[0] = 1.0
+        tau = (beta-x[0])/beta
+        T[:nu,:] -= tau*np.outer(v, v @ T[:nu,:])
+        T[:,:nu] -= tau*np.outer(T[:,:nu] @ v, v)
+        V[:,:nu] -= tau*np.outer(V[:,:nu] @ v, v)
+        spike[0] = beta
+        spike[1:nu] = 0.0
+    if (nu > 2):
+        H, Z = upper_hess(T[:nu,:nu])
+        T[:nu,:nu] = H
+        T[:nu,nu:] = Z.T @ T[:nu,nu:]
+        V[:,:nu] = V[:,:nu] @ Z
+
+    # store window, and apply transformation to the rest of A and to Q
+    A[kw:hi+1,kw:hi+1] = T
+    A[kw:hi+1,kw-1] = spike
+    if (hi+1 < c1):
+        A[kw:hi+1,hi+1:c1] = V.T @ A[kw:hi+1,hi+1:c1]
+    A[r0:kw,kw:hi+1] = A[r0:kw,kw:hi+1] @ V
+    if (Q is not None):
+        Q[:,kw:hi+1] = Q[:,kw:hi+1] @ V
+
+    return [nw-nu, lam]
+
+
+def ms_shifts(lam,ns):
+    """
+    Usage: shifts = ms_shifts(lam,ns)
+
+    Function to group up to ns shifts, taken from the end of the eigenvalue
+    array lam (as produced by schur_eigvals), into [s, t] pairs (the sum and
+    product of each pair of shifts), keeping complex-conjugate pairs
+    together.
+    """
+
+    # imports
+    import numpy as np
+
+    shifts = []
+    i = len(lam)-1
+    while (i >= 0 and len(shifts) < ns//2):
+        if (np.imag(lam[i]) != 0.0):             # complex-conjugate pair
+            shifts.append([2.0*np.real(lam[i]), np.abs(lam[i])**2])
+            i -= 2
+        elif (i > 0 and np.imag(lam[i-1]) == 0.0):   # two real shifts
+            a = np.real(lam[i])
+            b = np.real(lam[i-1])
+            shifts.append([a+b, a*b])
+            i -= 2
+        else:                                    # repeated real shift
+            a = np.real(lam[i])
+            shifts.append([2.0*a, a*a])
+            i -= 1
+    return shifts
+
+
+
+#----------------------------------------
+# primary routine
+
+def francis_ms(Ain,maxit,tol,diags,want_vectors=True,nshifts=None,nwin=None):
+    """
+    Usage: T,Q,its = francis_ms(Ain,maxit,tol,diags,want_vectors,nshifts,nwin)
+
+    Function to compute the real Schur decomposition of a given real
+    upper-Hessenberg matrix A,
+           T = Q'*A*Q,
+    (as in francis2) with the small-bulge multishift QR algorithm and
+    aggressive early deflation.  Each iteration (sweep) on the active block
+    A[l:hi+1,l:hi+1]
+       1. performs aggressive early deflation on a trailing window of nwin
+          rows (ms_aed), which can deflate converged eigenvalues well before
+          the corresponding subdiagonal entries become small; if enough
+          eigenvalues are deflated, the sweep is skipped;
+       2. otherwise, chases a chain of nshifts/2 double-shift bulges through
+          the active block (ms_sweep), using the undeflated eigenvalues of
+          the AED window as shifts.  Within the sweep, the rotations are
+          applied to a small window around the chain, and to the rest of
+          the matrix through blocked matrix-matrix products.
+    Blocks with fewer than 75 rows are finished with francis2.
+
+    Input:    A - real upper-Hessenberg square matrix
+          maxit - maximum allowed number of iterations (sweeps, plus the
+                  iterations of francis2 on small blocks)
+            tol - relative eigenvalue tolerance
+          diags - flag to turn on/off diagnostic messages:
+                        0 => off
+                     else => on
+   want_vectors - flag to accumulate Q (True), or skip it (False; T is then
+                  only correct within its diagonal blocks, which suffices
+                  for the eigenvalues)
+        nshifts - number of shifts per sweep (even; default depends on n)
+           nwin - AED window size (default: 3*nshifts/2)
+    Outputs:  T - real quasi-triangular matrix
+              Q - orthogonal matrix (None if want_vectors is False)
+            its - number of iterations taken
+    """
+
+    # imports
+    import numpy as np
+    from numpy.linalg import norm
+    from francis2 import francis2
+
+    # ensure that A is real
+    if (np.iscomplexobj(Ain)):
+        raise ValueError("francis_ms error: matrix must be real")
+
+    # copy input matrix into new working matrix
+    T = np.array(Ain, dtype=float)
+
+    # ensure that A is square
+    m,n = np.shape(T)
+    if (m != n):
+        raise ValueError("francis_ms error: matrix must be square")
+
+    # ensure that A is essentially upper-Hessenberg
+    tmp = T - np.triu(T,-1)  # portion of A that should be zero
+    if (norm(tmp,np.inf) > 100*np.finfo(float).eps*norm(T,np.inf)):
+        raise ValueError("francis_ms: matrix must be upper-Hessenberg")
+    T = np.triu(T,-1)
+
+    # set algorithm parameters
+    nmin = 75
+    if (nshifts is None):
+        if (n < 30):
+            nshifts = 2
+        elif (n < 60):
+            nshifts = 4
+        elif (n < 150):
+            nshifts = 10
+        else:
+            nshifts = min(64, max(10, n//25))
+    nshifts = max(2, nshifts - nshifts%2)
+    if (nwin is None):
+        nwin = (3*nshifts)//2
+
+    # initialize results, counters
+    Q = np.eye(n) if want_vectors else None
+    hi = n-1
+    its = 0
+    wits = 0
+
+    # perform iteration
+    while (hi > 0):
+
+        # determine first row of trailing unreduced block
+        l = hi
+        while (l > 0):
+            if (np.abs(T[l,l-1]) <= tol*(np.abs(T[l,l])+np.abs(T[l-1,l-1]))):
+                T[l,l-1] = 0.0
+                break
+            l -= 1
+
+        # finish small blocks with francis2
+        if (hi-l+1 < nmin):
+            Tb, Z, bits = francis2(T[l:hi+1,l:hi+1], max(maxit-its,0), tol, 0, want_vectors)
+            T[l:hi+1,l:hi+1] = Tb
+            if (want_vectors):
+                T[l:hi+1,hi+1:] = Z.T @ T[l:hi+1,hi+1:]
+                T[:l,l:hi+1] = T[:l,l:hi+1] @ Z
+                Q[:,l:hi+1] = Q[:,l:hi+1] @ Z
+            its += bits
+            if (its >= maxit):
+                break
+            hi = l-1
+            wits = 0
+            continue
+
+        # check for iteration limit
+        if (its >= maxit):
+            break
+
+        # aggressive early deflation; skip sweep if enough eigenvalues deflated
+        nw = min(nwin, hi-l)
+        nd, lam = ms_aed(T, l, hi, nw, tol, Q, want_vectors)
+        if (diags and nd > 0):
+            print("   AED on rows ",hi-nw+1,":",hi,",  deflated ",nd)
+        hi -= nd
+        if (nd > 0):
+            wits = 0
+        if (nd > 0.14*nw):
+            continue
+        its += 1
+        wits += 1
+
+        # set shifts from the AED window, or use exceptional shifts to break
+        # a possible cycle
+        if (lam is None or len(lam) < 2 or wits % 10 == 0):
+            shifts = []
+            for i in range(hi, max(l+1, hi-nshifts), -2):
+                w = np.abs(T[i,i-1]) + np.abs(T[i-1,i-2])
+                h = 0.75*w + T[i,i]
+                shifts.append([2.0*h, h*h + 0.4375*w*w])
+        else:
+            shifts = ms_shifts(lam, nshifts)
+
+        # output some diagnostic information to the screen
+        if (diags):
+            print("   iter ",its,":  submatrix ",l,":",hi,",  bulges = ",len(shifts))
+
+        # chase a chain of bulges through the active block
+        ms_sweep(T, shifts, l, hi, Q, want_vectors)
+
+    return [T, Q, its]
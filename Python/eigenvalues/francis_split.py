@@ -0,0 +1,154 @@
+# francis_split.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def unreduced_blocks(T,lo,hi,tol):
+    """
+    Usage: blocks = unreduced_blocks(T,lo,hi,tol)
+
+    Function to split the diagonal block T[lo:hi+1,lo:hi+1] of an
+    upper-Hessenberg matrix at every negligible subdiagonal entry,
+          |T(j,j-1)| <= tol*(|T(j,j)|+|T(j-1,j-1)|),
+    (which are set to zero), returning the list of [l, h] index pairs of
+    the resulting unreduced diagonal blocks T[l:h+1,l:h+1].
+    """
+
+    # imports
+    import numpy as np
+
+    blocks = []
+    l = lo
+    for j in range(lo+1,hi+1):
+        if (np.abs(T[j,j-1]) <= tol*(np.abs(T[j,j])+np.abs(T[j-1,j-1]))):
+            T[j,j-1] = 0.0
+            blocks.append([l, j-1])
+            l = j
+    blocks.append([l, hi])
+    return blocks
+
+
+
+#----------------------------------------
+# primary routine
+
+def francis_split(Ain,maxit,tol,diags,want_vectors=True,nworkers=None,minsplit=32,processes=False):
+    """
+    Usage: T,Q,its = francis_split(Ain,maxit,tol,diags,want_vectors,nworkers,minsplit,processes)
+
+    Function to compute the real Schur decomposition of a given real
+    upper-Hessenberg matrix A,
+           T = Q'*A*Q,
+    (as in francis2) by splitting the matrix into independent unreduced
+    blocks, and solving those blocks concurrently on a pool of workers.
+
+    Every negligible subdiagonal entry of A decouples the eigenvalue problem
+    into the diagonal blocks above and below it.  All such entries are found
+    (unreduced_blocks), and each unreduced block of three or more rows is
+    submitted to the pool, where a copy of it is iterated on with francis2.
+    A worker returns its block as soon as the block is finished, or has
+    itself split into two unreduced blocks of at least minsplit rows each;
+    the finished block and its orthogonal transformation Z are then merged
+    into the global results (T[l:h+1,h+1:] = Z'*T[l:h+1,h+1:],
+    T[:l,l:h+1] = T[:l,l:h+1]*Z and Q[:,l:h+1] = Q[:,l:h+1]*Z, all performed
+    by the calling thread), and any remaining unreduced blocks are added to
+    the work queue.  Unreduced 2x2 blocks are handled directly with
+    split_2x2.
+
+    Input:    A - real upper-Hessenberg square matrix
+          maxit - maximum allowed number of iterations (total over all
+                  blocks; workers that are already running may exceed it)
+            tol - relative eigenvalue tolerance
+          diags - flag to turn on/off diagnostic messages:
+                        0 => off
+                     else => on
+   want_vectors - flag to accumulate Q (True), or skip it (False; T is then
+                  only correct within its diagonal blocks, which suffices
+                  for the eigenvalues)
+       nworkers - number of workers (default: os.cpu_count())
+       minsplit - minimum block size for a worker to return a split block
+      processes - flag to use a pool of processes instead of threads (since
+                  francis2 performs many small operations, threads are
+                  largely serialized by the Python interpreter lock)
+    Outputs:  T - real quasi-triangular matrix
+              Q - orthogonal matrix (None if want_vectors is False)
+            its - number of iterations taken
+    """
+
+    # imports
+    import os
+    import numpy as np
+    from numpy.linalg import norm
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+    from francis2 import francis2, split_2x2
+
+    # ensure that A is real
+    if (np.iscomplexobj(Ain)):
+        raise ValueError("francis_split error: matrix must be real")
+
+    # copy input matrix into new working matrix
+    T = np.array(Ain, dtype=float)
+
+    # ensure that A is square
+    m,n = np.shape(T)
+    if (m != n):
+        raise ValueError("francis_split error: matrix must be square")
+
+    # ensure that A is essentially upper-Hessenberg
+    tmp = T - np.triu(T,-1)  # portion of A that should be zero
+    if (norm(tmp,np.inf) > 100*np.finfo(float).eps*norm(T,np.inf)):
+        raise ValueError("francis_split: matrix must be upper-Hessenberg")
+    T = np.triu(T,-1)
+
+    # check parallelism parameters
+    if (nworkers is None):
+        nworkers = os.cpu_count() or 1
+    if (nworkers < 1 or minsplit < 1):
+        raise ValueError("francis_split error: nworkers and minsplit must be positive")
+
+    # initialize results, counter
+    Q = np.eye(n) if want_vectors else None
+    its = 0
+
+    # work queue of running blocks
+    Executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    running = {}
+    with Executor(max_workers=nworkers) as pool:
+
+        def submit(l, h):
+            if (h-l+1 == 2):
+                split_2x2(T, l, Q, want_vectors)
+            elif (h-l+1 > 2):
+                if (diags):
+                    print("   submitting block ",l,":",h)
+                task = pool.submit(francis2, T[l:h+1,l:h+1].copy(), maxit-its,
+                                   tol, 0, want_vectors, minsplit)
+                running[task] = [l, h]
+
+        # split A, and submit its unreduced blocks
+        for l, h in unreduced_blocks(T, 0, n-1, tol):
+            submit(l, h)
+
+        # merge finished blocks, and submit the blocks that remain
+        while (len(running) > 0):
+            done, pending = wait(list(running), return_when=FIRST_COMPLETED)
+            for task in done:
+                l, h = running.pop(task)
+                B, Z, bits = task.result()
+                its += bits
+                T[l:h+1,l:h+1] = B
+                if (want_vectors):
+                    T[l:h+1,h+1:] = Z.T @ T[l:h+1,h+1:]
+                    T[:l,l:h+1] = T[:l,l:h+1] @ Z
+                    Q[:,l:h+1] = Q[:,l:h+1] @ Z
+                if (its < maxit):
+                    for l2, h2 in unreduced_blocks(T, l, h, tol):
+                        submit(l2, h2)
+
+    return [T, Q, its]
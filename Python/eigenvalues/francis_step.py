@@ -83,9 +83,9 @@ def apply_rot_right(Mi,Mj,c,s):
 #----------------------------------------
 # primary routine
 
-def francis_step(Ain,rho):
+def francis_step(Ain,rho,want_vectors=True):
     """
-    Usage: Anew, Q = francis_step(Aold,rho)
+    Usage: Anew, Q = francis_step(Aold,rho,want_vectors)
    
     Function to perform one iteration of Francis' algorithm of degree one.
     Computes the unitary similarity transformation 
@@ -93,13 +93,22 @@ def francis_step(Ain,rho):
     where Aold is an upper-Hessenberg matrix, Q is a unitary transformation matrix,
     and Anew is an upper-Hessenberg result, through introducing a bulge in Aold (via
     a rotator), and chasing it back out (via a sequence of rotators).
+
+    The first rotator is computed from the first column of Aold-rho*I, but
+    is applied (as are the others) to the unshifted matrix, and each rotator
+    is only applied to the rows and columns of the Hessenberg window that it
+    can modify, so a step requires O(n^2) work.
    
-    Note: since this routine returns the full transformation matrix Q (and not
-    just its parts), it is less efficient than it *could* be.
+    Note: when want_vectors is True, the full transformation matrix Q is
+    formed and updated with every rotator.  When only the eigenvalues are
+    desired, set want_vectors to False: Q is then never allocated, and the
+    rotators are instead returned in compact form, as the arrays [c, s] of
+    their cosine and sine terms (rotator j acts on rows/columns j and j+1).
    
     Input:    A - upper-Hessenberg square matrix (Aold)
               rho - desired shift
-    Outputs:  Q - unitary matrix
+              want_vectors - flag to form Q (True), or return the rotators (False)
+    Outputs:  Q - unitary matrix (or [c, s] arrays if want_vectors is False)
               A - upper-Hessenberg matrix result (Anew)
     """
 
@@ -109,11 +118,18 @@ def francis_step(Ain,rho):
     # get matrix size
     n = np.size(Ain,1)   # assumed square
 
-    # shift the input matrix by rho
-    A = Ain - rho*np.eye(n)
+    # copy the input matrix (complex if the shift is complex)
+    A = np.array(Ain, dtype=np.result_type(Ain, rho, 1.0))
+
+    # initialize Q, or the rotator arrays
+    if (want_vectors):
+        Q = np.eye(n, dtype=A.dtype)
+    else:
+        cr = np.zeros(max(n-1,0), dtype=A.dtype)
+        sr = np.zeros(max(n-1,0), dtype=A.dtype)
 
-    # introduce bulge
-    c,s = rot(A[0,0], A[1,0])     # compute rotation matrix components
+    # introduce bulge, via a rotator computed from the shifted matrix
+    c,s = rot(A[0,0]-rho, A[1,0])     # compute rotation matrix components
 
     # apply rotation to A on left: A = Qij'*A
     v1, v2 = apply_rot_left(A[0,:],A[1,:],c,s)
@@ -121,20 +137,20 @@ def francis_step(Ain,rho):
     A[1,:] = v2
 
     # apply rotation to A on right: A = A*Qij
-    v1, v2 = apply_rot_right(A[:,0],A[:,1],c,s)
-    A[:,0] = v1
-    A[:,1] = v2
-
-    # create Q
-    if isinstance(rho, complex):
-        Q = np.eye(n, dtype=complex)
+    r = min(3,n)
+    v1, v2 = apply_rot_right(A[:r,0],A[:r,1],c,s)
+    A[:r,0] = v1
+    A[:r,1] = v2
+
+    # store rotator
+    if (want_vectors):
+        Q[0,0] = c
+        Q[0,1] = -s
+        Q[1,0] = s
+        Q[1,1] = c
     else:
-        Q = np.eye(n)
-    Q[0,0] = c
-    Q[0,1] = -s
-    Q[1,0] = s
-    Q[1,1] = c
-
+        cr[0] = c
+        sr[0] = s
   
     # chase the bulge
     for j in range(n-2):
@@ -142,22 +158,27 @@ def francis_step(Ain,rho):
         # construct rotator to zero non-Hessenberg part of column
         c, s = rot(A[j+1,j], A[j+2,j])
 
-        # apply rotation to A on left: A = Qij'*A
-        v1, v2 = apply_rot_left(A[j+1,:],A[j+2,:],c,s)
-        A[j+1,:] = v1
-        A[j+2,:] = v2
-
-        # apply rotation to A on right: A = A*Qij
-        v1, v2 = apply_rot_right(A[:,j+1],A[:,j+2],c,s)
-        A[:,j+1] = v1
-        A[:,j+2] = v2
-
-        # update Q
-        v1, v2 = apply_rot_right(Q[:,j+1],Q[:,j+2],c,s)
-        Q[:,j+1] = v1
-        Q[:,j+2] = v2
-
-    # undo shift on result
-    A = A + rho*np.eye(n)
-
-    return [A, Q]
+        # apply rotation to A on left: A = Qij'*A (columns j: only)
+        v1, v2 = apply_rot_left(A[j+1,j:],A[j+2,j:],c,s)
+        A[j+1,j:] = v1
+        A[j+2,j:] = v2
+
+        # apply rotation to A on right: A = A*Qij (rows :j+4 only)
+        r = min(j+4,n)
+        v1, v2 = apply_rot_right(A[:r,j+1],A[:r,j+2],c,s)
+        A[:r,j+1] = v1
+        A[:r,j+2] = v2
+
+        # update Q, or store rotator
+        if (want_vectors):
+            v1, v2 = apply_rot_right(Q[:,j+1],Q[:,j+2],c,s)
+            Q[:,j+1] = v1
+            Q[:,j+2] = v2
+        else:
+            cr[j+1] = c
+            sr[j+1] = s
+
+    if (want_vectors):
+        return [A, Q]
+    else:
+        return [A, [cr, sr]]
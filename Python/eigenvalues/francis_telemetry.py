@@ -0,0 +1,165 @@
+# francis_telemetry.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# telemetry object
+
+class FrancisTelemetry:
+    """
+    Usage: tel = FrancisTelemetry(track_memory)
+
+    Class to record the convergence history of francis1, as a structured
+    alternative to its diags output.  Pass it as francis1(..., telemetry=tel);
+    francis1 then calls tel.start(n) before iterating, tel.iteration(...)
+    after each iteration, tel.deflation(...) for each converged eigenvalue,
+    and tel.finish(its) at the end.  When no telemetry object is given,
+    none of this is computed, so the hook costs nothing when turned off.
+
+    Each iteration record holds the iteration number, the active window
+    [lo, hi], the shift type and value (real and imaginary parts), the
+    2-norm of the window's subdiagonal and its last entry |A(hi,hi-1)|, the
+    time spent in francis_step and in updating the rest of A and Q, and (if
+    track_memory is True, using tracemalloc) the peak number of bytes
+    allocated during the iteration.  Note that tracing allocations slows
+    down the iteration itself, so the timings are only meaningful with
+    track_memory False.
+
+    Attributes:
+       records is the list of iteration records (dictionaries)
+       deflations is the list of deflation events (dictionaries with the
+         iteration number, row index and eigenvalue)
+       n is the matrix dimension, and its the number of iterations taken
+
+    Methods:
+       tel.to_csv(f)   writes the iteration records to a CSV file
+       tel.to_json(f)  writes all of the data to a JSON file
+       s = tel.summary()  returns a dictionary of totals
+    """
+
+    fields = ["iter", "lo", "hi", "shift_type", "shift_real", "shift_imag",
+              "subdiag_norm", "subdiag_last", "t_step", "t_update", "bytes"]
+
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.records = []
+        self.deflations = []
+        self.n = 0
+        self.its = 0
+        self._tracing = False
+
+    def start(self, n):
+        """
+        Usage: tel.start(n)
+
+        Clears any previous data, and starts tracing allocations if requested.
+        """
+        import tracemalloc
+        self.records = []
+        self.deflations = []
+        self.n = n
+        self.its = 0
+        if (self.track_memory and not tracemalloc.is_tracing()):
+            tracemalloc.start()
+            self._tracing = True
+        self.begin()
+
+    def begin(self):
+        """
+        Usage: tel.begin()
+
+        Marks the start of an iteration, for the allocation count.
+        """
+        import tracemalloc
+        if (self.track_memory and tracemalloc.is_tracing()):
+            tracemalloc.reset_peak()
+            self._base = tracemalloc.get_traced_memory()[0]
+
+    def iteration(self, its, lo, hi, shift_type, shift, subdiag_norm, subdiag_last,
+                  t_step, t_update):
+        """
+        Usage: tel.iteration(its, lo, hi, shift_type, shift, subdiag_norm,
+                             subdiag_last, t_step, t_update)
+
+        Records one iteration, and marks the start of the next one.
+        """
+        import tracemalloc
+        nbytes = 0
+        if (self.track_memory and tracemalloc.is_tracing()):
+            nbytes = tracemalloc.get_traced_memory()[1] - self._base
+        shift = complex(shift)
+        self.records.append({"iter": its, "lo": lo, "hi": hi, "shift_type": shift_type,
+                             "shift_real": shift.real, "shift_imag": shift.imag,
+                             "subdiag_norm": float(subdiag_norm),
+                             "subdiag_last": float(subdiag_last),
+                             "t_step": t_step, "t_update": t_update, "bytes": nbytes})
+        self.begin()
+
+    def deflation(self, its, row, eigenvalue):
+        """
+        Usage: tel.deflation(its, row, eigenvalue)
+
+        Records the convergence of the eigenvalue in the given row.
+        """
+        eigenvalue = complex(eigenvalue)
+        self.deflations.append({"iter": its, "row": row, "eig_real": eigenvalue.real,
+                                "eig_imag": eigenvalue.imag})
+
+    def finish(self, its):
+        """
+        Usage: tel.finish(its)
+
+        Records the total number of iterations, and stops tracing allocations
+        (if this object started it).
+        """
+        import tracemalloc
+        self.its = its
+        if (self._tracing):
+            tracemalloc.stop()
+            self._tracing = False
+
+    def summary(self):
+        """
+        Usage: s = tel.summary()
+
+        Returns a dictionary with the number of iterations and deflations,
+        the total times spent in francis_step and in the updates, and the
+        largest number of bytes allocated in any iteration.
+        """
+        return {"n": self.n, "its": self.its, "deflations": len(self.deflations),
+                "t_step": sum([r["t_step"] for r in self.records]),
+                "t_update": sum([r["t_update"] for r in self.records]),
+                "max_bytes": max([r["bytes"] for r in self.records], default=0)}
+
+    def to_csv(self, f):
+        """
+        Usage: tel.to_csv(f)
+
+        Writes the iteration records to f (a file name, or an open file
+        object), one row per iteration.
+        """
+        import csv
+        if (isinstance(f, str)):
+            with open(f, "w", newline="") as fh:
+                return self.to_csv(fh)
+        writer = csv.DictWriter(f, fieldnames=self.fields)
+        writer.writeheader()
+        writer.writerows(self.records)
+
+    def to_json(self, f):
+        """
+        Usage: tel.to_json(f)
+
+        Writes the summary, iteration records and deflation events to f (a
+        file name, or an open file object).
+        """
+        import json
+        if (isinstance(f, str)):
+            with open(f, "w") as fh:
+                return self.to_json(fh)
+        json.dump({"summary": self.summary(), "iterations": self.records,
+                   "deflations": self.deflations}, f, indent=1)
@@ -0,0 +1,254 @@
+# sturm_bisect.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def sturm_count(d, e, x):
+    """
+    Usage: count = sturm_count(d, e, x)
+
+    Function to count the eigenvalues of the symmetric tridiagonal matrix T
+    (with diagonal d and off-diagonal e) that are less than x, from the
+    number of negative pivots in the LDL' factorization of T - x*I (by
+    Sylvester's law of inertia), computed with the Sturm-sequence recurrence
+          q_0 = d_0 - x,   q_i = d_i - x - e_{i-1}^2/q_{i-1}.
+    The recurrence is vectorized over x, which may be a scalar or an array
+    of shifts; tiny pivots are replaced by -pivmin to avoid division by zero.
+
+    Inputs:  d - diagonal of T (n numpy array)
+             e - off-diagonal of T (n-1 numpy array)
+             x - shift(s)
+    Outputs: count - number of eigenvalues less than each x (int numpy array)
+    """
+
+    # imports
+    import numpy as np
+
+    x = np.asarray(x, dtype=float)
+    e2 = np.asarray(e, dtype=float)**2
+    pivmin = np.finfo(float).tiny*max(1.0, np.max(e2, initial=0.0))
+    q = d[0] - x
+    count = (q < 0).astype(int)
+    for i in range(1, np.size(d)):
+        q = np.where(np.abs(q) < pivmin, -pivmin, q)
+        q = (d[i] - x) - e2[i-1]/q
+        count += (q < 0)
+    return count
+
+
+def tridiag_bounds(d, e):
+    """
+    Usage: lo, hi = tridiag_bounds(d, e)
+
+    Function to compute an interval [lo, hi] that contains all eigenvalues
+    of the symmetric tridiagonal matrix T, from its Gershgorin discs.
+    """
+
+    # imports
+    import numpy as np
+
+    r = np.zeros(np.size(d))
+    r[:-1] += np.abs(e)
+    r[1:] += np.abs(e)
+    lo = np.min(d - r)
+    hi = np.max(d + r)
+    pad = 2.0*np.finfo(float).eps*max(np.abs(lo), np.abs(hi)) + np.finfo(float).tiny
+    return [lo-pad, hi+pad]
+
+
+def bisect_range(d, e, a, b, j0, j1, tol):
+    """
+    Usage: lam = bisect_range(d, e, a, b, j0, j1, tol)
+
+    Function to compute the eigenvalues lam_j0 <= ... <= lam_{j1-1} (indices
+    in ascending order) of the symmetric tridiagonal matrix T by bisection,
+    given an interval [a, b) that contains them.  All of the eigenvalues are
+    bisected simultaneously: each keeps its own interval [lo_j, hi_j) with
+    sturm_count(lo_j) <= j < sturm_count(hi_j), and the counts at all of the
+    midpoints are computed with one vectorized call to sturm_count.  The
+    bisection stops when the intervals are narrower than
+    tol*max(|lo_j|,|hi_j|).
+    """
+
+    # imports
+    import numpy as np
+
+    j = np.arange(j0, j1)
+    lo = np.full(j1-j0, float(a))
+    hi = np.full(j1-j0, float(b))
+    tiny = np.finfo(float).tiny
+    for it in range(200):
+        if (np.all(hi-lo <= tol*np.maximum(np.abs(lo), np.abs(hi)) + tiny)):
+            break
+        mid = 0.5*(lo+hi)
+        below = sturm_count(d, e, mid) <= j
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    return 0.5*(lo+hi)
+
+
+def tridiag_invit(d, e, lam, ortol=None):
+    """
+    Usage: Z = tridiag_invit(d, e, lam, ortol)
+
+    Function to compute the eigenvectors of the symmetric tridiagonal matrix
+    T corresponding to the (ascending) eigenvalue approximations lam, by
+    inverse iteration: starting from a random vector, each iteration solves
+    (T - lam_j*I)*z = z with the banded solver scipy.linalg.solve_banded
+    (O(n) work), and normalizes z.  Eigenvalues closer than ortol (default:
+    1e-3*||T||) form a cluster, within which each vector is reorthogonalized
+    against the previous ones.
+
+    Inputs:  d - diagonal of T (n numpy array)
+             e - off-diagonal of T (n-1 numpy array)
+             lam - eigenvalues (m numpy array, ascending)
+             ortol - cluster tolerance
+    Outputs: Z - eigenvectors (n x m numpy array)
+    """
+
+    # imports
+    import numpy as np
+    from scipy.linalg import solve_banded
+
+    # get problem dimensions
+    n = np.size(d)
+    m = np.size(lam)
+    tnorm = np.max(np.abs(d)) + 2.0*np.max(np.abs(e), initial=0.0)
+    if (ortol is None):
+        ortol = 1e-3*tnorm
+    eps = np.finfo(float).eps
+
+    # banded storage of T - lam*I
+    ab = np.zeros([3,n])
+    ab[0,1:] = e
+    ab[2,:-1] = e
+
+    # iterate over eigenvalues
+    Z = np.zeros([n,m])
+    rng = np.random.default_rng(0)
+    c0 = 0                                   # first vector of current cluster
+    for j in range(m):
+        if (j > 0 and lam[j]-lam[j-1] > ortol):
+            c0 = j
+        ab[1] = d - lam[j]
+        z = rng.standard_normal(n)
+        for it in range(3):
+            try:
+                z = solve_banded((1,1), ab, z, check_finite=False)
+            except np.linalg.LinAlgError:        # exactly singular: perturb shift
+                ab[1] -= eps*tnorm
+                z = solve_banded((1,1), ab, z, check_finite=False)
+            z -= Z[:,c0:j] @ (Z[:,c0:j].T @ z)
+            z /= np.linalg.norm(z)
+        Z[:,j] = z
+
+    return Z
+
+
+
+#----------------------------------------
+# primary routine
+
+def bisect_eigs(d, e, interval=None, k=None, want_vectors=False, tol=None,
+                nworkers=None, processes=False):
+    """
+    Usage: lam,Z = bisect_eigs(d, e, interval, k, want_vectors, tol, nworkers, processes)
+
+    Function to compute selected eigenvalues of the symmetric tridiagonal
+    matrix T (e.g., from sym_tridiag), with diagonal d and off-diagonal e,
+    by Sturm-sequence bisection:
+       - if interval = [lower, upper] is given, all eigenvalues in
+         [lower, upper) are computed;
+       - otherwise, if k is given, the k smallest eigenvalues are computed;
+       - otherwise, all eigenvalues are computed.
+    The Sturm counts at the ends of the interval determine the indices of
+    the requested eigenvalues; these are split into contiguous sub-ranges
+    (one per worker, i.e., sub-intervals of the requested interval), which
+    are bisected concurrently on a pool of threads (or processes, which
+    avoid the Python interpreter lock).  Each bisection step costs O(n) per
+    eigenvalue, independent of the others, so only the requested eigenvalues
+    are ever computed.
+
+    If want_vectors is True, the corresponding eigenvectors are computed by
+    inverse iteration (tridiag_invit), with the eigenvalues grouped into
+    clusters that are also distributed among the workers.
+
+    Inputs:  d - diagonal of T (n numpy array)
+             e - off-diagonal of T (n-1 numpy array)
+             interval - [lower, upper] interval of desired eigenvalues
+             k - number of smallest eigenvalues desired
+             want_vectors - flag to compute the eigenvectors
+             tol - relative eigenvalue tolerance (default: 2*machine epsilon)
+             nworkers - number of workers (default: os.cpu_count())
+             processes - flag to use a pool of processes instead of threads
+    Outputs: lam - eigenvalues, in ascending order (m numpy array)
+             Z - eigenvectors of T (n x m numpy array; None if want_vectors
+                 is False)
+    """
+
+    # imports
+    import os
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+    # check inputs
+    d = np.asarray(d, dtype=float)
+    e = np.asarray(e, dtype=float)
+    n = np.size(d)
+    if (np.size(e) != max(n-1,0)):
+        raise ValueError("bisect_eigs error: d and e are incompatible")
+    if (tol is None):
+        tol = 2.0*np.finfo(float).eps
+    if (nworkers is None):
+        nworkers = os.cpu_count() or 1
+    if (nworkers < 1):
+        raise ValueError("bisect_eigs error: nworkers must be positive")
+
+    # determine bracketing interval, and indices of desired eigenvalues
+    a, b = tridiag_bounds(d, e)
+    if (interval is not None):
+        a = max(a, float(interval[0]))
+        b = min(b, float(interval[1]))
+        if (a >= b):
+            j0 = j1 = 0
+        else:
+            j0, j1 = sturm_count(d, e, [a, b])
+    elif (k is not None):
+        j0, j1 = 0, min(max(int(k),0), n)
+    else:
+        j0, j1 = 0, n
+    m = j1-j0
+    if (m == 0):
+        return [np.zeros(0), np.zeros([n,0]) if want_vectors else None]
+
+    # bisect sub-ranges of eigenvalues concurrently
+    Executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with Executor(max_workers=nworkers) as pool:
+        chunk = -(-m//nworkers)
+        tasks = [pool.submit(bisect_range, d, e, a, b, i0, min(i0+chunk, j1), tol)
+                 for i0 in range(j0, j1, chunk)]
+        lam = np.concatenate([task.result() for task in tasks])
+
+        # inverse iteration on clusters of eigenvalues, distributed among the
+        # workers in contiguous groups
+        Z = None
+        if (want_vectors):
+            tnorm = np.max(np.abs(d)) + 2.0*np.max(np.abs(e), initial=0.0)
+            ortol = 1e-3*tnorm
+            splits = [0] + [j for j in range(1,m) if lam[j]-lam[j-1] > ortol] + [m]
+            groups = []
+            for i in range(len(splits)-1):
+                if (len(groups) == 0 or splits[i] - groups[-1][0] >= chunk):
+                    groups.append([splits[i], splits[i+1]])
+                else:
+                    groups[-1][1] = splits[i+1]
+            tasks = [pool.submit(tridiag_invit, d, e, lam[g0:g1], ortol) for g0, g1 in groups]
+            Z = np.hstack([task.result() for task in tasks])
+
+    return [lam, Z]
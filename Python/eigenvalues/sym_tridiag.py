@@ -0,0 +1,76 @@
+# sym_tridiag.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def sym_tridiag(A, want_vectors=True):
+    """
+    Usage: d,e,Q = sym_tridiag(A, want_vectors)
+
+    Function to convert a symmetric matrix to tridiagonal form via the
+    orthogonal similarity transformation
+           T = Q'*A*Q,
+    where T is symmetric tridiagonal, and is returned as two 1D arrays: its
+    diagonal d and its off-diagonal e (T[j,j+1] = T[j+1,j] = e[j]).
+
+    This is the symmetric counterpart of upper_hess_compact: each Householder
+    reflector I - gam*u*u' is applied to the trailing submatrix S as the
+    symmetric rank-2 update
+           p = gam*S*u,   w = p - (gam/2)*(p'*u)*u,   S = S - u*w' - w*u',
+    which requires roughly half of the work of applying it on both sides,
+    and is stored in the zeroed-out part of the working matrix, from which Q
+    is formed (with hess_form_q) only if want_vectors is True.
+
+    Input:    A - symmetric matrix
+   want_vectors - flag to form Q (True), or skip it (False)
+    Outputs:  d - diagonal of T (n numpy array)
+              e - off-diagonal of T (n-1 numpy array)
+              Q - orthogonal matrix (None if want_vectors is False)
+    """
+
+    # imports
+    import numpy as np
+    from upper_hess_compact import hess_form_q
+
+    # ensure that A is square
+    m,n = np.shape(A)
+    if (m != n):
+        raise ValueError("sym_tridiag error: matrix must be square")
+
+    # initialize working matrix and results
+    T = np.array(A, dtype=float)
+    e = np.zeros(max(n-1,0))
+    gam = np.zeros(max(n-2,0))
+
+    # iterate over columns
+    for j in range(n-2):
+
+        # construct reflector to zero out column below first subdiagonal
+        b = T[j+1:,j]
+        if (np.linalg.norm(b[1:]) == 0.0):       # nothing to zero out
+            e[j] = b[0]
+            continue
+        beta = np.linalg.norm(b)
+        tau = beta*np.sign(b[0]+np.finfo(float).eps)
+        u = np.empty(n-j-1)
+        u[0] = 1.0
+        u[1:] = b[1:]/(b[0]+tau)
+        gam[j] = (tau+b[0])/tau
+        e[j] = -tau
+        T[j+2:,j] = u[1:]
+
+        # symmetric rank-2 update of trailing submatrix
+        S = T[j+1:,j+1:]
+        p = gam[j]*(S @ u)
+        w = p - (0.5*gam[j]*(p @ u))*u
+        S -= np.outer(u, w) + np.outer(w, u)
+
+    # extract tridiagonal matrix, and form Q
+    d = np.diag(T).copy()
+    if (n > 1):
+        e[n-2] = T[n-1,n-2]
+    Q = hess_form_q(T, gam) if want_vectors else None
+
+    return [d, e, Q]
@@ -0,0 +1,118 @@
+# tridiag_ql.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def tridiag_ql(d, e, Z=None, tol=None, maxit=None):
+    """
+    Usage: lam,Z,its = tridiag_ql(d, e, Z, tol, maxit)
+
+    Function to compute the eigenvalues (and optionally eigenvectors) of a
+    symmetric tridiagonal matrix T, stored as its diagonal d and
+    off-diagonal e, with the implicitly-shifted QL algorithm.  Each
+    iteration works on the unreduced block T[l:m+1,l:m+1] containing the
+    current row l, where the off-diagonal entries are negligible when
+          |e(j)| <= tol*(|d(j)|+|d(j+1)|),
+    using a Wilkinson shift from its leading 2x2 block, and chases the bulge
+    upward from row m with a sequence of rotators.  Since only the two
+    arrays are updated, each iteration requires O(n) work and storage.  If
+    Z is supplied, the rotators are also applied to its columns (O(n^2)
+    work per iteration): when Z = I, its columns become the eigenvectors of
+    T, and when Z is the Q from sym_tridiag, they become the eigenvectors of
+    the original symmetric matrix.
+
+    Input:    d - diagonal of T (n numpy array; not modified)
+              e - off-diagonal of T (n-1 numpy array; not modified)
+              Z - matrix to accumulate the rotators into (updated in-place;
+                  or None)
+            tol - relative tolerance (default: machine epsilon)
+          maxit - maximum allowed number of iterations (default: 30*n)
+    Outputs: lam - eigenvalues, in ascending order (n numpy array)
+              Z - updated matrix, with columns sorted to match lam
+            its - number of iterations taken
+    """
+
+    # imports
+    import math
+    import numpy as np
+    from francis_step import apply_rot_right
+
+    # set defaults, and copy inputs
+    n = np.size(d)
+    if (np.size(e) != max(n-1,0)):
+        raise ValueError("tridiag_ql error: d and e are incompatible")
+    if (tol is None):
+        tol = np.finfo(float).eps
+    if (maxit is None):
+        maxit = 30*n
+    # (the arrays are held as lists of floats, since the iteration consists
+    # of scalar operations, which are much slower on numpy array entries)
+    d = [float(x) for x in d]
+    e = [float(x) for x in e] + [0.0]
+    its = 0
+
+    # find each eigenvalue in turn
+    for l in range(n):
+        while True:
+
+            # find end of unreduced block starting at row l
+            m = l
+            while (m < n-1):
+                if (abs(e[m]) <= tol*(abs(d[m])+abs(d[m+1]))):
+                    break
+                m += 1
+            if (m == l):
+                break
+
+            # check for iteration limit
+            if (its >= maxit):
+                raise ValueError("tridiag_ql error: maximum iterations reached")
+            its += 1
+
+            # Wilkinson shift from leading 2x2 block
+            g = (d[l+1]-d[l])/(2.0*e[l])
+            r = math.hypot(g, 1.0)
+            g = d[m] - d[l] + e[l]/(g + math.copysign(r, g))
+
+            # chase bulge from row m up to row l
+            s = 1.0
+            c = 1.0
+            p = 0.0
+            underflow = False
+            for i in range(m-1,l-1,-1):
+                f = s*e[i]
+                b = c*e[i]
+                r = math.hypot(f, g)
+                e[i+1] = r
+                if (r == 0.0):                   # recover from underflow
+                    d[i+1] -= p
+                    e[m] = 0.0
+                    underflow = True
+                    break
+                s = f/r
+                c = g/r
+                g = d[i+1] - p
+                r = (d[i]-g)*s + 2.0*c*b
+                p = s*r
+                d[i+1] = g + p
+                g = c*r - b
+                if (Z is not None):
+                    v1, v2 = apply_rot_right(Z[:,i+1], Z[:,i], c, s)
+                    Z[:,i+1] = v1
+                    Z[:,i] = v2
+            if (underflow):
+                continue
+            d[l] -= p
+            e[l] = g
+            e[m] = 0.0
+
+    # sort eigenvalues (and eigenvectors)
+    d = np.array(d)
+    idx = np.argsort(d)
+    lam = d[idx]
+    if (Z is not None):
+        Z[:,:] = Z[:,idx]
+
+    return [lam, Z, its]
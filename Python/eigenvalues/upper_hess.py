@@ -15,8 +15,11 @@ def upper_hess(A):
     where A is a general square matrix, Q is a unitary transformation matrix,
     and H is the upper Hessenberg result.
    
-    Note: since this routine returns the full transformation matrix Q (and not
-    just its parts), it is less efficient than it *could* be.
+    Note: the reduction itself is performed by upper_hess_compact, which
+    applies each Householder reflector as rank-1 updates and stores it in the
+    zeroed-out part of H; this routine then forms Q explicitly (with
+    hess_form_q) and clears the reflectors from H.  If Q is only needed as an
+    operator, call upper_hess_compact and hess_apply_q directly instead.
    
     Input:    A - square matrix
     Outputs:  Q - unitary matrix
@@ -25,30 +28,18 @@ def upper_hess(A):
 
     # imports
     import numpy as np
+    from upper_hess_compact import upper_hess_compact, hess_form_q
 
     # ensure that A is square
     m,n = np.shape(A)
     if (m != n):
         raise ValueError("upper_hess error: matrix must be square")
 
-    # initialize results
-    Q = np.eye(n)
-    H = A.copy()
+    # perform reduction, storing reflectors in H
+    H, gam = upper_hess_compact(A)
 
-    # iterate over columns
-    for j in range(n-2):
-
-        # construct reflector to zero out column below first subdiagonal
-        b = H[j+1:,j]                            # column to transform
-        tau = np.linalg.norm(b)*np.sign(b[0]+np.finfo(float).eps)   # norm of column
-        u = b/(b[0]+tau)                         # construct u = (b-y)/(b1+tau), where y = [-tau,0,...,0]
-        u[0] = 1.0
-        gamma = (tau+b[0])/tau
-        Qj = np.eye(n-j-1) - gamma*np.outer(u,u)   # create Householder matrix
-
-        # multiply remaining submatrices of H and Q by Qj
-        H[j+1:,:] = Qj @ H[j+1:,:]
-        H[:,j+1:] = H[:,j+1:] @ Qj
-        Q[:,j+1:] = Q[:,j+1:] @ Qj
+    # form Q from reflectors, and clear them from H
+    Q = hess_form_q(H, gam)
+    H = np.triu(H,-1)
    
     return [H, Q]
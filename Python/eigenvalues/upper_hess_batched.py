@@ -0,0 +1,84 @@
+# upper_hess_batched.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def upper_hess_batched(A, want_vectors=True):
+    """
+    Usage: H,Q = upper_hess_batched(A, want_vectors)
+
+    Function to convert a stack of real matrices to upper-Hessenberg form
+    via the orthogonal similarity transformations
+           H[l] = Q[l]'*A[l]*Q[l],  l = 0, ..., N-1.
+    The reduction is performed as in upper_hess_compact, one column at a
+    time, but every operation acts on the whole batch at once: the
+    Householder vectors for column j of all N matrices are computed together
+    (an N x (n-j-1) array), and are applied as batched rank-1 updates.  The
+    loop over columns therefore runs only n-2 times, regardless of N, which
+    removes the Python overhead that dominates when reducing large numbers
+    of small matrices one at a time.
+
+    Input:    A - stack of real square matrices (N x n x n numpy array)
+   want_vectors - flag to accumulate Q (True), or skip it (False)
+    Outputs:  H - stack of upper-Hessenberg matrices (N x n x n numpy array)
+              Q - stack of orthogonal matrices (N x n x n numpy array; None
+                  if want_vectors is False)
+    """
+
+    # imports
+    import numpy as np
+
+    # check inputs
+    if (np.ndim(A) != 3):
+        raise ValueError("upper_hess_batched error: A must be 3-dimensional")
+    if (np.iscomplexobj(A)):
+        raise ValueError("upper_hess_batched error: matrices must be real")
+    N, m, n = np.shape(A)
+    if (m != n):
+        raise ValueError("upper_hess_batched error: matrices must be square")
+
+    # initialize results
+    H = np.array(A, dtype=float)
+    Q = np.tile(np.eye(n), (N,1,1)) if want_vectors else None
+    eps = np.finfo(float).eps
+
+    # iterate over columns
+    for j in range(n-2):
+
+        # construct reflectors to zero out columns below first subdiagonal,
+        # u = (b-y)/(b0+tau) with y = [-tau,0,...,0]; matrices whose column
+        # is already zero get gam = 0 (no reflector)
+        b = H[:,j+1:,j]
+        beta = np.linalg.norm(b, axis=1)
+        skip = (beta == 0.0)
+        tau = beta*np.sign(b[:,0]+eps)
+        tau[skip] = 1.0
+        u = np.empty_like(b)
+        u[:,0] = 1.0
+        u[:,1:] = b[:,1:]/(b[:,0]+tau)[:,None]
+        gam = (tau+b[:,0])/tau
+        gam[skip] = 0.0
+
+        # store result columns
+        H[:,j+1,j] = np.where(skip, H[:,j+1,j], -tau)
+        H[:,j+2:,j] = 0.0
+
+        # apply reflectors on left: H[:,j+1:,j+1:] -= gam*u*(u'*H[:,j+1:,j+1:])
+        v = np.einsum('li,lik->lk', u, H[:,j+1:,j+1:])
+        v *= gam[:,None]
+        H[:,j+1:,j+1:] -= u[:,:,None]*v[:,None,:]
+
+        # apply reflectors on right: H[:,:,j+1:] -= gam*(H[:,:,j+1:]*u)*u'
+        v = np.einsum('lik,lk->li', H[:,:,j+1:], u)
+        v *= gam[:,None]
+        H[:,:,j+1:] -= v[:,:,None]*u[:,None,:]
+
+        # accumulate Q = Q*Q_j
+        if (want_vectors):
+            v = np.einsum('lik,lk->li', Q[:,:,j+1:], u)
+            v *= gam[:,None]
+            Q[:,:,j+1:] -= v[:,:,None]*u[:,None,:]
+
+    return [H, Q]
@@ -0,0 +1,121 @@
+# upper_hess_blocked.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def upper_hess_blocked(A, nb=32, nworkers=None, want_q=True):
+    """
+    Usage: H,Q = upper_hess_blocked(A, nb, nworkers, want_q)
+
+    Function to convert a matrix to upper-Hessenberg form via the unitary
+    similarity transformation
+           H = Q'*A*Q,
+    where A is a general square matrix, Q is a unitary transformation matrix,
+    and H is the upper Hessenberg result.
+
+    The columns are reduced in panels of nb columns.  Within a panel, the
+    reflectors Q_j = I - gam[j]*v_j*v_j' are accumulated into the compact WY
+    form
+           Q_0*Q_1*...*Q_{nb-1} = I - V*T*V',
+    with V holding the Householder vectors and T upper triangular, along
+    with Y = A*V*T; each panel column is brought up to date with the earlier
+    reflectors of the panel just before its own reflector is computed.  The
+    remainder of the matrix is then updated with matrix-matrix products,
+           H = (I - V*T'*V')*(H - Y*V'),    Q = Q - (Q*V)*T*V',
+    which are split into independent column blocks of H and row blocks of Q,
+    and distributed among the threads of a concurrent.futures.ThreadPoolExecutor.
+    If want_q is False, Q is neither formed nor updated (saving its n x n
+    storage and the O(n^3) work of its updates).
+
+    Input:    A - square matrix
+             nb - panel width (number of columns reduced per panel)
+       nworkers - number of threads (default: os.cpu_count())
+         want_q - flag to compute Q (True), or skip it (False)
+    Outputs:  H - upper Hessenberg matrix
+              Q - unitary matrix (None if want_q is False)
+    """
+
+    # imports
+    import os
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+
+    # ensure that A is square
+    m,n = np.shape(A)
+    if (m != n):
+        raise ValueError("upper_hess_blocked error: matrix must be square")
+
+    # check blocking and parallelism parameters
+    if (nworkers is None):
+        nworkers = os.cpu_count() or 1
+    if (nb < 1 or nworkers < 1):
+        raise ValueError("upper_hess_blocked error: nb and nworkers must be positive")
+
+    # initialize results
+    H = np.array(A, dtype=np.result_type(A, 1.0))
+    Q = np.eye(n, dtype=H.dtype) if want_q else None
+
+    # trailing update tasks: each updates one disjoint block of H or Q
+    def update_h(V, T, Y, k, j0, j1):
+        Hb = H[:,j0:j1]
+        Hb -= Y @ V[j0-k-1:j1-k-1,:].T                 # right: H*(I - V*T*V')
+        Hb[k+1:,:] -= V @ (T.T @ (V.T @ Hb[k+1:,:]))   # left: (I - V*T'*V')*H
+
+    def update_q(V, T, k, i0, i1):
+        Qb = Q[i0:i1,k+1:]
+        Qb -= ((Qb @ V) @ T) @ V.T
+
+    with ThreadPoolExecutor(max_workers=nworkers) as pool:
+
+        # iterate over panels
+        for k in range(0, n-2, nb):
+            ib = min(nb, n-2-k)                  # reflectors in this panel
+            V = np.zeros([n-k-1,ib], dtype=H.dtype)   # vectors (rows k+1:n)
+            T = np.zeros([ib,ib], dtype=H.dtype)
+            Y = np.zeros([n,ib], dtype=H.dtype)
+
+            # reduce panel columns
+            for j in range(ib):
+                c = k+j
+                a = H[:,c]
+
+                # apply earlier reflectors of the panel to this column
+                if (j > 0):
+                    a -= Y[:,:j] @ V[j-1,:j]
+                    a[k+1:] -= V[:,:j] @ (T[:j,:j].T @ (V[:,:j].T @ a[k+1:]))
+
+                # construct reflector to zero out column below first subdiagonal
+                b = a[c+1:]
+                beta = np.linalg.norm(b)
+                if (beta == 0.0):                # nothing to zero out
+                    continue
+                tau = beta*np.sign(b[0]+np.finfo(float).eps)
+                V[j,j] = 1.0
+                V[j+1:,j] = b[1:]/(b[0]+tau)
+                gam = (tau+b[0])/tau
+                a[c+1] = -tau
+                a[c+2:] = 0.0
+
+                # extend Y = A*V*T and T (columns right of c are still unmodified)
+                y = H[:,c+1:] @ V[j:,j]
+                if (j > 0):
+                    z = V[j:,:j].T @ V[j:,j]
+                    y -= Y[:,:j] @ z
+                    T[:j,j] = -gam*(T[:j,:j] @ z)
+                Y[:,j] = gam*y
+                T[j,j] = gam
+
+            # update trailing columns of H and all rows of Q
+            hblk = max(nb, -(-(n-k-ib)//nworkers))
+            qblk = max(nb, -(-n//nworkers))
+            tasks = [pool.submit(update_h, V, T, Y, k, j0, min(j0+hblk, n))
+                     for j0 in range(k+ib, n, hblk)]
+            if (want_q):
+                tasks += [pool.submit(update_q, V, T, k, i0, min(i0+qblk, n))
+                          for i0 in range(0, n, qblk)]
+            for task in tasks:
+                task.result()
+
+    return [H, Q]
@@ -0,0 +1,179 @@
+# upper_hess_compact.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def hess_reflector(Hc, j):
+    """
+    Usage: u = hess_reflector(Hc, j)
+
+    Function to extract the Householder vector u (with u[0] = 1) for column
+    j from the compact upper-Hessenberg result of upper_hess_compact.  The
+    corresponding reflector, I - gam[j]*u*u', acts on rows/columns j+1:n.
+    """
+
+    # imports
+    import numpy as np
+
+    n = np.size(Hc,0)
+    u = np.empty(n-j-1, dtype=Hc.dtype)
+    u[0] = 1.0
+    u[1:] = Hc[j+2:,j]
+    return u
+
+
+def hess_apply_q(Hc, gam, X, trans=False, side="left"):
+    """
+    Usage: X = hess_apply_q(Hc, gam, X, trans, side)
+
+    Function to apply the unitary matrix Q from upper_hess_compact to a
+    matrix (or vector) X, without ever forming Q.  Since Q is the product of
+    the reflectors Q = Q_0*Q_1*...*Q_{n-3}, each is applied in turn as a
+    rank-1 update.  X is overwritten with the result:
+        side = "left":  X = Q*X  (trans=False)  or  X = Q'*X  (trans=True)
+        side = "right": X = X*Q  (trans=False)  or  X = X*Q'  (trans=True)
+
+    Input:   Hc - compact upper-Hessenberg result from upper_hess_compact
+            gam - reflector coefficients from upper_hess_compact
+              X - matrix (n x k, or k x n for side="right") or vector (n)
+          trans - flag to apply Q' instead of Q
+           side - side of X to apply Q on ("left" or "right")
+    Outputs:  X - result
+    """
+
+    # imports
+    import numpy as np
+
+    # view vectors as matrices
+    if (side == "left"):
+        X2 = X[:,None] if (np.ndim(X) == 1) else X
+    elif (side == "right"):
+        X2 = X[None,:] if (np.ndim(X) == 1) else X
+    else:
+        raise ValueError("hess_apply_q error: side must be 'left' or 'right'")
+
+    # reflectors are applied in the order Q_{n-3},...,Q_0 for Q*X and X*Q',
+    # and in the order Q_0,...,Q_{n-3} for Q'*X and X*Q
+    order = range(len(gam))
+    if ((side == "left") != trans):
+        order = reversed(order)
+    for j in order:
+        if (gam[j] == 0.0):
+            continue
+        u = hess_reflector(Hc, j)
+        if (side == "left"):
+            X2[j+1:,:] -= gam[j]*np.outer(u, u @ X2[j+1:,:])
+        else:
+            X2[:,j+1:] -= gam[j]*np.outer(X2[:,j+1:] @ u, u)
+
+    return X
+
+
+def hess_form_q(Hc, gam):
+    """
+    Usage: Q = hess_form_q(Hc, gam)
+
+    Function to explicitly form the unitary matrix Q from upper_hess_compact.
+    The reflectors are accumulated from last to first, so that each only
+    needs to be applied to the trailing block of Q that it modifies.
+
+    Input:   Hc - compact upper-Hessenberg result from upper_hess_compact
+            gam - reflector coefficients from upper_hess_compact
+    Outputs:  Q - unitary matrix
+    """
+
+    # imports
+    import numpy as np
+
+    n = np.size(Hc,0)
+    Q = np.eye(n, dtype=Hc.dtype)
+    for j in range(len(gam)-1,-1,-1):
+        if (gam[j] == 0.0):
+            continue
+        u = hess_reflector(Hc, j)
+        Q[j+1:,j+1:] -= gam[j]*np.outer(u, u @ Q[j+1:,j+1:])
+    return Q
+
+
+
+#----------------------------------------
+# primary routine
+
+def upper_hess_compact(A):
+    """
+    Usage: Hc,gam = upper_hess_compact(A)
+
+    Function to convert a matrix to upper-Hessenberg form via the unitary
+    similarity transformation
+           H = Q'*A*Q,
+    where A is a general square matrix, Q is a unitary transformation matrix,
+    and H is the upper Hessenberg result.
+
+    Q = Q_0*Q_1*...*Q_{n-3} is the product of Householder reflectors
+    Q_j = I - gam[j]*u_j*u_j', which are never formed: each is applied to H
+    as a pair of rank-1 updates (using preallocated work arrays), and is
+    stored compactly in the part of column j of H that it zeroes out (the
+    first entry of u_j is always 1, and is not stored).  This requires O(n^3)
+    work overall.  Q may be applied as an operator with hess_apply_q, or
+    formed explicitly with hess_form_q.
+
+    Input:    A - square matrix
+    Outputs: Hc - upper Hessenberg matrix H in its upper-Hessenberg part,
+                  and the Householder vectors below its first subdiagonal
+            gam - Householder reflector coefficients (n-2 numpy array)
+    """
+
+    # imports
+    import numpy as np
+
+    # ensure that A is square
+    m,n = np.shape(A)
+    if (m != n):
+        raise ValueError("upper_hess_compact error: matrix must be square")
+
+    # initialize results and work arrays
+    H = np.array(A, dtype=np.result_type(A, 1.0))
+    gam = np.zeros(max(n-2,0), dtype=H.dtype)
+    u = np.empty(n, dtype=H.dtype)
+    v = np.empty(n, dtype=H.dtype)
+    W = np.empty([n,n], dtype=H.dtype)
+
+    # iterate over columns
+    for j in range(n-2):
+
+        # construct reflector to zero out column below first subdiagonal
+        b = H[j+1:,j]                            # column to transform
+        r = n-j-1
+        beta = np.linalg.norm(b)
+        if (beta == 0.0):                        # nothing to zero out
+            continue
+        tau = beta*np.sign(b[0]+np.finfo(float).eps)   # norm of column
+        uj = u[:r]                               # construct u = (b-y)/(b1+tau), where y = [-tau,0,...,0]
+        uj[0] = 1.0
+        uj[1:] = b[1:]/(b[0]+tau)
+        gam[j] = (tau+b[0])/tau
+
+        # store result column and Householder vector in H
+        H[j+1,j] = -tau
+        H[j+2:,j] = uj[1:]
+
+        # apply reflector on left: H[j+1:,j+1:] -= gam*u*(u'*H[j+1:,j+1:])
+        vj = v[:r]
+        np.dot(uj, H[j+1:,j+1:], out=vj)
+        vj *= gam[j]
+        np.multiply.outer(uj, vj, out=W[:r,:r])
+        H[j+1:,j+1:] -= W[:r,:r]
+
+        # apply reflector on right: H[:,j+1:] -= gam*(H[:,j+1:]*u)*u'
+        np.dot(H[:,j+1:], uj, out=v)
+        v *= gam[j]
+        np.multiply.outer(v, uj, out=W[:,:r])
+        H[:,j+1:] -= W[:,:r]
+
+    return [H, gam]
@@ -8,14 +8,22 @@
 # Spring 2019
 
 # imports
+import os
+import sys
 import time
 import numpy as np
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from test_matrices import *
 from matmat_ijk import *
 from matmat_ikj import *
 from matmat_jik import *
 from matmat_jki import *
 from matmat_kij import *
 from matmat_kji import *
+from matmat_blocked import *
+from matmat_autotune import *
+from matmat_parallel import *
+from matmat_batched import *
 
 # set testing values
 mvals = [50, 100, 200, 400]
@@ -23,6 +31,12 @@ nvals = [100, 200, 400, 800]
 pvals = [75, 150, 300, 600]
 nsizes = 4
 
+# select block sizes for the cache-blocked product (if not already done)
+if (matmat_load_block() is None):
+    print("\nTuning matmat_blocked for this host ...")
+    block = matmat_autotune()
+    print("   selected block sizes = ", block)
+
 # run tests
 for k in range(nsizes):
 
@@ -34,17 +48,9 @@ for k in range(nsizes):
     # display current problem size
     print("\nTesting matrix-matrix products: m = ",m," n = ",n," p = ",p)
 
-    # allocate the matrix & vectors of this size
-    A = np.zeros([m,n], dtype=float)
-    X = np.zeros([n,p], dtype=float)
-
-    # fill A and X with values
-    for i in range(m):
-        for j in range(n):
-            A[i,j] = 1.0*(1 + i - j)/(n+m)
-    for i in range(n):
-        for j in range(p):
-            X[i,j] = 1.0*(1 - i + j)/(n+p)
+    # create the matrices of this size, A[i,j] = (1+i-j)/(n+m), X[i,j] = (1-i+j)/(n+p)
+    A = toeplitz_linear(m, n)
+    X = toeplitz_linear(n, p, -1.0)
 
     # perform product 1
     stime = time.time()
@@ -88,6 +94,26 @@ for k in range(nsizes):
     B_err = np.max(np.max(np.abs(B-A@X)))
     print("   matmat_kji:  time = ", runtime,", error = ", B_err)
 
+    # perform cache-blocked product
+    stime = time.time()
+    B = matmat_blocked(A, X)
+    runtime = time.time()-stime
+    B_err = np.max(np.max(np.abs(B-A@X)))
+    print("   matmat_blocked:  time = ", runtime,", error = ", B_err)
+
+    # perform thread-parallel products (row and column panels)
+    stime = time.time()
+    B = matmat_parallel(A, X, "ikj")
+    runtime = time.time()-stime
+    B_err = np.max(np.max(np.abs(B-A@X)))
+    print("   matmat_parallel (ikj):  time = ", runtime,", error = ", B_err)
+
+    stime = time.time()
+    B = matmat_parallel(A, X, "jki")
+    runtime = time.time()-stime
+    B_err = np.max(np.max(np.abs(B-A@X)))
+    print("   matmat_parallel (jki):  time = ", runtime,", error = ", B_err)
+
     # call 'dot' for product 
     stime = time.time()
     B = np.dot(A, X)
@@ -108,3 +134,39 @@ for k in range(nsizes):
     runtime = time.time()-stime
     B_err = np.max(np.max(np.abs(B-A@X)))
     print("   @ operator:  time = ", runtime,", error = ", B_err)
+
+
+# run batched tests (many small products)
+N = 10000
+for n in [8, 16, 32, 64]:
+
+    # display current problem size
+    print("\nTesting batched matrix-matrix products: N = ",N," n = ",n)
+
+    # allocate the stacks of matrices and output buffers
+    A = np.random.rand(N,n,n)
+    X = np.random.rand(N,n,n)
+    B = np.zeros([N,n,n], dtype=float)
+    W = np.zeros([N,n], dtype=float)
+
+    # perform product with one call to matmat_ikj per pair (first 100 only)
+    stime = time.time()
+    for l in range(100):
+        B[l] = matmat_ikj(A[l], X[l])
+    runtime = (time.time()-stime)*N/100
+    B_err = np.max(np.abs(B[:100]-A[:100]@X[:100]))
+    print("   matmat_ikj loop (estimated):  time = ", runtime,", error = ", B_err)
+
+    # perform batched product, reusing the output and work buffers
+    stime = time.time()
+    matmat_batched(A, X, "ikj", B, W)
+    runtime = time.time()-stime
+    B_err = np.max(np.abs(B-A@X))
+    print("   matmat_batched (ikj):  time = ", runtime,", error = ", B_err)
+
+    # call 'matmul' for batched product
+    stime = time.time()
+    np.matmul(A, X, out=B)
+    runtime = time.time()-stime
+    B_err = np.max(np.abs(B-A@X))
+    print("   matmul:      time = ", runtime,", error = ", B_err)
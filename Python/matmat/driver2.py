@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+#
+# Script to compare Strassen-Winograd matrix-matrix products against the
+# standard loop-ordered kernels and numpy's matmul, reporting the crossover
+# size (if any) where the Strassen-Winograd approach becomes faster, and the
+# additional floating-point error that it introduces.
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+# imports
+import time
+import numpy as np
+from matmat_ikj import *
+from matmat_jki import *
+from matmat_strassen import *
+
+# set testing values
+nvals = [128, 256, 512, 1024]
+leaf = 64
+
+# the plain kernels to compare against, and the Strassen leaf kernels
+kernels = {"matmat_ikj": matmat_ikj, "matmat_jki": matmat_jki, "matmul": np.matmul}
+crossover = {}
+
+# run tests
+for n in nvals:
+
+    # display current problem size
+    print("\nTesting Strassen-Winograd products: n = ",n,", leaf = ",leaf)
+
+    # fill A and X with random values (so that the products are inexact)
+    A = np.random.rand(n,n)
+    X = np.random.rand(n,n)
+
+    # reference product (in extended precision)
+    Bref = A.astype(np.longdouble) @ X.astype(np.longdouble)
+
+    for name, kernel in kernels.items():
+
+        # perform plain product
+        stime = time.time()
+        B = kernel(A, X)
+        plain_time = time.time()-stime
+        plain_err = np.max(np.abs(B-Bref))
+
+        # perform Strassen-Winograd product with this kernel at the leaves
+        stime = time.time()
+        B = matmat_strassen(A, X, leaf, kernel)
+        strassen_time = time.time()-stime
+        strassen_err = np.max(np.abs(B-Bref))
+
+        print("   %-11s  time = %.3e,  strassen time = %.3e,  error = %.3e,  extra error = %.3e"
+              % (name, plain_time, strassen_time, plain_err, strassen_err-plain_err))
+
+        # record first size where Strassen-Winograd wins
+        if (strassen_time < plain_time and name not in crossover):
+            crossover[name] = n
+
+# report crossover sizes
+print("\nCrossover sizes (Strassen-Winograd with the same leaf kernel is faster):")
+for name in kernels:
+    if (name in crossover):
+        print("   ", name, ": n = ", crossover[name])
+    else:
+        print("   ", name, ": none found for n <= ", nvals[-1])
@@ -0,0 +1,175 @@
+# matmat_autotune.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def matmat_tune_file():
+    """
+    Usage: fname = matmat_tune_file()
+
+    Function to return the default file name used to store the block sizes
+    selected by matmat_autotune (stored alongside this file).
+    """
+
+    # imports
+    import os
+
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "matmat_blocked.json")
+
+
+def cache_sizes():
+    """
+    Usage: caches = cache_sizes()
+
+    Function to determine the data cache sizes of the host.  On Linux these
+    are read from /sys/devices/system/cpu/cpu0/cache; elsewhere (or on
+    failure) typical values are returned.
+
+    Outputs: caches is a dictionary mapping cache level (1, 2, 3) to its
+             size in bytes
+    """
+
+    # imports
+    import glob
+    import os
+
+    # typical fallback values
+    caches = {1: 32*1024, 2: 256*1024, 3: 8*1024*1024}
+
+    # query the host
+    for d in glob.glob("/sys/devices/system/cpu/cpu0/cache/index*"):
+        try:
+            with open(os.path.join(d, "type")) as f:
+                ctype = f.read().strip()
+            with open(os.path.join(d, "level")) as f:
+                level = int(f.read())
+            with open(os.path.join(d, "size")) as f:
+                size = f.read().strip()
+        except (OSError, ValueError):
+            continue
+        if (ctype == "Instruction"):
+            continue
+        scale = {"K": 1024, "M": 1024*1024, "G": 1024*1024*1024}
+        if (size[-1] in scale):
+            caches[level] = int(size[:-1])*scale[size[-1]]
+        else:
+            caches[level] = int(size)
+
+    return caches
+
+
+# block sizes already loaded in this process, keyed by tuning file name
+# (refreshed by matmat_autotune)
+tuned_blocks = {}
+
+def matmat_load_block(fname=None, reload=False):
+    """
+    Usage: block = matmat_load_block(fname, reload)
+
+    Function to load the block sizes saved by a previous call to
+    matmat_autotune.  The file is read only once per process (unless reload
+    is True), so that matmat_blocked may call this on every product.
+
+    Inputs:  fname is the (optional) tuning file name
+             reload forces the file to be read again
+    Outputs: block is the tuple (mb, nb, kb), or None if no (readable)
+             tuning file exists
+    """
+
+    # imports
+    import json
+
+    if (fname is None):
+        fname = matmat_tune_file()
+    if (fname in tuned_blocks and not reload):
+        return tuned_blocks[fname]
+    try:
+        with open(fname) as f:
+            block = tuple(json.load(f)["block"])
+    except (OSError, ValueError, KeyError, TypeError):
+        block = None
+    tuned_blocks[fname] = block
+    return block
+
+
+
+#----------------------------------------
+# primary routine
+
+def matmat_autotune(m=400, n=800, p=600, candidates=None, ntrials=3, fname=None):
+    """
+    Usage: block = matmat_autotune(m, n, p, candidates, ntrials, fname)
+
+    Function to select the tile sizes for matmat_blocked on this host.  A set
+    of candidate (mb, nb, kb) tiles is built from the host's cache hierarchy
+    (keeping the three tiles of a micro-kernel call within L2, and at least
+    one tile within L1), each candidate is timed on an m x n by n x p
+    product, and the fastest is saved to disk so that later calls to
+    matmat_blocked use it by default.
+
+    Inputs: m, n, p are the problem dimensions to tune on
+            candidates is an optional list of (mb, nb, kb) tuples to try
+            ntrials is the number of timing runs for each candidate (the
+              minimum time is used)
+            fname is the (optional) file name to store the result
+    Output: block is the fastest (mb, nb, kb) tuple
+    """
+
+    # imports
+    import json
+    import time
+    import numpy as np
+    from matmat_blocked import matmat_blocked
+
+    # build candidate list from the cache hierarchy
+    caches = cache_sizes()
+    if (candidates is None):
+        sizes = [16, 32, 64, 128, 256, 512]
+        candidates = []
+        for mb in sizes:
+            for nb in sizes:
+                for kb in sizes:
+                    tile = 8*min(mb*kb, kb*nb, mb*nb)
+                    work = 8*(mb*kb + kb*nb + 2*mb*nb)
+                    if (tile <= caches[1] and work <= caches[2]):
+                        candidates.append((mb, nb, kb))
+        if (len(candidates) == 0):
+            candidates = [(64, 64, 64)]
+
+    # set up test problem
+    A = np.random.rand(m,n)
+    X = np.random.rand(n,p)
+    B = np.zeros([m,p], dtype=float)
+
+    # time each candidate
+    best = None
+    tbest = np.inf
+    for block in candidates:
+        runtime = np.inf
+        for trial in range(ntrials):
+            stime = time.perf_counter()
+            matmat_blocked(A, X, block, B)
+            runtime = min(runtime, time.perf_counter()-stime)
+        if (runtime < tbest):
+            tbest = runtime
+            best = tuple(block)
+
+    # save the result for later runs
+    if (fname is None):
+        fname = matmat_tune_file()
+    result = {"block": list(best), "time": tbest, "shape": [m, n, p],
+              "caches": {str(k): v for k, v in caches.items()}}
+    try:
+        with open(fname, "w") as f:
+            json.dump(result, f, indent=2)
+    except OSError:
+        print("matmat_autotune warning: unable to save result to ", fname)
+    tuned_blocks[fname] = best
+
+    return best
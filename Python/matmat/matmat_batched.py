@@ -0,0 +1,101 @@
+# matmat_batched.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def matmat_batched(A, X, order="ikj", out=None, work=None):
+    """
+    Usage: B = matmat_batched(A, X, order, out, work)
+
+    Function to perform a batch of matrix-matrix multiplications,
+           B[l] = A[l] @ X[l],  l = 0, ..., N-1,
+    using one of the loop orderings of matmat_ijk, ..., matmat_kji.  The
+    loops over i, j and k are performed as in the single-matrix kernels, but
+    every operation inside them acts on the whole batch at once (i.e., it is
+    vectorized across the batch axis).  This is intended for large numbers of
+    small products, where the per-call Python overhead would otherwise
+    dominate.
+
+    If both out and work are supplied, the products are computed without
+    allocating any new arrays.
+
+    Inputs: A is a stack of matrices (N x m x n numpy array)
+            X is a stack of matrices (N x n x p numpy array)
+            order is the loop ordering (string: "ijk", "ikj", "jik", "jki",
+              "kij" or "kji")
+            out is an optional output array (N x m x p numpy array), that is
+              overwritten in-place with the products
+            work is an optional work array (N x max(m,n,p) numpy array)
+    Output: B is a stack of matrices (N x m x p numpy array)
+    """
+
+    # imports
+    import numpy as np
+
+    # get problem dimensions
+    if (np.ndim(A) != 3 or np.ndim(X) != 3):
+        raise ValueError("matmat_batched error: A and X must be 3-dimensional")
+    N, m, n = np.shape(A)
+    N2, n2, p = np.shape(X)
+
+    # check that A and X are compatible
+    if (N != N2):
+        raise ValueError("matmat_batched error: A and X have different batch sizes")
+    if (n != n2):
+        raise ValueError("matmat_batched error: A and X are incompatible")
+    if (order not in ("ijk", "ikj", "jik", "jki", "kij", "kji")):
+        raise ValueError("matmat_batched error: unknown loop order " + str(order))
+
+    # initialize output
+    if (out is None):
+        out = np.zeros([N,m,p], dtype=float)
+    else:
+        if (np.shape(out) != (N,m,p)):
+            raise ValueError("matmat_batched error: out has incorrect shape")
+        out.fill(0.0)
+    B = out
+
+    # set up work array
+    if (work is None):
+        work = np.empty([N,max(m,n,p)], dtype=float)
+    elif (np.shape(work)[0] != N or np.shape(work)[1] < max(m,n,p)):
+        raise ValueError("matmat_batched error: work has incorrect shape")
+    Wn = work[:,:n]
+    Wm = work[:,:m]
+    Wp = work[:,:p]
+
+    # perform products
+    if (order == "ijk"):
+        for i in range(m):
+            for j in range(p):
+                np.multiply(A[:,i,:], X[:,:,j], out=Wn)
+                np.sum(Wn, axis=1, out=B[:,i,j])
+    elif (order == "ikj"):
+        for i in range(m):
+            for k in range(n):
+                np.multiply(A[:,i,k,None], X[:,k,:], out=Wp)
+                B[:,i,:] += Wp
+    elif (order == "jik"):
+        for j in range(p):
+            for i in range(m):
+                np.multiply(A[:,i,:], X[:,:,j], out=Wn)
+                np.sum(Wn, axis=1, out=B[:,i,j])
+    elif (order == "jki"):
+        for j in range(p):
+            for k in range(n):
+                np.multiply(A[:,:,k], X[:,k,j,None], out=Wm)
+                B[:,:,j] += Wm
+    elif (order == "kij"):
+        for k in range(n):
+            for i in range(m):
+                np.multiply(A[:,i,k,None], X[:,k,:], out=Wp)
+                B[:,i,:] += Wp
+    elif (order == "kji"):
+        for k in range(n):
+            for j in range(p):
+                np.multiply(A[:,:,k], X[:,k,j,None], out=Wm)
+                B[:,:,j] += Wm
+
+    return B
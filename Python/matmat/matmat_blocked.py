@@ -0,0 +1,74 @@
+# matmat_blocked.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def matmat_blocked(A, X, block=None, B=None):
+    """
+    Usage: B = matmat_blocked(A, X, block, B)
+
+    Function to perform cache-blocked (tiled) matrix-matrix multiplication.
+    All three loops are split into tiles, so that the tiles of A, X and B
+    used in the inner-most loop fit in cache together, and each tile product
+    is performed by a vectorized micro-kernel (numpy matmul) into a
+    preallocated work tile before being accumulated into B.
+
+    Inputs: A is a matrix (m x n numpy matrix)
+            X is a matrix (n x p numpy matrix)
+            block is an optional tuple (mb, nb, kb) of tile sizes, where mb
+              is the number of rows of A/B, nb is the number of columns of
+              X/B, and kb is the number of columns of A/rows of X in each
+              tile.  If omitted, the result saved by matmat_autotune is
+              used (or (64, 64, 64) if no tuning result is available).
+            B is an optional output matrix (m x p numpy matrix); if
+              supplied it is overwritten in-place with the product.
+    Output: B is a matrix (m x p numpy matrix)
+    """
+
+    # imports
+    import numpy as np
+    from matmat_autotune import matmat_load_block
+
+    # get problem dimensions
+    m, n = np.shape(A)
+    n2, p = np.shape(X)
+
+    # check that A and X are compatible
+    if (n != n2):
+        raise ValueError("matmat_blocked error: A and X are incompatible")
+
+    # set tile sizes
+    if (block is None):
+        block = matmat_load_block()
+        if (block is None):
+            block = (64, 64, 64)
+    mb, nb, kb = block
+    if (mb < 1 or nb < 1 or kb < 1):
+        raise ValueError("matmat_blocked error: block sizes must be positive")
+
+    # initialize output
+    if (B is None):
+        B = np.zeros([m,p], dtype=float)
+    else:
+        if (np.shape(B) != (m,p)):
+            raise ValueError("matmat_blocked error: B has incorrect shape")
+        B[:,:] = 0.0
+
+    # allocate work tile for the micro-kernel
+    W = np.empty([min(mb,m),min(nb,p)], dtype=float)
+
+    # perform product, tile by tile
+    for i0 in range(0, m, mb):
+        i1 = min(i0+mb, m)
+        for j0 in range(0, p, nb):
+            j1 = min(j0+nb, p)
+            Bij = B[i0:i1,j0:j1]
+            Wij = W[:i1-i0,:j1-j0]
+            for k0 in range(0, n, kb):
+                k1 = min(k0+kb, n)
+                np.matmul(A[i0:i1,k0:k1], X[k0:k1,j0:j1], out=Wij)
+                Bij += Wij
+
+    return B
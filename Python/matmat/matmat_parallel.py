@@ -0,0 +1,85 @@
+# matmat_parallel.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def matmat_parallel(A, X, order="ikj", nworkers=None, panel=64):
+    """
+    Usage: B = matmat_parallel(A, X, order, nworkers, panel)
+
+    Function to perform thread-parallel matrix-matrix multiplication, using
+    one of the loop-ordered kernels matmat_ijk, ..., matmat_kji on each panel.
+    For the orderings whose outer-most output loop is over rows ("ijk",
+    "ikj" and "kij") the output B is split into row panels,
+        B[i0:i1,:] = A[i0:i1,:] @ X,
+    and for those whose outer-most output loop is over columns ("jik",
+    "jki" and "kji") it is split into column panels,
+        B[:,j0:j1] = A @ X[:,j0:j1].
+    The panels are independent, and are distributed among the threads of a
+    concurrent.futures.ThreadPoolExecutor.  Since every entry of B is
+    computed by the same sequence of operations regardless of which thread
+    computes it, the result does not depend on the number of workers.
+
+    Inputs: A is a matrix (m x n numpy matrix)
+            X is a matrix (n x p numpy matrix)
+            order is the loop ordering of the panel kernel (string)
+            nworkers is the number of threads (default: os.cpu_count())
+            panel is the number of rows/columns of B in each panel
+    Output: B is a matrix (m x p numpy matrix)
+    """
+
+    # imports
+    import os
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+    from matmat_ijk import matmat_ijk
+    from matmat_ikj import matmat_ikj
+    from matmat_jik import matmat_jik
+    from matmat_jki import matmat_jki
+    from matmat_kij import matmat_kij
+    from matmat_kji import matmat_kji
+
+    # get problem dimensions
+    m, n = np.shape(A)
+    n2, p = np.shape(X)
+
+    # check that A and X are compatible
+    if (n != n2):
+        raise ValueError("matmat_parallel error: A and X are incompatible")
+
+    # select panel kernel and partitioning
+    kernels = {"ijk": matmat_ijk, "ikj": matmat_ikj, "kij": matmat_kij,
+               "jik": matmat_jik, "jki": matmat_jki, "kji": matmat_kji}
+    if (order not in kernels):
+        raise ValueError("matmat_parallel error: unknown loop order " + str(order))
+    kernel = kernels[order]
+    rowpanels = order in ("ijk", "ikj", "kij")
+
+    # check parallelism parameters
+    if (nworkers is None):
+        nworkers = os.cpu_count() or 1
+    if (nworkers < 1 or panel < 1):
+        raise ValueError("matmat_parallel error: nworkers and panel must be positive")
+
+    # initialize output
+    B = np.zeros([m,p], dtype=float)
+
+    # panel tasks: each computes and stores one disjoint panel of B
+    def row_panel(i0, i1):
+        B[i0:i1,:] = kernel(A[i0:i1,:], X)
+
+    def col_panel(j0, j1):
+        B[:,j0:j1] = kernel(A, X[:,j0:j1])
+
+    # perform product
+    with ThreadPoolExecutor(max_workers=nworkers) as pool:
+        if (rowpanels):
+            tasks = [pool.submit(row_panel, i0, min(i0+panel, m)) for i0 in range(0, m, panel)]
+        else:
+            tasks = [pool.submit(col_panel, j0, min(j0+panel, p)) for j0 in range(0, p, panel)]
+        for t in tasks:
+            t.result()
+
+    return B
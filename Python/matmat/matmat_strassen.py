@@ -0,0 +1,148 @@
+# matmat_strassen.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def winograd_step(A, X, B, level, arena, leaf_kernel):
+    """
+    Usage: winograd_step(A, X, B, level, arena, leaf_kernel)
+
+    Function to perform one level of the Strassen-Winograd recursion,
+    B = A @ X, with all dimensions of A and X even at every level above the
+    leaves.  The seven half-size products are scheduled so that only three
+    temporaries are needed per level (one each of the sizes of the blocks
+    of A, X and B), and these are taken from the preallocated arena, so no
+    arrays are allocated by the recursion itself.
+
+    Inputs: A is a matrix (m x n numpy matrix)
+            X is a matrix (n x p numpy matrix)
+            B is the output matrix (m x p numpy matrix), overwritten
+            level is the current recursion level
+            arena is the list of workspace triples (S, T, P) for each level
+            leaf_kernel is the matrix-matrix kernel used at the leaves
+    """
+
+    # imports
+    import numpy as np
+
+    # leaf: call base kernel
+    if (level == len(arena)):
+        B[:,:] = leaf_kernel(A, X)
+        return
+
+    # split into quadrants
+    m, n = np.shape(A)
+    p = np.shape(X)[1]
+    mh, nh, ph = m//2, n//2, p//2
+    A11, A12, A21, A22 = A[:mh,:nh], A[:mh,nh:], A[mh:,:nh], A[mh:,nh:]
+    X11, X12, X21, X22 = X[:nh,:ph], X[:nh,ph:], X[nh:,:ph], X[nh:,ph:]
+    B11, B12, B21, B22 = B[:mh,:ph], B[:mh,ph:], B[mh:,:ph], B[mh:,ph:]
+    S, T, P = arena[level]
+
+    # Winograd schedule
+    np.subtract(A11, A21, out=S)                                # S3
+    np.subtract(X22, X12, out=T)                                # T3
+    winograd_step(S, T, B21, level+1, arena, leaf_kernel)       # P7
+    np.add(A21, A22, out=S)                                     # S1
+    np.subtract(X12, X11, out=T)                                # T1
+    winograd_step(S, T, B22, level+1, arena, leaf_kernel)       # P5
+    S -= A11                                                    # S2
+    np.subtract(X22, T, out=T)                                  # T2
+    winograd_step(S, T, B12, level+1, arena, leaf_kernel)       # P6
+    np.subtract(A12, S, out=S)                                  # S4
+    winograd_step(S, X22, B11, level+1, arena, leaf_kernel)     # P3
+    winograd_step(A11, X11, P, level+1, arena, leaf_kernel)     # P1
+    B12 += P                                                    # U2 = P1+P6
+    B21 += B12                                                  # U3 = U2+P7
+    B12 += B22                                                  # U4 = U2+P5
+    B22 += B21                                                  # U7 = U3+P5
+    B12 += B11                                                  # U5 = U4+P3
+    T -= X21                                                    # T4
+    winograd_step(A22, T, B11, level+1, arena, leaf_kernel)     # P4
+    B21 -= B11                                                  # U6 = U3-P4
+    winograd_step(A12, X21, B11, level+1, arena, leaf_kernel)   # P2
+    B11 += P                                                    # U1 = P1+P2
+
+
+
+#----------------------------------------
+# primary routine
+
+def matmat_strassen(A, X, leaf=64, leaf_kernel=None):
+    """
+    Usage: B = matmat_strassen(A, X, leaf, leaf_kernel)
+
+    Function to perform matrix-matrix multiplication with the recursive
+    Strassen-Winograd algorithm, which uses 7 (instead of 8) half-size
+    products and 15 additions per level.  The recursion stops once the
+    smallest problem dimension is at most leaf, where leaf_kernel is called.
+    Odd and rectangular dimensions are handled by zero-padding each
+    dimension up to a multiple of 2^levels, and all temporaries needed by the
+    recursion are allocated once, up front, in a workspace arena.
+
+    Inputs: A is a matrix (m x n numpy matrix)
+            X is a matrix (n x p numpy matrix)
+            leaf is the crossover size below which leaf_kernel is used
+            leaf_kernel is the base matrix-matrix kernel (default matmat_ikj)
+    Output: B is a matrix (m x p numpy matrix)
+    """
+
+    # imports
+    import numpy as np
+    from matmat_ikj import matmat_ikj
+
+    # get problem dimensions
+    m, n = np.shape(A)
+    n2, p = np.shape(X)
+
+    # check that A and X are compatible
+    if (n != n2):
+        raise ValueError("matmat_strassen error: A and X are incompatible")
+    if (leaf < 1):
+        raise ValueError("matmat_strassen error: leaf must be positive")
+    if (leaf_kernel is None):
+        leaf_kernel = matmat_ikj
+
+    # determine number of recursion levels
+    levels = 0
+    d = min(m, n, p)
+    while (d > leaf):
+        d = (d+1)//2
+        levels += 1
+
+    # pad dimensions up to multiples of 2^levels
+    r = 2**levels
+    mp, np_, pp = -(-m//r)*r, -(-n//r)*r, -(-p//r)*r
+    if ((mp, np_) == (m, n)):
+        Ap = A
+    else:
+        Ap = np.zeros([mp,np_], dtype=float)
+        Ap[:m,:n] = A
+    if ((np_, pp) == (n, p)):
+        Xp = X
+    else:
+        Xp = np.zeros([np_,pp], dtype=float)
+        Xp[:n,:p] = X
+    Bp = np.zeros([mp,pp], dtype=float)
+
+    # allocate workspace arena (one triple of temporaries per level)
+    arena = []
+    for l in range(1, levels+1):
+        mh, nh, ph = mp//2**l, np_//2**l, pp//2**l
+        arena.append((np.empty([mh,nh], dtype=float),
+                      np.empty([nh,ph], dtype=float),
+                      np.empty([mh,ph], dtype=float)))
+
+    # perform product
+    winograd_step(Ap, Xp, Bp, 0, arena, leaf_kernel)
+
+    # remove padding
+    if ((mp, pp) == (m, p)):
+        return Bp
+    return Bp[:m,:p].copy()
@@ -9,8 +9,12 @@
 
 # imports
 import time
+import os
+import sys
 import numpy as np
 from numpy.linalg import norm
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from test_matrices import *
 from matvec_row import *
 from matvec_col import *
 
@@ -29,16 +33,9 @@ for k in range(nsizes):
     # display current problem size
     print("\nTesting matrix-vector products with a ", m, " x ", n, " matrix:")
 
-    # allocate the matrix & vectors of this size
-    A = np.zeros([m,n], dtype=float)
-    x = np.zeros(n, dtype=float)
-
-    # fill A and x with values
-    for i in range(m):
-        for j in range(n):
-            A[i,j] = 1.0*(1 + i - j)/(n+m)
-    for j in range(n):
-        x[j] = 1.0*j/n
+    # create the matrix & vector of this size, A[i,j] = (1+i-j)/(n+m), x[j] = j/n
+    A = toeplitz_linear(m, n)
+    x = ramp_vector(n)
 
     # perform row-based product
     stime = time.time()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+#
+# Script to demonstrate sparse Cholesky factorizations (and reorderings).
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+# imports
+import os
+import sys
+import time
+import numpy as np
+from scipy.sparse import linalg as la
+import matplotlib.pyplot as plt
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sp_lu"))
+from diff_2D import diff_2D
+from diff_3D import diff_3D
+from nested_dissection import nested_dissection
+from sp_chol import sp_chol
+
+
+##################
+# utility routines
+
+def makeplots(D):
+    """
+    Usage: makeplots(D)
+
+    This routine creates 3 plots:
+       1. D and its Cholesky factor
+       2. D using the multiple minimum degree reordering, and its
+          Cholesky factor)
+       3. D using the reverse Cuthill-McKee reordering, and its Cholesky
+          factor)
+    """
+
+    for ordering, title in [("natural", "Original"), ("mmd", "Minimum degree"),
+                            ("rcm", "Reverse Cuthill-McKee")]:
+        F = sp_chol(D, ordering)
+        PD = D[F.S.perm,:][:,F.S.perm]
+        L = F.L()
+        fig, axarr = plt.subplots(1,2)
+        axarr[0].spy(PD)
+        axarr[0].set_title(title + ' matrix (nnz = ' + str(PD.nnz) + ')')
+        axarr[1].spy(L+L.T)
+        axarr[1].set_title(title + ' Cholesky (nnz = ' + str((L+L.T).nnz) + ')')
+
+    plt.show()
+
+
+def compare(D, N):
+    """
+    Usage: compare(D, N)
+
+    This routine compares the supernodal Cholesky factorization (sp_chol)
+    of the diffusion matrix D on the grid with dimensions N against the
+    sparse LU factorization (splu) with a similar ordering, printing the
+    factorization times, the number of stored factor entries and bytes,
+    and the residual of a linear solve.  The sp_chol times are for a
+    refactorization (i.e., with its symbolic analysis cached).  The nested
+    dissection ordering is applied to D before calling splu.
+    """
+
+    b = np.ones(D.shape[0])
+    nd = ("nd",) + tuple(N)
+    for ordering, permc_spec in [("natural", "NATURAL"), ("mmd", "MMD_AT_PLUS_A"),
+                                 (nd, "ND")]:
+        F = sp_chol(D, ordering)
+        ts = time.time()
+        F = sp_chol(D, ordering, out=F)
+        tc = time.time()-ts
+        rc = np.linalg.norm(D @ F.solve(b) - b)
+        ts = time.time()
+        p = nested_dissection(N) if (permc_spec == "ND") else np.arange(D.shape[0])
+        if (permc_spec == "ND"):
+            lu = la.splu(D[p,:][:,p].tocsc(), permc_spec="NATURAL", diag_pivot_thresh=0.0,
+                         options=dict(SymmetricMode=True))
+        else:
+            lu = la.splu(D.tocsc(), permc_spec=permc_spec)
+        tl = time.time()-ts
+        x = np.empty_like(b)
+        x[p] = lu.solve(b[p])
+        rl = np.linalg.norm(D @ x - b)
+        nlu = lu.L.nnz + lu.U.nnz
+        blu = lu.L.data.nbytes + lu.L.indices.nbytes + lu.L.indptr.nbytes + \
+              lu.U.data.nbytes + lu.U.indices.nbytes + lu.U.indptr.nbytes
+        print("   %s ordering (%d supernodes):" % (F.S.key[1], F.SN.ns))
+        print("      sp_chol: time = %.4f, entries = %d, bytes = %d, residual = %.2e"
+              % (tc, F.SN.size, F.memory(), rc))
+        print("      splu:    time = %.4f, entries = %d, bytes = %d, residual = %.2e"
+              % (tl, nlu, blu, rl))
+        print("      memory ratio = %.2f" % (F.memory()/blu))
+
+
+
+##################
+# script
+
+if __name__ == "__main__":
+
+    # problem 1: small 2D diffusion matrix
+    print("problem 1: small 2D diffusion matrix")
+    D = diff_2D(5,10)
+    compare(D, (5,10))
+    makeplots(D)
+    input("Press enter to continue")
+
+    # problem 2: larger 2D diffusion matrix
+    print("problem 2: larger 2D diffusion matrix")
+    D = diff_2D(50,100)
+    compare(D, (50,100))
+    makeplots(D)
+    input("Press enter to continue")
+
+    # problem 3: small 3D diffusion matrix
+    print("problem 3: small 3D diffusion matrix")
+    D = diff_3D(5,8,10)
+    compare(D, (5,8,10))
+    makeplots(D)
+    input("Press enter to continue")
+
+    # problem 4: larger 3D diffusion matrix
+    print("problem 4: larger 3D diffusion matrix")
+    D = diff_3D(20,25,30)
+    compare(D, (20,25,30))
+    makeplots(D)
@@ -0,0 +1,450 @@
+# sp_chol.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+# the symbolic analysis (orderings, elimination tree, pattern of L) is
+# shared with the sparse LU demonstration codes
+import os
+import sys
+_sp_lu = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sp_lu")
+if (_sp_lu not in sys.path):
+    sys.path.append(_sp_lu)
+from sp_symbolic import SymbolicCache, symbolic_cache
+
+
+#----------------------------------------
+# supernodal structure object
+
+class Supernodes:
+    """
+    Usage: SN = Supernodes(S, relax)
+
+    Class to hold the supernodal structure of the Cholesky factor L with the
+    pattern of the SymbolicFactor S (computed by sp_symbolic, whose
+    elimination tree is postordered).  A supernode is a range of columns
+    f:l, each the parent of the previous one in the elimination tree, whose
+    columns share one row structure R: the rows f:l, followed by the rows
+    below l of column l-1.  L[R,f:l] is then stored as a dense m x w block
+    (m = len(R), w = l-f, in column-major order), so that the factorization
+    and solves can use dense kernels on whole blocks.  The supernodes are
+    found by find_supernodes; with relax = True, small supernodes are merged
+    with their parents even if this stores some explicit zeros.
+
+    Attributes:
+       S is the SymbolicFactor, relax the merging flag, and ns the number
+         of supernodes
+       sp holds the supernode column ranges: supernode s is sp[s]:sp[s+1]
+       snode[j] is the supernode containing column j
+       rp, Rs hold the row structures: supernode s has rows Rs[rp[s]:rp[s+1]]
+       xp holds the block offsets: the block of s is Lx[xp[s]:xp[s+1]]
+       Asel, Adst map the entries of A to the blocks: A.data[Asel] are the
+         entries of the lower triangle of P*A*P', stored at Lx[Adst]
+       size is the number of stored entries (xp[-1])
+       sparent is the supernodal elimination tree (-1 for the roots)
+       leaves lists the single-column leaves of that tree (and lx, lrows,
+         lsrc1, lsrc2, ldst the index maps used to eliminate them together)
+
+    Methods:
+       R = SN.rows(s)        returns the row structure of supernode s
+       p = SN.position(i, j) returns the positions of entries of L in Lx
+    """
+
+    def __init__(self, S, relax=True):
+        import numpy as np
+        self.S = S
+        self.relax = relax
+        n = S.n
+        self.sp = find_supernodes(S.parent, S.colcount, relax)
+        self.ns = np.size(self.sp)-1
+        w = np.diff(self.sp)
+        self.snode = np.repeat(np.arange(self.ns, dtype=np.int64), w)
+
+        # row structure of each supernode: rows f:l-1, then those of column l-1
+        last = self.sp[1:]-1
+        cnt = S.colcount[last]
+        m = (w-1) + cnt
+        self.rp = np.zeros(self.ns+1, dtype=np.int64)
+        np.cumsum(m, out=self.rp[1:])
+        self.Rs = np.empty(self.rp[-1], dtype=np.int64)
+        self.Rs[ranges(self.rp[:-1], w-1)] = ranges(self.sp[:-1], w-1)
+        self.Rs[ranges(self.rp[:-1]+w-1, cnt)] = S.Li[ranges(S.Lp[last], cnt)]
+        self.xp = np.zeros(self.ns+1, dtype=np.int64)
+        np.cumsum(m*w, out=self.xp[1:])
+        self.size = int(self.xp[-1])
+
+        # supernodal elimination tree: the parent of s is the supernode of
+        # its first row below the diagonal block
+        self.sparent = np.full(self.ns, -1, dtype=np.int64)
+        below = (m > w)
+        self.sparent[below] = self.snode[self.Rs[self.rp[:-1][below] + w[below]]]
+
+        # positions of the lower-triangular entries of P*A*P' in the blocks
+        Acol = np.repeat(np.arange(n, dtype=np.int64), np.diff(S.Ap))
+        pi = S.iperm[S.Ai]
+        pj = S.iperm[Acol]
+        self.Asel = np.nonzero(pi >= pj)[0]
+        self.Adst = self.position(pi[self.Asel], pj[self.Asel])
+
+        # leaves of the supernodal tree with a single column, which are
+        # eliminated together before the others (see numeric_supernodal):
+        # their entries are Lx[lx], with diagonals Lx[xp[leaves]], and their
+        # rank-1 updates L[i,j]*L[k,j] (i >= k > j) go to Lx[ldst], from the
+        # entries Lx[lsrc1], Lx[lsrc2]
+        nchild = np.bincount(self.sparent[below], minlength=self.ns)
+        self.leaves = np.nonzero((w == 1) & (nchild == 0))[0]
+        ml = m[self.leaves]
+        self.lx = ranges(self.xp[self.leaves], ml)
+        self.lrows = self.Rs[ranges(self.rp[self.leaves], ml)]
+        src1, src2, dst = [], [], []
+        for mk in np.unique(ml[ml > 1]):
+            K = self.leaves[ml == mk]
+            a, b = np.tril_indices(mk-1)
+            R = self.Rs[self.rp[K][:,None] + np.arange(1, mk)]
+            src1.append((self.xp[K][:,None] + 1 + a).ravel())
+            src2.append((self.xp[K][:,None] + 1 + b).ravel())
+            dst.append(self.position(R[:,a].ravel(), R[:,b].ravel()))
+        self.lsrc1 = np.concatenate(src1 + [np.zeros(0, dtype=np.int64)])
+        self.lsrc2 = np.concatenate(src2 + [np.zeros(0, dtype=np.int64)])
+        self.ldst = np.concatenate(dst + [np.zeros(0, dtype=np.int64)])
+
+    def position(self, i, j):
+        """
+        Usage: p = SN.position(i, j)
+
+        Returns the positions in the factor storage of the entries (i,j),
+        i >= j, of L (arrays of row and column indices): in the block of the
+        supernode s containing column j (columns f:l), the local column is
+        j-f, and the local row is i-f for i < l-1, or otherwise l-1-f plus
+        the position of i in column l-1 of L.
+        """
+        import numpy as np
+        S = self.S
+        s = self.snode[j]
+        f = self.sp[s]
+        l1 = self.sp[s+1]-1
+        row = i - f
+        tl = (i >= l1)
+        row[tl] = (l1[tl] - f[tl]) + np.searchsorted(S.keyL, l1[tl]*S.n + i[tl]) - S.Lp[l1[tl]]
+        return self.xp[s] + (j-f)*(self.rp[s+1]-self.rp[s]) + row
+
+    def rows(self, s):
+        """
+        Usage: R = SN.rows(s)
+
+        Returns the row structure of supernode s.
+        """
+        return self.Rs[self.rp[s]:self.rp[s+1]]
+
+
+
+#----------------------------------------
+# numeric factorization object
+
+class SupernodalFactor:
+    """
+    Usage: F = SupernodalFactor(SN)
+
+    Class to hold the supernodal Cholesky factorization L*L' of P*A*P',
+    with the supernodal structure SN (a Supernodes object).  Only L is
+    stored, as one dense block per supernode, all within one array Lx that
+    is allocated once and overwritten by each numeric refactorization (see
+    sp_chol), so that the factor requires about half of the memory of a
+    sparse LU factorization with the same ordering.
+
+    Attributes:
+       SN is the Supernodes object, and S its SymbolicFactor
+       Lx holds the supernode blocks
+
+    Methods:
+       B = F.block(s)   returns the (m x w) block of supernode s, as a view
+       x = F.solve(b)   solves A*x = b (b may be an n vector or an n x k matrix)
+       L = F.L()        returns L as a sparse (CSC) matrix
+       nbytes = F.memory()  returns the bytes used by the factor (values and
+                        integer index arrays)
+    """
+
+    def __init__(self, SN):
+        import numpy as np
+        self.SN = SN
+        self.S = SN.S
+        self.Lx = np.zeros(SN.size)
+
+    def block(self, s):
+        SN = self.SN
+        m = SN.rp[s+1] - SN.rp[s]
+        return self.Lx[SN.xp[s]:SN.xp[s+1]].reshape((m, SN.sp[s+1]-SN.sp[s]), order='F')
+
+    def solve(self, b):
+        """
+        Usage: x = F.solve(b)
+
+        Solves A*x = b with the stored factor (b is not modified), with one
+        dense triangular solve and one matrix-vector (or matrix-matrix)
+        product per supernode in each of the forward and backward sweeps;
+        the single-column leaves are handled together, first in the forward
+        sweep and last in the backward sweep.
+        """
+        import numpy as np
+        from scipy.linalg.blas import dtrsm
+        SN = self.SN
+        S = self.S
+        y = np.array(b, dtype=float)[S.perm]
+        shape = y.shape
+        y = y.reshape((S.n, -1))
+        skip = np.zeros(SN.ns, dtype=bool)
+        skip[SN.leaves] = True
+        others = np.nonzero(~skip)[0].tolist()
+        J = SN.sp[SN.leaves]
+        cnt = SN.rp[SN.leaves+1] - SN.rp[SN.leaves]
+        Lj = self.Lx[SN.lx]
+        first = (SN.lrows == np.repeat(J, cnt))
+
+        # forward substitution with L
+        y[J] /= Lj[first][:,None]
+        np.subtract.at(y, SN.lrows[~first], Lj[~first][:,None]*np.repeat(y[J], cnt-1, axis=0))
+        for s in others:
+            f, l = SN.sp[s], SN.sp[s+1]
+            R = SN.rows(s)[l-f:]
+            B = self.block(s)
+            y[f:l] = dtrsm(1.0, B[:l-f], y[f:l], lower=1)
+            if (np.size(R) > 0):
+                y[R] -= B[l-f:] @ y[f:l]
+
+        # backward substitution with L'
+        for s in others[::-1]:
+            f, l = SN.sp[s], SN.sp[s+1]
+            R = SN.rows(s)[l-f:]
+            B = self.block(s)
+            if (np.size(R) > 0):
+                y[f:l] -= B[l-f:].T @ y[R]
+            y[f:l] = dtrsm(1.0, B[:l-f], y[f:l], lower=1, trans_a=1)
+        np.subtract.at(y, np.repeat(J, cnt-1), Lj[~first][:,None]*y[SN.lrows[~first]])
+        y[J] /= Lj[first][:,None]
+        x = np.empty(shape)
+        x[S.perm] = y.reshape(shape)
+        return x
+
+    def L(self):
+        import numpy as np
+        from scipy.sparse import csc_matrix
+        SN = self.SN
+        w = np.diff(SN.sp)
+        m = np.diff(SN.rp)
+        s = np.repeat(np.repeat(np.arange(SN.ns), w), np.repeat(m, w))
+        k = np.arange(SN.size) - SN.xp[s]
+        col = SN.sp[s] + k//m[s]
+        row = SN.Rs[SN.rp[s] + k % m[s]]
+        keep = (row >= col)
+        return csc_matrix((self.Lx[keep], (row[keep], col[keep])), shape=(self.S.n, self.S.n))
+
+    def memory(self):
+        SN = self.SN
+        return int(self.Lx.nbytes + SN.sp.nbytes + SN.rp.nbytes + SN.Rs.nbytes + SN.xp.nbytes)
+
+
+
+#----------------------------------------
+# utility routines
+
+def ranges(start, count):
+    """
+    Usage: idx = ranges(start, count)
+
+    Function to concatenate the index ranges start[k]:start[k]+count[k].
+    """
+
+    # imports
+    import numpy as np
+
+    tot = int(np.sum(count))
+    return np.repeat(start - np.cumsum(count) + count, count) + np.arange(tot, dtype=np.int64)
+
+
+def find_supernodes(parent, colcount, relax=True):
+    """
+    Usage: sp = find_supernodes(parent, colcount, relax)
+
+    Function to partition the columns of the Cholesky factor L with the
+    (postordered) elimination tree parent and column counts colcount into
+    supernodes, returning the column pointers sp (supernode s is the range
+    of columns sp[s]:sp[s+1]).  Column j is added to the supernode of
+    column j-1 when parent[j-1] = j and colcount[j-1] = colcount[j]+1, so
+    that both have the same structure below the diagonal (a fundamental
+    supernode).  With relax = True, it is also added when this stores only
+    a modest fraction of explicit zeros in the block (any fraction for at
+    most 4 columns, 80% for 16, 10% for 48 and 5% beyond), as the fewer and
+    larger dense blocks more than repay the extra work on the zeros.
+    """
+
+    # imports
+    import numpy as np
+
+    n = np.size(parent)
+    sp = [0]
+    nz = 0                                     # entries of L in the current supernode
+    for j in range(n):
+        f = sp[-1]
+        if (j > f and parent[j-1] == j):
+            w = j-f+1
+            m = (w-1) + colcount[j]
+            z = 1.0 - (nz + colcount[j])/(m*w - w*(w-1)//2)
+            if (colcount[j-1] == colcount[j]+1 or
+                (relax and (w <= 4 or (w <= 16 and z < 0.8) or (w <= 48 and z < 0.1)
+                            or z < 0.05))):
+                nz += colcount[j]
+                continue
+        if (j > 0):
+            sp.append(j)
+        nz = colcount[j]
+    sp.append(n)
+    return np.array(sp, dtype=np.int64)
+
+
+def numeric_supernodal(F, A):
+    """
+    Usage: numeric_supernodal(F, A)
+
+    Function to compute the supernodal Cholesky factorization of P*A*P'
+    into the preallocated storage of the SupernodalFactor F.  The
+    factorization is multifrontal: for each supernode s (columns f:l, rows
+    R, from the leaves of the elimination tree up), the dense frontal matrix
+    on the rows R holds the columns f:l of P*A*P' (loaded into the block of
+    s), minus the update matrices of the children of s, which are added into
+    it at the relative positions of their rows in R (the extend-add); then
+        L11 = chol(F11)     (LAPACK potrf)
+        L21 = F21 @ inv(L11)'
+        U   = F22 - L21 @ L21'
+    are computed with dense kernels, [L11; L21] is stored as the block of s,
+    and U is the update matrix passed to its parent (the supernode of the
+    first row below the diagonal block).  The Python loop therefore runs
+    over the supernodes, with one dense product per supernode and one
+    extend-add per child.  The single-column leaves of the supernodal tree
+    (often half of the columns for minimum degree orderings) are eliminated
+    before this loop, all at once, with vectorized scatters.  No pivoting is
+    performed, so A must be symmetric positive definite.
+    """
+
+    # imports
+    import numpy as np
+    from scipy.linalg.blas import dtrsm, dsyrk
+    from scipy.linalg.lapack import dpotrf
+
+    SN = F.SN
+    Lx = F.Lx
+
+    # scatter the entries of P*A*P' into the blocks
+    Lx.fill(0.0)
+    Lx[SN.Adst] = A.data[SN.Asel]
+
+    # the single-column leaves are independent of each other, so they are
+    # eliminated together: scale their columns, and subtract their rank-1
+    # updates from the blocks of their ancestors
+    d = Lx[SN.xp[SN.leaves]]
+    if (np.any(d <= 0.0)):
+        raise ValueError("numeric_supernodal error: matrix is not positive definite")
+    Lx[SN.lx] /= np.repeat(np.sqrt(d), SN.rp[SN.leaves+1] - SN.rp[SN.leaves])
+    np.subtract.at(Lx, SN.ldst, Lx[SN.lsrc1]*Lx[SN.lsrc2])
+
+    # factor the other supernodes from the leaves up, keeping the update
+    # matrices of the supernodes whose parents have not been factored yet
+    # (only their lower triangles are computed and used)
+    skip = np.zeros(SN.ns, dtype=bool)
+    skip[SN.leaves] = True
+    children = [[] for s in range(SN.ns)]
+    update = [None]*SN.ns
+    for s in np.nonzero(~skip)[0].tolist():
+        f, l = SN.sp[s], SN.sp[s+1]
+        w = l-f
+        R = SN.rows(s)
+        m = np.size(R)
+        B = F.block(s)
+
+        # frontal matrix: columns f:l of A, and extend-add of the children
+        front = np.zeros((m, m), order='F')
+        front[:,:w] = B
+        for c in children[s]:
+            rel = np.searchsorted(R, SN.rows(c)[SN.sp[c+1]-SN.sp[c]:])
+            front[rel[:,None], rel] += update[c]
+            update[c] = None
+        children[s] = None
+
+        # dense factorization of the diagonal block, scaling of the rest,
+        # and update matrix for the parent
+        L11, info = dpotrf(front[:w,:w], lower=1, clean=1)
+        if (info != 0):
+            raise ValueError("numeric_supernodal error: matrix is not positive definite")
+        B[:w] = L11
+        if (m > w):
+            L21 = dtrsm(1.0, L11, front[w:,:w], side=1, lower=1, trans_a=1)
+            B[w:] = L21
+            update[s] = dsyrk(-1.0, L21, beta=1.0, c=front[w:,w:], lower=1, overwrite_c=1)
+            children[SN.sparent[s]].append(s)
+
+
+
+#----------------------------------------
+# primary routines
+
+# cache of supernodal structures, keyed by the symbolic analysis (memory only)
+supernode_cache = SymbolicCache()
+
+def supernodes(S, relax=True, cache=supernode_cache):
+    """
+    Usage: SN = supernodes(S, relax, cache)
+
+    Function to compute (or retrieve from the cache) the supernodal
+    structure (a Supernodes object) of the SymbolicFactor S, keyed by the
+    key of S and the relax flag.
+    """
+    key = (S.key[0], S.key[1] + ("_relax" if relax else "_fundamental"))
+    SN = cache.get(key) if (cache is not None) else None
+    if (SN is None or SN.S is not S):
+        SN = Supernodes(S, relax)
+        if (cache is not None):
+            cache.put(key, SN)
+    return SN
+
+
+def sp_chol(A, ordering="mmd", relax=True, cache=symbolic_cache, out=None):
+    """
+    Usage: F = sp_chol(A, ordering, relax, cache, out)
+
+    Function to compute the supernodal sparse Cholesky factorization
+    P*A*P' = L*L' of the symmetric positive definite sparse matrix A (e.g.,
+    diff_2D or diff_3D).  The symbolic phase (fill-reducing ordering,
+    postordered elimination tree and column counts, from sp_symbolic in
+    sp_lu, and the supernodes, from supernodes) depends only on the
+    pattern of A, and is cached; the numeric phase (numeric_supernodal)
+    works on one dense block per supernode.  If out is a SupernodalFactor
+    with the same symbolic analysis, its storage is overwritten and it is
+    returned, so that refactorizing a matrix with new values allocates no
+    new factor storage.
+
+    Inputs:
+       A is a symmetric positive definite sparse matrix
+       ordering is the fill-reducing ordering (see fill_ordering in sp_lu)
+       relax indicates whether to merge small supernodes (see find_supernodes)
+       cache is the SymbolicCache to use (None disables caching)
+       out is an optional SupernodalFactor to overwrite
+    Output:
+       F is the SupernodalFactor
+    """
+
+    # imports
+    from scipy.sparse import csc_matrix
+    from sp_symbolic import sp_symbolic, ordering_name
+
+    A = csc_matrix(A)
+    A.sum_duplicates()
+    A.sort_indices()
+    if (out is not None and out.S.key[1] == ordering_name(ordering) and out.S.matches(A)
+        and bool(out.SN.relax) == bool(relax)):
+        F = out
+    else:
+        S = sp_symbolic(A, ordering, cache)
+        F = SupernodalFactor(supernodes(S, relax, supernode_cache if (cache is not None) else None))
+    numeric_supernodal(F, A)
+    return F
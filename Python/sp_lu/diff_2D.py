@@ -0,0 +1,39 @@
+# diff_2D.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def diff_2D(Nx,Ny,kappa=None,index_dtype=None):
+    """
+    Usage: D = diff_2D(Nx,Ny,kappa,index_dtype)
+    
+    This routine creates the diffusion matrix resulting from the equation
+    \[
+         u - \Div(\kappa \Grad u),
+    \]
+    where $u \in \Real$ is defined on the square domain [0,1] x [0,1], which
+    is discretized using Nx points in the x-direction, and Ny points in the 
+    y-direction, and the diffusion operator is discretized using the standard 
+    2nd-order 5 point stencil (with kappa = 1, this is $u - \Delta u$).
+    Homogeneous Dirichlet boundary conditions are assumed just outside the
+    domain.  The matrix is assembled directly in CSC format by diff_stencil,
+    using O(nnz) memory.
+    
+    inputs:
+        Nx           # spatial points in the x-direction of the domain
+        Ny           # spatial points in the y-direction of the domain
+        kappa        diffusion coefficient: None (1), a scalar, an array
+                     with one value per unknown, or a function kappa(x,y)
+        index_dtype  integer type of the CSC index arrays (np.int32 or
+                     np.int64; default: the smallest that fits)
+    
+    outputs:
+        D        REAL (Nx*Ny) x (Nx*Ny) sparse (CSC) matrix
+    """
+
+    # imports
+    from diff_stencil import diff_stencil
+
+    return diff_stencil((Nx,Ny), kappa, index_dtype)
@@ -0,0 +1,40 @@
+# diff_3D.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+def diff_3D(Nx,Ny,Nz,kappa=None,index_dtype=None):
+    """
+    Usage: D = diff_3D(Nx,Ny,Nz,kappa,index_dtype)
+    
+    This routine creates the diffusion matrix resulting from the equation
+    \[
+         u - \Div(\kappa \Grad u),
+    \]
+    where $u \in \Real$ is defined on the cube domain [0,1] x [0,1] x [0,1], 
+    which is discretized using Nx points in the x-direction, Ny points in the 
+    y-direction, Nz points in the z-direction, and the diffusion operator is 
+    discretized using the standard 2nd-order 7 point stencil (with kappa = 1,
+    this is $u - \Delta u$).  Homogeneous Dirichlet boundary conditions are
+    assumed just outside the domain.  The matrix is assembled directly in
+    CSC format by diff_stencil, using O(nnz) memory.
+    
+    inputs:
+        Nx           # spatial points in the x-direction of the domain
+        Ny           # spatial points in the y-direction of the domain
+        Nz           # spatial points in the z-direction of the domain
+        kappa        diffusion coefficient: None (1), a scalar, an array
+                     with one value per unknown, or a function kappa(x,y,z)
+        index_dtype  integer type of the CSC index arrays (np.int32 or
+                     np.int64; default: the smallest that fits)
+    
+    outputs:
+        D        REAL (Nx*Ny*Nz) x (Nx*Ny*Nz) sparse (CSC) matrix
+    """
+
+    # imports
+    from diff_stencil import diff_stencil
+
+    return diff_stencil((Nx,Ny,Nz), kappa, index_dtype)
@@ -0,0 +1,197 @@
+# diff_ops.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+from scipy.sparse.linalg import LinearOperator
+
+
+#----------------------------------------
+# operator object
+
+class DiffOperator(LinearOperator):
+    """
+    Usage: Dop = DiffOperator(N, kappa, block)
+
+    Class implementing the diffusion matrix of diff_stencil (and hence of
+    diff_2D/diff_3D) on the grid with N = (Nx, Ny[, Nz]) points as a
+    matrix-free scipy.sparse.linalg.LinearOperator: only the stencil
+    coefficients are stored (the diagonal, plus one face coefficient per
+    axis, or just scalars for a constant kappa), never the matrix.
+
+    The product y = D*v is computed with shifted slices of the flattened
+    arrays (so that every operation runs over long contiguous blocks, even
+    for the x-direction): y = diag*v, followed by, for each axis with index
+    stride s, y[:-s] -= F*v[s:] and y[s:] -= F*v[:-s], where F holds the face
+    coefficients with zeros where a line of nodes ends (for a constant
+    kappa, F is a scalar and those few wrapped couplings are removed
+    afterwards).  Multiple vectors are handled as the columns of an n x k v.
+    The rows are processed in blocks of about block entries (of y), so that
+    the slices of y and v, and the work array, stay in cache; all of the
+    operations are performed in-place in y, using that work array (kept
+    between calls), so no other arrays are allocated (a complex v is
+    handled as its real and imaginary parts, which does allocate).
+
+    Attributes:
+       N is the tuple of grid dimensions, and shape = (n, n) with n = prod(N)
+       diag is the stencil diagonal (a float for constant coefficients), and
+         faces the face coefficients (see stencil_coefficients)
+
+    Methods:
+       y = Dop @ v, Dop.matvec(v), Dop.matmat(V)  (as any LinearOperator; v
+           may be an n vector or an n x k matrix)
+       y = Dop.apply(v, out)  computes D*v, placing the result in out if it
+           is supplied (an array of the same shape as v)
+    """
+
+    def __init__(self, N, kappa=None, block=32768):
+        import numpy as np
+        from diff_stencil import stencil_coefficients, axis_slices
+        self.N = tuple(int(Ni) for Ni in N)
+        if (len(self.N) < 1 or min(self.N) < 2):
+            raise ValueError("DiffOperator error: each grid dimension must be at least 2")
+        grid = self.N[::-1]
+        n = int(np.prod(self.N))
+        super().__init__(dtype=np.dtype(float), shape=(n,n))
+        self.diag, self.faces = stencil_coefficients(self.N, kappa)
+
+        # flattened couplings: node j and j+stride are neighbors along each
+        # axis, with coefficient F[j] (zero where j is the last node along
+        # that axis, so that no coupling wraps around to the next line)
+        self.flat = []
+        for a in range(len(grid)):
+            stride = n//int(np.prod(grid[:a+1]))
+            if (np.ndim(self.faces[a]) == 0):
+                F = self.faces[a]
+            else:
+                F = np.zeros(grid)
+                F[axis_slices(len(grid), a)[0]] = self.faces[a]
+                F = F.ravel()[:n-stride].copy()
+            self.flat.append([a, stride, F])
+        if (all([np.ndim(face) == 0 for face in self.faces])):
+            self.diag = float(self.diag.flat[0])         # constant coefficients
+        else:
+            self.diag = self.diag.ravel()
+        self.block = block
+        self.work = None
+
+    def apply(self, v, out=None):
+        """
+        Usage: y = Dop.apply(v, out)
+
+        Computes y = D*v for an n vector or n x k matrix v (v is not
+        modified), in-place in out if it is supplied.  A complex v is
+        handled as its real and imaginary parts (with a complex out).
+        """
+        import numpy as np
+        n = self.shape[0]
+        v = np.asarray(v)
+        if (np.ndim(v) not in (1, 2) or np.shape(v)[0] != n):
+            raise ValueError("DiffOperator error: v has incorrect shape")
+
+        # D is real, so complex vectors are handled as their real and
+        # imaginary parts
+        if (np.iscomplexobj(v)):
+            if (out is None):
+                out = np.empty(np.shape(v), dtype=complex)
+            elif (np.shape(out) != np.shape(v) or not np.iscomplexobj(out)):
+                raise ValueError("DiffOperator error: out must be a complex array of the same shape as v")
+            if (np.shares_memory(out, v)):
+                raise ValueError("DiffOperator error: out may not overlap v")
+            out.real = self.apply(v.real)
+            out.imag = self.apply(v.imag)
+            return out
+
+        v = np.asarray(v, dtype=float)
+        if (out is None):
+            out = np.empty(np.shape(v), dtype=float)
+        elif (np.shape(out) != np.shape(v) or not out.flags.c_contiguous):
+            raise ValueError("DiffOperator error: out must be a contiguous array of the same shape as v")
+        if (np.shares_memory(out, v)):
+            raise ValueError("DiffOperator error: out may not overlap v")
+
+        # work array for one block of rows, and coefficient views matching
+        # any trailing axis of multiple vectors
+        k = 1 if (np.ndim(v) == 1) else np.shape(v)[1]
+        rows = max(1, self.block//k)
+        if (self.work is None or self.work.size < rows*k):
+            self.work = np.empty(rows*k, dtype=float)
+        W = self.work[:rows*k].reshape((rows,) + np.shape(v)[1:])
+        def coef(c, i0, i1):
+            if (np.ndim(c) == 0):
+                return c
+            return c[i0:i1,None] if (np.ndim(v) == 2) else c[i0:i1]
+
+        # process blocks of rows r0:r1 (so that the block of y, the nearby
+        # entries of v and the work array stay in cache): diagonal, then the
+        # neighbors j+s and j-s along each axis, as shifts by the stride s
+        for r0 in range(0, n, rows):
+            r1 = min(r0+rows, n)
+            np.multiply(v[r0:r1], coef(self.diag, r0, r1), out=out[r0:r1])
+            for a, s, F in self.flat:
+                i1 = min(r1, n-s)
+                if (i1 > r0):
+                    w = W[:i1-r0]
+                    np.multiply(v[r0+s:i1+s], coef(F, r0, i1), out=w)
+                    np.subtract(out[r0:i1], w, out=out[r0:i1])
+                i0 = max(r0, s)
+                if (r1 > i0):
+                    w = W[:r1-i0]
+                    np.multiply(v[i0-s:r1-s], coef(F, i0-s, r1-s), out=w)
+                    np.subtract(out[i0:r1], w, out=out[i0:r1])
+
+        # for constant coefficients, remove the couplings that wrapped
+        # around from the last node along each axis to the next line (m-1
+        # line ends with s entries each, a block of the work array at a time)
+        for a, s, F in self.flat:
+            if (np.ndim(F) == 0):
+                Na = self.N[::-1][a]
+                m = n//(Na*s)
+                Y = out.reshape((m, Na, s) + np.shape(v)[1:])
+                V = v.reshape((m, Na, s) + np.shape(v)[1:])
+                mb = max(1, rows//s)
+                for i0 in range(0, m-1, mb):
+                    i1 = min(i0+mb, m-1)
+                    for j0 in range(0, s, rows):
+                        j1 = min(j0+rows, s)
+                        w = W[:(i1-i0)*(j1-j0)].reshape((i1-i0, j1-j0) + np.shape(v)[1:])
+                        np.multiply(V[i0+1:i1+1,0,j0:j1], F, out=w)
+                        np.add(Y[i0:i1,-1,j0:j1], w, out=Y[i0:i1,-1,j0:j1])
+                        np.multiply(V[i0:i1,-1,j0:j1], F, out=w)
+                        np.add(Y[i0+1:i1+1,0,j0:j1], w, out=Y[i0+1:i1+1,0,j0:j1])
+        return out
+
+    def _matvec(self, v):
+        return self.apply(v.ravel()).reshape(v.shape)
+
+    def _matmat(self, V):
+        return self.apply(V)
+
+    def _adjoint(self):
+        return self
+
+
+
+#----------------------------------------
+# constructors
+
+def diff_2D_op(Nx, Ny, kappa=None):
+    """
+    Usage: Dop = diff_2D_op(Nx, Ny, kappa)
+
+    This routine creates the matrix-free version (a DiffOperator) of the
+    5-point diffusion matrix diff_2D(Nx, Ny, kappa).
+    """
+    return DiffOperator((Nx,Ny), kappa)
+
+
+def diff_3D_op(Nx, Ny, Nz, kappa=None):
+    """
+    Usage: Dop = diff_3D_op(Nx, Ny, Nz, kappa)
+
+    This routine creates the matrix-free version (a DiffOperator) of the
+    7-point diffusion matrix diff_3D(Nx, Ny, Nz, kappa).
+    """
+    return DiffOperator((Nx,Ny,Nz), kappa)
@@ -0,0 +1,233 @@
+# diff_stencil.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def grid_coefficient(kappa, N):
+    """
+    Usage: k = grid_coefficient(kappa, N)
+
+    This routine evaluates a diffusion coefficient at the nodes of the grid
+    with N = (Nx, Ny[, Nz]) points on the unit square/cube, returning it as
+    an array of shape (..., Ny, Nx) (x varies fastest, matching the 1D index
+    ij = j*Nx + i used by diff_2D and diff_3D).
+
+    inputs:
+        kappa    scalar, array with one value per unknown (in 1D index
+                 order, or with shape (..., Ny, Nx)), or function
+                 kappa(x, y[, z]) evaluated on arrays of node coordinates
+        N        tuple of grid dimensions (Nx, Ny[, Nz])
+
+    outputs:
+        k        REAL array of shape N[::-1], or a float if kappa is a scalar
+    """
+
+    # imports
+    import numpy as np
+
+    shape = tuple(N[::-1])
+    if (callable(kappa)):
+        x = [np.linspace(0.0, 1.0, Ni) for Ni in N]
+        X = np.meshgrid(*x[::-1], indexing='ij', sparse=True)[::-1]
+        k = np.broadcast_to(np.asarray(kappa(*X), dtype=float), shape)
+    elif (np.ndim(kappa) == 0):
+        return float(kappa)
+    else:
+        k = np.asarray(kappa, dtype=float)
+        if (k.size != int(np.prod(shape))):
+            raise ValueError("grid_coefficient error: kappa has incorrect size")
+        k = k.reshape(shape)
+    return k
+
+
+def axis_slices(ndim, a):
+    """
+    Usage: lo, hi = axis_slices(ndim, a)
+
+    This routine returns the index tuples selecting all but the last (lo)
+    and all but the first (hi) entries along axis a of an ndim-dimensional
+    grid array, so that array[lo] and array[hi] are neighbors along axis a.
+    """
+    lo = [slice(None)]*ndim
+    hi = [slice(None)]*ndim
+    lo[a] = slice(0, -1)
+    hi[a] = slice(1, None)
+    return [tuple(lo), tuple(hi)]
+
+
+
+def stencil_coefficients(N, kappa=None):
+    """
+    Usage: diag, faces = stencil_coefficients(N, kappa)
+
+    This routine computes the coefficients of the diffusion stencil of
+    diff_stencil on the grid with N = (Nx, Ny[, Nz]) points: the diagonal,
+    and for each axis a of the grid array (of shape (..., Ny, Nx), so that
+    axis a is direction len(N)-1-a), the coupling across the interior faces
+    between the nodes [..., i, ...] and [..., i+1, ...] along that axis.  The
+    matrix entries are then D[j,j] = diag[j] and D[j,j'] = -face for each
+    such pair of neighboring nodes j, j'.
+
+    inputs:
+        N        tuple of grid dimensions (Nx, Ny[, Nz])
+        kappa    diffusion coefficient (as in diff_stencil)
+
+    outputs:
+        diag     REAL array of shape N[::-1]
+        faces    list of face couplings, one per axis of the grid array
+                 (REAL arrays whose length along that axis is one less than
+                 the grid's, or floats if kappa is a scalar)
+    """
+
+    # imports
+    import numpy as np
+
+    # coefficient at the nodes, and inverse squared mesh spacings
+    shape = tuple(N[::-1])
+    k = grid_coefficient(1.0 if (kappa is None) else kappa, N)
+    h2i = [float(Ni-1)**2 for Ni in shape]
+
+    # diagonal (boundary faces use the node coefficient), and the
+    # neighbor couplings across the interior faces of each axis
+    diag = np.ones(shape)
+    faces = []
+    for a in range(len(shape)):
+        lo, hi = axis_slices(len(shape), a)
+        if (np.ndim(k) == 0):
+            face = k*h2i[a]
+            diag += 2.0*face
+        else:
+            face = 0.5*h2i[a]*(k[lo] + k[hi])
+            diag[lo] += face
+            diag[hi] += face
+            first = [slice(None)]*len(shape)
+            last = [slice(None)]*len(shape)
+            first[a] = 0
+            last[a] = -1
+            diag[tuple(first)] += h2i[a]*k[tuple(first)]
+            diag[tuple(last)] += h2i[a]*k[tuple(last)]
+        faces.append(face)
+    return [diag, faces]
+
+
+#----------------------------------------
+# primary routine
+
+def diff_stencil(N, kappa=None, index_dtype=None):
+    """
+    Usage: D = diff_stencil(N, kappa, index_dtype)
+
+    This routine creates the diffusion matrix resulting from the equation
+    \[
+         u - \Div(\kappa \Grad u),
+    \]
+    where $u \in \Real$ is defined on the unit square (or cube), discretized
+    using N = (Nx, Ny[, Nz]) points in each direction, with the standard
+    2nd-order 5 (or 7) point stencil and homogeneous Dirichlet boundary
+    conditions just outside the domain.  Unknowns are numbered with x
+    varying fastest, ij = j*Nx + i (or ijk = k*Nx*Ny + j*Nx + i).
+
+    The coefficient on the face between two neighboring nodes is the mean of
+    kappa at those nodes (and kappa at the node itself for the boundary
+    faces), so that D is symmetric, and with kappa = 1 (the default) D is
+    the matrix of diff_2D/diff_3D.
+
+    The matrix is assembled directly in CSC format, without any dense (or
+    COO) intermediate: since D is structurally symmetric, column j holds the
+    rows j-Nx*Ny, j-Nx, j-1, j, j+1, j+Nx, j+Nx*Ny that lie inside the grid,
+    already in ascending order, so the column pointers follow from the
+    number of neighbors of each node, and each stencil offset is scattered
+    into its slot of every column with one vectorized operation.  The memory
+    required is therefore O(nnz).
+
+    inputs:
+        N            tuple of grid dimensions (Nx, Ny[, Nz]), each at least 2
+        kappa        diffusion coefficient: None (1), a scalar, an array with
+                     one value per unknown, or a function kappa(x, y[, z])
+        index_dtype  integer type of the CSC index arrays (np.int32 or
+                     np.int64; default: the smallest that fits)
+
+    outputs:
+        D        REAL (Nx*Ny[*Nz]) x (Nx*Ny[*Nz]) sparse (CSC) matrix
+    """
+
+    # imports
+    import numpy as np
+    from scipy.sparse import csc_matrix
+
+    # check inputs
+    N = tuple(int(Ni) for Ni in N)
+    if (len(N) < 1 or min(N) < 2):
+        raise ValueError("diff_stencil error: each grid dimension must be at least 2")
+    shape = N[::-1]                            # array shape, x varies fastest
+    n = int(np.prod(N))
+    nnz = n + 2*sum([n//Ni*(Ni-1) for Ni in N])
+    if (index_dtype is None):
+        index_dtype = np.int32 if (nnz < 2**31) else np.int64
+    index_dtype = np.dtype(index_dtype)
+    if (index_dtype not in (np.dtype(np.int32), np.dtype(np.int64))):
+        raise ValueError("diff_stencil error: index_dtype must be int32 or int64")
+    if (nnz >= np.iinfo(index_dtype).max):
+        raise ValueError("diff_stencil error: index_dtype is too small for this grid")
+
+    # stencil coefficients, and index strides of each axis of the grid array
+    diag, faces = stencil_coefficients(N, kappa)
+    strides = [n//int(np.prod(shape[:a+1])) for a in range(len(shape))]
+    offdiag = []
+    for a in range(len(shape)):
+        lo, hi = axis_slices(len(shape), a)
+        face = np.broadcast_to(faces[a], [Ni-1 if b == a else Ni for b, Ni in enumerate(shape)])
+        offdiag.append([lo, hi, face])
+
+    # column pointers from the number of entries in each column
+    count = np.ones(shape, dtype=index_dtype)
+    for lo, hi, face in offdiag:
+        count[lo] += 1
+        count[hi] += 1
+    indptr = np.empty(n+1, dtype=index_dtype)
+    indptr[0] = 0
+    np.cumsum(count.ravel(), out=indptr[1:])
+    del count
+
+    # scatter the stencil offsets in ascending order (largest negative
+    # offset first), tracking the next free slot of each column
+    indices = np.empty(nnz, dtype=index_dtype)
+    data = np.empty(nnz, dtype=float)
+    slot = indptr[:-1].copy().reshape(shape)
+    col = np.arange(n, dtype=index_dtype).reshape(shape)
+    order = [(a, -1) for a in range(len(shape))] + [None] + \
+            [(a, 1) for a in range(len(shape)-1,-1,-1)]
+    for entry in order:
+        if (entry is None):                    # diagonal
+            s = slot.ravel()
+            indices[s] = col.ravel()
+            data[s] = diag.ravel()
+            slot += 1
+            continue
+        a, sgn = entry
+        lo, hi, face = offdiag[a]
+        if (sgn < 0):                          # row j-stride in columns hi
+            s = slot[hi]
+            indices[s.ravel()] = (col[hi] - strides[a]).ravel()
+            data[s.ravel()] = -face.ravel()
+            slot[hi] += 1
+        else:                                  # row j+stride in columns lo
+            s = slot[lo]
+            indices[s.ravel()] = (col[lo] + strides[a]).ravel()
+            data[s.ravel()] = -face.ravel()
+            slot[lo] += 1
+    del slot, col
+
+    # create the matrix (setting the index arrays afterwards, since the
+    # constructor may otherwise change their type)
+    D = csc_matrix((data, indices, indptr), shape=(n,n))
+    D.indices = indices
+    D.indptr = indptr
+    D.has_sorted_indices = True
+    return D
@@ -13,6 +13,10 @@ import numpy as np
 from scipy.sparse import csc_matrix
 from scipy.sparse import linalg as la
 import matplotlib.pyplot as plt
+from diff_2D import diff_2D
+from diff_3D import diff_3D
+from sp_symbolic import sp_symbolic, sp_factor
+from nested_dissection import nested_dissection
 
 
 ##################
@@ -90,123 +94,35 @@ def makeplots(D):
     plt.show()
     
 
-
-def diff_2D(Nx,Ny):
-    """
-    Usage: D = diff_2D(Nx,Ny)
-    
-    This routine creates the diffusion matrix resulting from the equation
-    \[
-         u - \Delta u,
-    \]
-    where $u \in \Real$ is defined on the square domain [0,1] x [0,1], which
-    is discretized using Nx points in the x-direction, and Ny points in the 
-    y-direction, and the Laplace operator is discretized using the standard 
-    2nd-order 5 point stencil.  Homogeneous Dirichlet boundary conditions are
-    assumed just outside the domain.
-    
-    inputs:
-        Nx       # spatial points in the x-direction of the domain
-        Ny       # spatial points in the y-direction of the domain
-    
-    outputs:
-        D        REAL (Nx*Ny) x (Nx*Ny) sparse (CSC) matrix
+def compare_orderings(D, N):
     """
-    
-    # set indexing function from 2D physical space to 1D index space
-    def ij(i,j):
-        return(j*Nx + i)
-    
-    # initialize the output matrix 
-    D = np.zeros((Nx*Ny,Nx*Ny), dtype=float)
-
-    # set differencing constants
-    dx = 1.0/(Nx-1)
-    dy = 1.0/(Ny-1)
-    Dx2i = 1.0/dx/dx
-    Dy2i = 1.0/dy/dy
-    Diag = 1.0 + 2.0*(Dx2i + Dy2i)
-
-    # iterate over the domain
-    for iy in range(Ny):
-        for ix in range(Nx):
-
-            # set the matrix entries for this row of D
-            D[ ij(ix,iy), ij(ix,iy) ] = Diag
-            if (ix > 0):
-                D[ ij(ix,iy), ij(ix-1,iy) ] = -Dx2i
-            if (ix < Nx-1):
-                D[ ij(ix,iy), ij(ix+1,iy) ] = -Dx2i
-            if (iy > 0):
-                D[ ij(ix,iy), ij(ix,iy-1) ] = -Dy2i
-            if (iy < Ny-1):
-                D[ ij(ix,iy), ij(ix,iy+1) ] = -Dy2i
-
-    Dcsc = csc_matrix(D)
-    return Dcsc
-
-
-def diff_3D(Nx,Ny,Nz):
+    Usage: compare_orderings(D, N)
+
+    This routine compares the fill (nnz of L+U) and time of the sparse LU
+    factorization of the diffusion matrix D on the grid with dimensions N,
+    using each of the generic column orderings of splu and the geometric
+    nested-dissection ordering (applied symmetrically to D beforehand, and
+    then factored without any further column reordering).
     """
-    Usage: D = diff_3D(Nx,Ny,Nz)
-    
-    This routine creates the diffusion matrix resulting from the equation
-    \[
-         u - \Delta u,
-    \]
-    where $u \in \Real$ is defined on the cube domain [0,1] x [0,1] x [0,1], 
-    which is discretized using Nx points in the x-direction, Ny points in the 
-    y-direction, Nz points in the z-direction, and the Laplace operator is 
-    discretized using the standard 2nd-order 7 point stencil.  Homogeneous 
-    Dirichlet boundary conditions are assumed just outside the domain.
     
-    inputs:
-        Nx       # spatial points in the x-direction of the domain
-        Ny       # spatial points in the y-direction of the domain
-        Nz       # spatial points in the z-direction of the domain
+    ts = time.time()
+    p = nested_dissection(N)
+    tp = time.time()-ts
+    results = []
+    for spec in ['NATURAL', 'MMD_ATA', 'MMD_AT_PLUS_A', 'COLAMD', 'ND']:
+        ts = time.time()
+        if (spec == 'ND'):
+            lu = la.splu(D[p,:][:,p].tocsc(), permc_spec='NATURAL',
+                         diag_pivot_thresh=0.0, options=dict(SymmetricMode=True))
+        else:
+            lu = la.splu(D, permc_spec=spec)
+        results.append([spec, lu.L.nnz+lu.U.nnz, time.time()-ts])
+    nnz_nd, t_nd = results[-1][1:]
+    print("   nested dissection ordering time =", tp)
+    for spec, nnz, t in results:
+        print("   %14s: nnz(L+U) = %9d, time = %.4f  (ND fill ratio %.2f, time ratio %.2f)"
+              % (spec, nnz, t, nnz_nd/nnz, t_nd/t))
     
-    outputs:
-        D        REAL (Nx*Ny*Nz) x (Nx*Ny*Nz) sparse (CSC) matrix
-    """
-
-    # set indexing function from 3D physical space to 1D index space
-    def ijk(i,j,k):
-        return (k*Nx*Ny + j*Nx + i)
-
-    # initialize the output matrix
-    D = np.zeros((Nx*Ny*Nz,Nx*Ny*Nz), dtype=float)
-
-    # set differencing constants
-    dx = 1.0/(Nx-1)
-    dy = 1.0/(Ny-1)
-    dz = 1.0/(Nz-1)
-    Dx2i = 1.0/dx/dx
-    Dy2i = 1.0/dy/dy
-    Dz2i = 1.0/dz/dz
-    Diag = 1.0 + 2.0*(Dx2i + Dy2i + Dz2i)
-
-    # iterate over the domain
-    for iz in range(Nz):
-        for iy in range(Ny):
-            for ix in range(Nx):
-     
-                # set the matrix entries for this row of D
-                D[ ijk(ix,iy,iz), ijk(ix,iy,iz) ] = Diag
-                if (ix > 0):
-                    D[ ijk(ix,iy,iz), ijk(ix-1,iy,iz) ] = -Dx2i
-                if (ix < Nx-1):
-                    D[ ijk(ix,iy,iz), ijk(ix+1,iy,iz) ] = -Dx2i
-                if (iy > 0):
-                    D[ ijk(ix,iy,iz), ijk(ix,iy-1,iz) ] = -Dy2i
-                if (iy < Ny-1):
-                    D[ ijk(ix,iy,iz), ijk(ix,iy+1,iz) ] = -Dy2i
-                if (iz > 0):
-                    D[ ijk(ix,iy,iz), ijk(ix,iy,iz-1) ] = -Dz2i
-                if (iz < Nz-1):
-                    D[ ijk(ix,iy,iz), ijk(ix,iy,iz+1) ] = -Dz2i
-
-    Dcsc = csc_matrix(D)
-    return Dcsc
 
 
 
@@ -237,4 +153,31 @@ if __name__ == "__main__":
     print("problem 4: larger 3D diffusion matrix");
     D = diff_3D(20,25,30)
     makeplots(D)
+    input("Press enter to continue")
 
+    # problem 5: repeated refactorization of matrices with the same pattern
+    # (the symbolic analysis is computed once, and cached by sp_symbolic)
+    print("problem 5: repeated refactorization with a cached symbolic analysis");
+    D = diff_2D(100,100)
+    b = np.ones(D.shape[0])
+    ts = time.time()
+    S = sp_symbolic(D, "mmd")
+    print("   symbolic analysis: time =", time.time()-ts, ", nnz(L) =", S.nnz)
+    F = None
+    for it in range(3):
+        Dk = diff_2D(100,100,kappa=lambda x,y: 1.0 + it*x*y)
+        ts = time.time()
+        F = sp_factor(Dk, "cholesky", "mmd", out=F)
+        tf = time.time()-ts
+        ts = time.time()
+        lu = la.splu(Dk, permc_spec='MMD_AT_PLUS_A')
+        tl = time.time()-ts
+        print("   refactorization", it, ": time =", tf, ", residual =",
+              np.linalg.norm(Dk @ F.solve(b) - b), ", splu time =", tl)
+
+    # problem 6: geometric nested dissection versus the generic orderings
+    print("problem 6: nested dissection ordering of the 2D and 3D diffusion matrices");
+    for N in [(200,200), (20,25,30)]:
+        D = diff_2D(*N) if (len(N) == 2) else diff_3D(*N)
+        print("  grid", N)
+        compare_orderings(D, N)
@@ -0,0 +1,132 @@
+# nested_dissection.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+
+#----------------------------------------
+# utility routines
+
+def ranges(start, count):
+    """
+    Usage: idx = ranges(start, count)
+
+    This routine concatenates the index ranges start[k]:start[k]+count[k].
+    """
+
+    # imports
+    import numpy as np
+
+    return np.repeat(start - np.cumsum(count) + count, count) + \
+        np.arange(int(np.sum(count)), dtype=np.int64)
+
+
+def box_indices(lo, hi, N):
+    """
+    Usage: idx = box_indices(lo, hi, N)
+
+    This routine returns the 1D indices (x varying fastest, as in diff_2D
+    and diff_3D) of the nodes in the boxes lo[b,d] <= i_d < hi[b,d] of the
+    grid with N = (Nx, Ny[, Nz]) points, box after box, each in its natural
+    order.  The work is proportional to the number of nodes returned.
+    """
+
+    # imports
+    import numpy as np
+
+    lens = hi - lo
+    size = np.prod(lens, axis=1)
+    b = np.repeat(np.arange(np.size(size)), size)
+    t = np.arange(int(np.sum(size)), dtype=np.int64) - np.repeat(np.cumsum(size) - size, size)
+    idx = np.zeros(np.size(t), dtype=np.int64)
+    stride = 1
+    for d in range(len(N)):
+        Ld = lens[b,d]
+        idx += (lo[b,d] + t % Ld)*stride
+        t //= Ld
+        stride *= N[d]
+    return idx
+
+
+#----------------------------------------
+# primary routine
+
+def nested_dissection(N, leaf=8):
+    """
+    Usage: perm = nested_dissection(N, leaf)
+
+    This routine computes the geometric nested-dissection ordering of the
+    unknowns of the grid with N = (Nx, Ny[, Nz]) points, for the 5 and 7
+    point stencils of diff_2D and diff_3D: each box of the grid (starting
+    with the whole grid) is split across its longest side by the middle
+    line (or plane) of nodes, which separates the two halves since the
+    stencil only couples neighbors along each axis.  The two halves are
+    ordered first (recursively), and the separator last, so that
+    eliminating either half creates no fill in the other.  Boxes with at
+    most leaf nodes (or no side longer than 2) are ordered naturally.
+
+    Since the position of every box in the ordering follows from the sizes
+    of its halves, each leaf box and separator is written directly into its
+    slot of perm, and all of the boxes at the same level of the recursion
+    are split together with vectorized array operations, so that the work
+    is O(n), with a Python loop over the O(log n) levels only.  The
+    resulting Cholesky factor has O(n log n) entries in 2D and O(n^(4/3))
+    in 3D.
+
+    inputs:
+        N        tuple of grid dimensions (Nx, Ny[, Nz])
+        leaf     largest box that is not split further
+
+    outputs:
+        perm     ordering of the n = prod(N) unknowns (P*A*P' =
+                 A[perm,:][:,perm], as in fill_ordering)
+    """
+
+    # imports
+    import numpy as np
+
+    # check inputs
+    N = tuple(int(Ni) for Ni in N)
+    if (len(N) < 1 or min(N) < 1):
+        raise ValueError("nested_dissection error: each grid dimension must be at least 1")
+    n = int(np.prod(N))
+    perm = np.empty(n, dtype=np.int64)
+
+    # all of the boxes at one level of the recursion are handled together;
+    # box b is [lo[b], hi[b]) with its offset off[b] in perm
+    lo = np.zeros((1, len(N)), dtype=np.int64)
+    hi = np.array([N], dtype=np.int64)
+    off = np.zeros(1, dtype=np.int64)
+    while (np.size(off) > 0):
+        lens = hi - lo
+        size = np.prod(lens, axis=1)
+        a = np.argmax(lens, axis=1)
+        r = np.arange(np.size(a))
+        la = lens[r,a]
+
+        # order the small boxes naturally
+        done = (size <= leaf) | (la < 3)
+        perm[ranges(off[done], size[done])] = box_indices(lo[done], hi[done], N)
+        lo, hi, off, size, a, la = lo[~done], hi[~done], off[~done], size[~done], a[~done], la[~done]
+        r = np.arange(np.size(a))
+
+        # split the others at the middle of their longest sides: first
+        # half, second half, then the separator
+        mid = lo[r,a] + la//2
+        size1 = size//la*(mid - lo[r,a])
+        size2 = size//la*(hi[r,a] - mid - 1)
+        slo = lo.copy()
+        shi = hi.copy()
+        slo[r,a] = mid
+        shi[r,a] = mid+1
+        perm[ranges(off+size1+size2, size-size1-size2)] = box_indices(slo, shi, N)
+        hi1 = hi.copy()
+        hi1[r,a] = mid
+        lo2 = lo.copy()
+        lo2[r,a] = mid+1
+        lo = np.concatenate((lo, lo2))
+        hi = np.concatenate((hi1, hi))
+        off = np.concatenate((off, off+size1))
+    return perm
@@ -0,0 +1,757 @@
+# sp_symbolic.py
+#
+# Daniel R. Reynolds
+# SMU Mathematics
+# Math 5316
+# Spring 2019
+
+# the numeric Cholesky factorization uses the supernodal kernel of the
+# sparse Cholesky demonstration codes
+import os
+import sys
+_sp_chol = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sp_chol")
+if (_sp_chol not in sys.path):
+    sys.path.append(_sp_chol)
+
+
+#----------------------------------------
+# symbolic factorization object
+
+class SymbolicFactor:
+    """
+    Usage: S = SymbolicFactor(perm, parent, Lp, Li, key)
+
+    Class to hold the symbolic analysis of a sparse matrix A with a
+    symmetric sparsity pattern (as computed by sp_symbolic), i.e. everything
+    about the factorization of P*A*P' that depends only on the pattern of A:
+    the fill-reducing ordering, the elimination tree, and the pattern of the
+    factor L (in CSC format, with the rows of each column in ascending
+    order, the diagonal first), along with the pattern of A itself.
+
+    Attributes:
+       n is the matrix dimension, and key the pattern key (see pattern_key)
+       perm is the ordering (P*A*P' = A[perm,:][:,perm]) and iperm its inverse
+       parent is the elimination tree (parent[j] = -1 for the roots)
+       colcount is the number of entries in each column of L
+       Lp, Li are the column pointers and row indices of L (nnz = Lp[-1])
+       keyL holds col*n+row for the entries of L (sorted, for searching)
+       Ap, Ai are the column pointers and row indices of A (canonical CSC)
+    """
+
+    fields = ["perm", "parent", "Lp", "Li", "Ap", "Ai"]
+
+    def __init__(self, perm, parent, Lp, Li, Ap, Ai, key=None):
+        import numpy as np
+        self.n = np.size(perm)
+        self.key = key
+        self.perm = perm
+        self.iperm = np.empty_like(perm)
+        self.iperm[perm] = np.arange(self.n)
+        self.parent = parent
+        self.Lp = Lp
+        self.Li = Li
+        self.Ap = Ap
+        self.Ai = Ai
+        self.colcount = np.diff(Lp)
+        self.nnz = int(Lp[-1])
+        col = np.repeat(np.arange(self.n, dtype=np.int64), self.colcount)
+        self.keyL = col*self.n + Li
+
+    def arrays(self):
+        """
+        Usage: d = S.arrays()
+
+        Returns the dictionary of arrays that define this object (used to
+        store it on disk).
+        """
+        return {name: getattr(self, name) for name in self.fields}
+
+    def matches(self, A):
+        """
+        Usage: flag = S.matches(A)
+
+        Returns True if the sparse matrix A (canonical CSC format) has exactly
+        the sparsity pattern that this object was computed for.
+        """
+        import numpy as np
+        return (A.shape == (self.n, self.n) and np.array_equal(A.indptr, self.Ap)
+                and np.array_equal(A.indices, self.Ai))
+
+
+
+#----------------------------------------
+# symbolic factorization cache
+
+class SymbolicCache:
+    """
+    Usage: cache = SymbolicCache(maxsize, directory, maxfiles)
+
+    Class implementing a least-recently-used cache of SymbolicFactor
+    objects, keyed by (pattern_key(A), ordering), holding at most maxsize
+    objects in memory.  If directory is given, every object is also stored
+    there (as an .npz file), and objects that are not in memory are loaded
+    from there; at most maxfiles files are kept, removing the least recently
+    used ones.
+    """
+
+    def __init__(self, maxsize=8, directory=None, maxfiles=64):
+        from collections import OrderedDict
+        self.maxsize = maxsize
+        self.directory = directory
+        self.maxfiles = maxfiles
+        self.factors = OrderedDict()
+
+    def filename(self, key):
+        import os
+        return os.path.join(self.directory, key[0] + "_" + key[1] + ".npz")
+
+    def get(self, key):
+        import os
+        import numpy as np
+        if (key in self.factors):
+            self.factors.move_to_end(key)
+            return self.factors[key]
+        if (self.directory is None):
+            return None
+        fname = self.filename(key)
+        if (not os.path.exists(fname)):
+            return None
+        with np.load(fname) as data:
+            S = SymbolicFactor(*[data[name] for name in SymbolicFactor.fields], key=key)
+        os.utime(fname)
+        self.put(key, S, store=False)
+        return S
+
+    def put(self, key, S, store=True):
+        import os
+        import numpy as np
+        self.factors[key] = S
+        self.factors.move_to_end(key)
+        while (len(self.factors) > self.maxsize):
+            self.factors.popitem(last=False)
+        if (self.directory is not None and store):
+            os.makedirs(self.directory, exist_ok=True)
+            fname = self.filename(key)
+            tmpname = fname + ".tmp.npz"
+            np.savez(tmpname, **S.arrays())
+            os.replace(tmpname, fname)
+            files = [os.path.join(self.directory, f) for f in os.listdir(self.directory)
+                     if f.endswith(".npz") and not f.endswith(".tmp.npz")]
+            files.sort(key=os.path.getmtime)
+            for f in files[:max(len(files)-self.maxfiles, 0)]:
+                os.remove(f)
+
+    def clear(self):
+        self.factors.clear()
+
+    def __len__(self):
+        return len(self.factors)
+
+
+# default cache used by sp_symbolic
+symbolic_cache = SymbolicCache()
+
+
+
+#----------------------------------------
+# numeric factorization object
+
+class SparseFactor:
+    """
+    Usage: F = SparseFactor(S, kind, SN)
+
+    Class to hold a numeric sparse factorization of P*A*P' with the pattern
+    of the SymbolicFactor S: either the Cholesky factorization L*L' (kind =
+    "cholesky"), or the LU factorization L*U without pivoting (kind = "lu",
+    with unit lower-triangular L, and U' stored with the pattern of L).
+    Both are computed on the supernodal structure SN of sp_chol (computed
+    from S if it is not supplied), with one dense block per supernode: the
+    Cholesky factor in a SupernodalFactor, and the LU factors in X, where
+    the block of supernode s holds L (below the diagonal of its diagonal
+    block) and U (on and above it) in X[xp[s]:xp[s+1]], and the rows of U
+    to the right of the diagonal block, transposed, in X[size+xp[s]:...].
+    The factors are also kept with the pattern of L.  All of the factor
+    storage is allocated once, and is overwritten by each numeric
+    refactorization (see sp_factor).
+
+    Attributes:
+       S is the SymbolicFactor, SN the Supernodes, and kind the type
+       Lx holds the entries of L (and Ux those of U', for kind = "lu")
+       chol is the SupernodalFactor (for kind = "cholesky"), and X the
+         supernode blocks (for kind = "lu")
+
+    Methods:
+       x = F.solve(b)  solves A*x = b (b may be an n vector or an n x k matrix)
+       L = F.L()       returns L as a sparse (CSC) matrix
+       U = F.U()       returns U (L' for kind = "cholesky") as a sparse matrix
+    """
+
+    def __init__(self, S, kind="cholesky", SN=None):
+        import numpy as np
+        from sp_chol import Supernodes, SupernodalFactor
+        if (kind not in ("cholesky", "lu")):
+            raise ValueError("SparseFactor error: kind must be 'cholesky' or 'lu'")
+        self.S = S
+        self.kind = kind
+        self.SN = Supernodes(S) if (SN is None) else SN
+        SN = self.SN
+        self.Lx = np.zeros(S.nnz)
+        col = np.repeat(np.arange(S.n, dtype=np.int64), S.colcount)
+        if (kind == "cholesky"):
+            self.chol = SupernodalFactor(SN)
+            self.Lpos = SN.position(S.Li, col)
+            return
+        self.Ux = np.zeros(S.nnz)
+        self.X = np.zeros(2*SN.size)
+        self.Lpos = self.position(S.Li, col)
+        self.Upos = self.position(col, S.Li)
+
+        # positions of the entries of P*A*P' in X
+        Acol = np.repeat(np.arange(S.n, dtype=np.int64), np.diff(S.Ap))
+        self.Adst = self.position(S.iperm[S.Ai], S.iperm[Acol])
+
+        # single-column leaves of the supernodal tree (see numeric_factor):
+        # their entries below the diagonal are X[lsub], and their rank-1
+        # updates L[i,j]*U[j,k] go to X[ldst], from X[lsrc1] and X[lsrc2]
+        J = SN.sp[SN.leaves]
+        cnt = SN.rp[SN.leaves+1] - SN.rp[SN.leaves]
+        self.lsub = SN.lx[SN.lrows != np.repeat(J, cnt)]
+        src1, src2, dst = [], [], []
+        for mk in np.unique(cnt[cnt > 1]):
+            K = SN.leaves[cnt == mk]
+            a, b = [ab.ravel() for ab in np.indices((mk-1, mk-1))]
+            R = SN.Rs[SN.rp[K][:,None] + np.arange(1, mk)]
+            src1.append((SN.xp[K][:,None] + 1 + a).ravel())
+            src2.append((SN.size + SN.xp[K][:,None] + 1 + b).ravel())
+            dst.append(self.position(R[:,a].ravel(), R[:,b].ravel()))
+        self.lsrc1 = np.concatenate(src1 + [np.zeros(0, dtype=np.int64)])
+        self.lsrc2 = np.concatenate(src2 + [np.zeros(0, dtype=np.int64)])
+        self.ldst = np.concatenate(dst + [np.zeros(0, dtype=np.int64)])
+
+    def position(self, i, j):
+        """
+        Usage: p = F.position(i, j)
+
+        Returns the positions in X of the entries (i,j) of the LU factors
+        (arrays of row and column indices): the entries of L, and those of
+        U within the diagonal block of a supernode, are in the block of the
+        supernode of column j, and the other entries of U are in the block
+        of U' of the supernode of row i.
+        """
+        import numpy as np
+        SN = self.SN
+        low = (i >= j) | (SN.snode[i] == SN.snode[j])
+        p = np.empty(np.size(i), dtype=np.int64)
+        p[low] = SN.position(i[low], j[low])
+        p[~low] = SN.size + SN.position(j[~low], i[~low])
+        return p
+
+    def blocks(self, s):
+        """
+        Usage: BL, BU = F.blocks(s)
+
+        Returns the (m x w) blocks of L and U' of supernode s, as views of X
+        (kind = "lu").
+        """
+        SN = self.SN
+        shape = (SN.rp[s+1]-SN.rp[s], SN.sp[s+1]-SN.sp[s])
+        BL = self.X[SN.xp[s]:SN.xp[s+1]].reshape(shape, order='F')
+        BU = self.X[SN.size+SN.xp[s]:SN.size+SN.xp[s+1]].reshape(shape, order='F')
+        return [BL, BU]
+
+    def L(self):
+        from scipy.sparse import csc_matrix
+        S = self.S
+        return csc_matrix((self.Lx, S.Li, S.Lp), shape=(S.n, S.n))
+
+    def U(self):
+        from scipy.sparse import csc_matrix
+        S = self.S
+        Ux = self.Lx if (self.kind == "cholesky") else self.Ux
+        return csc_matrix((Ux, S.Li, S.Lp), shape=(S.n, S.n)).T.tocsr()
+
+    def solve(self, b):
+        """
+        Usage: x = F.solve(b)
+
+        Solves A*x = b with the stored factors (b is not modified), with one
+        dense triangular solve and one matrix-vector (or matrix-matrix)
+        product per supernode in each of the forward and backward sweeps
+        (see SupernodalFactor.solve).
+        """
+        import numpy as np
+        from scipy.linalg.blas import dtrsm
+        if (self.kind == "cholesky"):
+            return self.chol.solve(b)
+        S = self.S
+        SN = self.SN
+        X = self.X
+        y = np.array(b, dtype=float)[S.perm]
+        shape = y.shape
+        y = y.reshape((S.n, -1))
+        skip = np.zeros(SN.ns, dtype=bool)
+        skip[SN.leaves] = True
+        others = np.nonzero(~skip)[0].tolist()
+        J = SN.sp[SN.leaves]
+        cnt = SN.rp[SN.leaves+1] - SN.rp[SN.leaves]
+        first = (SN.lrows == np.repeat(J, cnt))
+        Lj = X[SN.lx]
+        Uj = X[SN.size + SN.lx]
+
+        # forward substitution with L (unit diagonal)
+        np.subtract.at(y, SN.lrows[~first], Lj[~first][:,None]*np.repeat(y[J], cnt-1, axis=0))
+        for s in others:
+            f, l = SN.sp[s], SN.sp[s+1]
+            R = SN.rows(s)[l-f:]
+            BL = self.blocks(s)[0]
+            y[f:l] = dtrsm(1.0, BL[:l-f], y[f:l], lower=1, diag=1)
+            if (np.size(R) > 0):
+                y[R] -= BL[l-f:] @ y[f:l]
+
+        # backward substitution with U
+        for s in others[::-1]:
+            f, l = SN.sp[s], SN.sp[s+1]
+            R = SN.rows(s)[l-f:]
+            BL, BU = self.blocks(s)
+            if (np.size(R) > 0):
+                y[f:l] -= BU[l-f:].T @ y[R]
+            y[f:l] = dtrsm(1.0, BL[:l-f], y[f:l], lower=0)
+        np.subtract.at(y, np.repeat(J, cnt-1), Uj[~first][:,None]*y[SN.lrows[~first]])
+        y[J] /= Lj[first][:,None]
+        x = np.empty(shape)
+        x[S.perm] = y.reshape(shape)
+        return x
+
+
+
+#----------------------------------------
+# utility routines
+
+def pattern_key(A):
+    """
+    Usage: key = pattern_key(A)
+
+    Function to compute a digest of the sparsity pattern (shape, column
+    pointers and row indices) of the sparse matrix A, in canonical CSC
+    format, independent of its values.
+    """
+
+    # imports
+    import hashlib
+    import numpy as np
+
+    h = hashlib.blake2b(str(A.shape).encode(), digest_size=20)
+    h.update(np.ascontiguousarray(A.indptr, dtype=np.int64).data)
+    h.update(np.ascontiguousarray(A.indices, dtype=np.int64).data)
+    return h.hexdigest()
+
+
+def ordering_name(ordering):
+    """
+    Usage: name = ordering_name(ordering)
+
+    Function to return the name of a fill-reducing ordering (see
+    fill_ordering) used in the cache keys, e.g. "mmd" or "nd_50x100".
+    """
+    if (isinstance(ordering, (tuple, list))):
+        return str(ordering[0]) + "_" + "x".join([str(int(Ni)) for Ni in ordering[1:]])
+    return str(ordering)
+
+
+def fill_ordering(A, ordering="rcm"):
+    """
+    Usage: perm = fill_ordering(A, ordering)
+
+    Function to compute a fill-reducing symmetric ordering of the sparse
+    matrix A (with symmetric pattern):
+        "natural" - no reordering
+        "rcm"     - reverse Cuthill-McKee (scipy.sparse.csgraph)
+        "mmd"     - multiple minimum degree on A'+A (the column ordering
+                    that SuperLU computes for permc_spec="MMD_AT_PLUS_A";
+                    this requires one factorization of A)
+        ("nd", Nx, Ny[, Nz]) - geometric nested dissection of the grid with
+                    these dimensions (see nested_dissection), for matrices
+                    from diff_2D/diff_3D on that grid (a ValueError is
+                    raised if the pattern of A does not match the grid)
+    """
+
+    # imports
+    import numpy as np
+    from scipy.sparse import csc_matrix
+    from scipy.sparse.csgraph import reverse_cuthill_mckee
+    from scipy.sparse.linalg import splu
+    from nested_dissection import nested_dissection
+
+    if (isinstance(ordering, (tuple, list)) and len(ordering) > 1 and ordering[0] == "nd"):
+        N = tuple(int(Ni) for Ni in ordering[1:])
+        n = A.shape[0]
+        if (int(np.prod(N)) != n):
+            raise ValueError("fill_ordering error: grid dimensions do not match the matrix size")
+
+        # check the pattern against the grid: along each axis (with index
+        # stride s), node 0 is coupled to node s (and to no other nodes),
+        # but the last node of the first line is not coupled to the first
+        # node of the next line
+        A = csc_matrix(A)
+        def coupled(i, j):
+            return (i in A.indices[A.indptr[j]:A.indptr[j+1]])
+        strides = np.cumprod((1,) + N[:-1])
+        nbrs = A.indices[A.indptr[0]:A.indptr[1]]
+        valid = (np.size(np.setdiff1d(nbrs, np.append(strides, 0))) == 0)
+        for Nd, s in zip(N, strides.tolist()):
+            if ((Nd > 1 and not coupled(0, s)) or (Nd*s < n and coupled((Nd-1)*s, Nd*s))):
+                valid = False
+        if (not valid):
+            raise ValueError("fill_ordering error: matrix pattern does not match the grid " + str(N))
+        return nested_dissection(N)
+    elif (ordering == "natural"):
+        return np.arange(A.shape[0])
+    elif (ordering == "rcm"):
+        return np.asarray(reverse_cuthill_mckee(A, symmetric_mode=True), dtype=np.int64)
+    elif (ordering == "mmd"):
+        lu = splu(A, permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0,
+                  options=dict(SymmetricMode=True))
+        perm = np.empty(A.shape[0], dtype=np.int64)
+        perm[lu.perm_c] = np.arange(A.shape[0])
+        return perm
+    else:
+        raise ValueError("fill_ordering error: unknown ordering " + str(ordering))
+
+
+def etree(A):
+    """
+    Usage: parent = etree(A)
+
+    Function to compute the elimination tree of the sparse matrix A (with
+    symmetric pattern, in CSC format), using Liu's algorithm with path
+    compression: for each column j and each row i < j of A[:,j], the root
+    of the current subtree containing i becomes a child of j.
+    """
+
+    # imports
+    import numpy as np
+
+    n = A.shape[0]
+    Ap = A.indptr
+    Ai = A.indices
+    parent = np.full(n, -1, dtype=np.int64)
+    ancestor = np.full(n, -1, dtype=np.int64)
+    for j in range(n):
+        for i in Ai[Ap[j]:Ap[j+1]].tolist():
+            while (i != -1 and i < j):
+                inext = ancestor[i]
+                ancestor[i] = j
+                if (inext == -1):
+                    parent[i] = j
+                i = inext
+    return parent
+
+
+def postorder(parent):
+    """
+    Usage: post = postorder(parent)
+
+    Function to compute a postordering of the elimination tree parent (a
+    depth-first ordering in which every subtree is numbered contiguously,
+    each node directly after its descendants).  Renumbering the columns by
+    post is an equivalent ordering: P*A*P' has the same fill, but every
+    chain of columns j, parent[j], ... of equal structure becomes a
+    contiguous range of columns (see the supernodes of sp_chol).
+    """
+
+    # imports
+    import numpy as np
+
+    n = np.size(parent)
+    children = [[] for j in range(n)]
+    roots = []
+    for j in range(n-1,-1,-1):
+        if (parent[j] == -1):
+            roots.append(j)
+        else:
+            children[parent[j]].append(j)
+    post = np.empty(n, dtype=np.int64)
+    k = 0
+    stack = roots
+    while (stack):
+        j = stack[-1]
+        if (children[j]):
+            stack.append(children[j].pop())
+        else:
+            stack.pop()
+            post[k] = j
+            k += 1
+    return post
+
+
+def symbolic_pattern(A, parent):
+    """
+    Usage: Lp, Li = symbolic_pattern(A, parent)
+
+    Function to compute the pattern of the Cholesky factor L of the sparse
+    matrix A (with symmetric pattern, in CSC format, already ordered), given
+    its elimination tree: the pattern of column j of L is the union of the
+    pattern of A[j:,j] and the patterns of the columns of its children in
+    the tree (excluding the children themselves).
+    """
+
+    # imports
+    import numpy as np
+
+    n = A.shape[0]
+    Ap = A.indptr
+    Ai = A.indices
+    cols = [None]*n
+    pending = [[] for j in range(n)]
+    for j in range(n):
+        a = Ai[Ap[j]:Ap[j+1]]
+        parts = [np.array([j]), a[a > j]] + [c[1:] for c in pending[j]]
+        cols[j] = np.unique(np.concatenate(parts))
+        pending[j] = None
+        if (parent[j] != -1):
+            pending[parent[j]].append(cols[j])
+    Lp = np.zeros(n+1, dtype=np.int64)
+    np.cumsum([np.size(c) for c in cols], out=Lp[1:])
+    Li = np.concatenate(cols).astype(np.int64) if (n > 0) else np.zeros(0, dtype=np.int64)
+    return [Lp, Li]
+
+
+def lu_nopivot(B):
+    """
+    Usage: lu_nopivot(B)
+
+    Function to compute the LU factorization of the dense square matrix B
+    in place, without pivoting (unit lower-triangular L below the diagonal,
+    and U on and above it).  The leading half of B is factored
+    (recursively), the blocks to its right and below it are computed with
+    triangular solves (BLAS trsm), and the trailing block is updated with
+    one matrix product and then factored.  Blocks of at most 8 columns
+    (most of the supernodes of the diffusion matrices) are factored
+    column by column on Python floats, which is several times faster than
+    array operations on such small blocks.
+    """
+
+    # imports
+    from scipy.linalg.blas import dtrsm
+
+    w = B.shape[0]
+    if (w <= 8):
+        M = B.tolist()
+        for k in range(w):
+            Mk = M[k]
+            if (Mk[k] == 0.0):
+                raise ValueError("numeric_factor error: zero pivot")
+            for Mi in M[k+1:]:
+                Mi[k] /= Mk[k]
+                for j in range(k+1, w):
+                    Mi[j] -= Mi[k]*Mk[j]
+        B[:,:] = M
+        return
+    h = w//2
+    lu_nopivot(B[:h,:h])
+    B[:h,h:] = dtrsm(1.0, B[:h,:h], B[:h,h:], lower=1, diag=1)
+    B[h:,:h] = dtrsm(1.0, B[:h,:h], B[h:,:h], side=1, lower=0)
+    B[h:,h:] -= B[h:,:h] @ B[:h,h:]
+    lu_nopivot(B[h:,h:])
+
+
+def numeric_factor(F, A):
+    """
+    Usage: numeric_factor(F, A)
+
+    Function to compute the numeric factorization of P*A*P' into the
+    preallocated storage of the SparseFactor F, on the supernodal structure
+    of its SymbolicFactor, and to gather the result into the pattern of L.
+    The Cholesky factorization is performed by the multifrontal kernel
+    numeric_supernodal of sp_chol.  The LU factorization is multifrontal in
+    the same way: for each supernode s (columns f:l, rows R), the dense
+    frontal matrix holds the columns f:l and the rows f:l of P*A*P', minus
+    the update matrices of the children of s (added in by extend-add), and
+        L11*U11 = F11       (lu_nopivot)
+        L21 = F21 @ inv(U11),  U12 = inv(L11) @ F12
+        U   = F22 - L21 @ U12
+    are computed with dense kernels, with U passed to the parent of s.  As
+    in numeric_supernodal, the single-column leaves are eliminated first,
+    all at once.  No pivoting is performed, so A must be symmetric positive
+    definite (Cholesky), or have nonzero pivots (LU; e.g., diagonally
+    dominant).
+    """
+
+    # imports
+    import numpy as np
+    from scipy.linalg.blas import dtrsm, dgemm
+    from sp_chol import numeric_supernodal
+
+    S = F.S
+    SN = F.SN
+    if (F.kind == "cholesky"):
+        numeric_supernodal(F.chol, A)
+        np.take(F.chol.Lx, F.Lpos, out=F.Lx)
+        return
+
+    # scatter the entries of P*A*P' into the blocks
+    X = F.X
+    X.fill(0.0)
+    X[F.Adst] = A.data
+
+    # the single-column leaves are independent of each other, so they are
+    # eliminated together: scale their columns of L, and subtract their
+    # rank-1 updates from the blocks of their ancestors
+    d = X[SN.xp[SN.leaves]]
+    if (np.any(d == 0.0)):
+        raise ValueError("numeric_factor error: zero pivot")
+    X[F.lsub] /= np.repeat(d, SN.rp[SN.leaves+1] - SN.rp[SN.leaves] - 1)
+    np.subtract.at(X, F.ldst, X[F.lsrc1]*X[F.lsrc2])
+
+    # factor the other supernodes from the leaves up, keeping the update
+    # matrices of the supernodes whose parents have not been factored yet
+    skip = np.zeros(SN.ns, dtype=bool)
+    skip[SN.leaves] = True
+    children = [[] for s in range(SN.ns)]
+    update = [None]*SN.ns
+    for s in np.nonzero(~skip)[0].tolist():
+        f, l = SN.sp[s], SN.sp[s+1]
+        w = l-f
+        R = SN.rows(s)
+        m = np.size(R)
+        BL, BU = F.blocks(s)
+
+        # frontal matrix: columns and rows f:l of A, and extend-add of the
+        # children
+        front = np.zeros((m, m), order='F')
+        front[:,:w] = BL
+        front[:w,w:] = BU[w:].T
+        for c in children[s]:
+            rel = np.searchsorted(R, SN.rows(c)[SN.sp[c+1]-SN.sp[c]:])
+            front[rel[:,None], rel] += update[c]
+            update[c] = None
+        children[s] = None
+
+        # dense factorization of the diagonal block, the blocks of L and U
+        # beside it, and update matrix for the parent
+        lu_nopivot(front[:w,:w])
+        BL[:w] = front[:w,:w]
+        if (m > w):
+            BL[w:] = dtrsm(1.0, BL[:w], front[w:,:w], side=1, lower=0)
+            BU[w:] = dtrsm(1.0, BL[:w], front[:w,w:], lower=1, diag=1).T
+            update[s] = dgemm(-1.0, BL[w:], BU[w:], beta=1.0, c=front[w:,w:],
+                              trans_b=1, overwrite_c=1)
+            children[SN.sparent[s]].append(s)
+
+    # factors in the pattern of L (whose diagonal is 1)
+    np.take(X, F.Lpos, out=F.Lx)
+    F.Lx[S.Lp[:-1]] = 1.0
+    np.take(X, F.Upos, out=F.Ux)
+
+
+
+#----------------------------------------
+# primary routines
+
+def sp_symbolic(A, ordering="rcm", cache=symbolic_cache):
+    """
+    Usage: S = sp_symbolic(A, ordering, cache)
+
+    Function to compute (or retrieve from the cache) the symbolic analysis
+    of the sparse matrix A, which must have a symmetric sparsity pattern
+    (e.g., diff_2D or diff_3D): the fill-reducing ordering (fill_ordering),
+    the elimination tree of the reordered matrix (etree, postordered so that
+    subtrees are numbered contiguously), and the pattern of its factor L
+    (symbolic_pattern).  These depend only on the pattern of A, so they are
+    cached under the key (pattern_key(A), ordering_name(ordering)), and are
+    reused for every later matrix with the same pattern.
+
+    Inputs:
+       A is a sparse matrix with symmetric pattern (converted to canonical
+         CSC format)
+       ordering is the fill-reducing ordering (see fill_ordering)
+       cache is the SymbolicCache to use (None disables caching)
+    Output:
+       S is the SymbolicFactor
+    """
+
+    # imports
+    import numpy as np
+    from scipy.sparse import csc_matrix
+
+    # canonical CSC format
+    A = csc_matrix(A)
+    A.sum_duplicates()
+    A.sort_indices()
+    m, n = A.shape
+    if (m != n):
+        raise ValueError("sp_symbolic error: matrix must be square")
+
+    # check cache
+    key = (pattern_key(A), ordering_name(ordering))
+    if (cache is not None):
+        S = cache.get(key)
+        if (S is not None and S.matches(A)):
+            return S
+
+    # ordering, elimination tree and pattern of L for P*A*P'
+    perm = fill_ordering(A, ordering)
+    PA = A[perm,:][:,perm].tocsc()
+    PA.sort_indices()
+    parent = etree(PA)
+    post = postorder(parent)
+    if (np.any(post != np.arange(n))):
+        perm = perm[post]
+        PA = A[perm,:][:,perm].tocsc()
+        PA.sort_indices()
+        ipost = np.empty(n+1, dtype=np.int64)
+        ipost[post] = np.arange(n)
+        ipost[n] = -1
+        parent = ipost[parent[post]]
+    Lp, Li = symbolic_pattern(PA, parent)
+    S = SymbolicFactor(perm, parent, Lp, Li, A.indptr.astype(np.int64),
+                       A.indices.astype(np.int64), key=key)
+    if (cache is not None):
+        cache.put(key, S)
+    return S
+
+
+def sp_factor(A, kind="cholesky", ordering="rcm", cache=symbolic_cache, out=None):
+    """
+    Usage: F = sp_factor(A, kind, ordering, cache, out)
+
+    Function to compute the sparse factorization of P*A*P' (see
+    SparseFactor), splitting it into a symbolic phase (sp_symbolic, and the
+    supernodal structure, which are cached, so that they are computed only
+    once per sparsity pattern) and a numeric phase (numeric_factor).  If
+    out is a SparseFactor with the same symbolic analysis and kind, its
+    storage is overwritten and it is returned, so that refactorizing a
+    matrix with new values allocates no new factor storage.
+
+    The LU factorization performs no pivoting (the pivots are the diagonal
+    entries of P*A*P', in the fill-reducing ordering), so unlike splu it is
+    not stable for general matrices: it is intended for matrices that need
+    no pivoting (e.g., diagonally dominant), and a ValueError is raised if
+    a zero pivot is encountered.
+
+    Inputs:
+       A is a sparse matrix with symmetric pattern (SPD for kind "cholesky")
+       kind is the factorization type ("cholesky" or "lu")
+       ordering is the fill-reducing ordering (see fill_ordering)
+       cache is the SymbolicCache to use (None disables caching)
+       out is an optional SparseFactor to overwrite
+    Output:
+       F is the SparseFactor
+    """
+
+    # imports
+    from scipy.sparse import csc_matrix
+    from sp_chol import supernodes, supernode_cache
+
+    A = csc_matrix(A)
+    A.sum_duplicates()
+    A.sort_indices()
+    if (out is not None and out.kind == kind and out.S.key[1] == ordering_name(ordering)
+        and out.S.matches(A)):
+        F = out
+    else:
+        S = sp_symbolic(A, ordering, cache)
+        SN = supernodes(S, True, supernode_cache if (cache is not None) else None)
+        F = SparseFactor(S, kind, SN)
+    numeric_factor(F, A)
+    return F